@@ -0,0 +1,43 @@
+"""Add generated tsvector column and GIN index for note full-text search
+
+Revision ID: 3b8f6d2a9c4e
+Revises: 9a3e5b7c1d2f
+Create Date: 2025-09-22 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8f6d2a9c4e'
+down_revision: Union[str, Sequence[str], None] = '9a3e5b7c1d2f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match NoteRepository's plainto_tsquery('english', ...) configuration
+SEARCH_VECTOR_EXPR = "to_tsvector('english', coalesce(title, '') || ' ' || content)"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'notes',
+        sa.Column('search_vec', TSVECTOR(), sa.Computed(SEARCH_VECTOR_EXPR, persisted=True)),
+    )
+    # CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_notes_search_vec', 'notes', ['search_vec'], unique=False,
+            postgresql_using='gin', postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_notes_search_vec', table_name='notes', postgresql_concurrently=True)
+    op.drop_column('notes', 'search_vec')
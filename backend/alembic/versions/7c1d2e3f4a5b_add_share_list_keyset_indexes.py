@@ -0,0 +1,41 @@
+"""Add composite indexes for keyset pagination of share lists
+
+Revision ID: 7c1d2e3f4a5b
+Revises: 29cd85636a86
+Create Date: 2025-09-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1d2e3f4a5b'
+down_revision: Union[str, Sequence[str], None] = '29cd85636a86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+KEYSET_INDEXES = {
+    'idx_shares_shared_by_created': ['shared_by_user_id', 'created_at', 'id'],
+    'idx_shares_shared_with_created': ['shared_with_user_id', 'created_at', 'id'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps shares writable during the build, but cannot run
+    # inside a transaction
+    with op.get_context().autocommit_block():
+        for name, columns in KEYSET_INDEXES.items():
+            op.create_index(
+                name, 'shares', columns, unique=False, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in reversed(list(KEYSET_INDEXES)):
+            op.drop_index(name, table_name='shares', postgresql_concurrently=True)
@@ -0,0 +1,43 @@
+"""Drop single-column share indexes covered by composite ones
+
+Revision ID: 9a3e5b7c1d2f
+Revises: 7c1d2e3f4a5b
+Create Date: 2025-09-21 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a3e5b7c1d2f'
+down_revision: Union[str, Sequence[str], None] = '7c1d2e3f4a5b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Each is a leading prefix of an index that already serves its lookups:
+# idx_shares_shared_by_created, idx_shares_shared_with_created and the
+# uq_shares_note_recipient (note_id, shared_with_user_id) constraint.
+REDUNDANT_INDEXES = {
+    'idx_shares_shared_by': ['shared_by_user_id'],
+    'idx_shares_shared_with': ['shared_with_user_id'],
+    'idx_shares_note_id': ['note_id'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name='shares', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, columns in REDUNDANT_INDEXES.items():
+            op.create_index(
+                name, 'shares', columns, unique=False, postgresql_concurrently=True
+            )
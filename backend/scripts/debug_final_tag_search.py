@@ -112,4 +112,13 @@ async def test_tag_search_end_to_end():
 
 
 if __name__ == "__main__":
-    asyncio.run(test_tag_search_end_to_end())
\ No newline at end of file
+    # uvloop ships with uvicorn[standard] (run() needs uvloop >= 0.18);
+    # fall back to the stdlib loop without it
+    try:
+        import uvloop
+
+        runner = uvloop.run
+    except (ImportError, AttributeError):
+        runner = asyncio.run
+
+    runner(test_tag_search_end_to_end())
\ No newline at end of file
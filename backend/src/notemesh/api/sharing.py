@@ -1,6 +1,6 @@
 """Sharing API endpoints."""
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query
@@ -56,15 +56,19 @@ async def get_shared_note(
 
 @router.get("/", response_model=ShareListResponse)
 async def list_shares(
-    type: str = Query("given", pattern="^(given|received)$"),
+    type: str = Query("given", pattern="^(given|received|all)$"),
     page: int = Query(1, ge=1),
     per_page: int = Query(9, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    include_total: bool = Query(False),
     current_user_id: UUID = Depends(get_current_user_id),
     session: AsyncSession = Depends(get_db_session),
 ):
-    """List shares (given or received)."""
+    """List shares (given, received, or both with each share's direction)."""
     sharing_service = SharingService(session)
-    request = ShareListRequest(type=type, page=page, per_page=per_page)
+    request = ShareListRequest(
+        type=type, page=page, per_page=per_page, cursor=cursor, include_total=include_total
+    )
     return await sharing_service.list_shares(current_user_id, request)
 
 
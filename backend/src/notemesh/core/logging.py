@@ -8,7 +8,7 @@ import logging.config
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 from ..config import get_settings
 
@@ -214,12 +214,13 @@ def get_logger(name: str) -> logging.Logger:
 class LoggingMiddleware:
     """FastAPI middleware for request logging."""
 
-    def __init__(self, app, logger_name: str = "http"):
+    def __init__(self, app, logger_name: str = "http", skip_paths: Iterable[str] = ()):
         self.app = app
         self.logger = get_logger(logger_name)
+        self.skip_paths = frozenset(skip_paths)
 
     async def __call__(self, scope, receive, send):
-        if scope["type"] != "http":
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
             await self.app(scope, receive, send)
             return
         start_time = datetime.now(timezone.utc)
@@ -4,10 +4,10 @@ from datetime import datetime, timezone
 from typing import TYPE_CHECKING, List, Optional
 
 from pydantic import HttpUrl
-from sqlalchemy import CheckConstraint, ForeignKey, Index, Integer, String, Text, event
+from sqlalchemy import DDL, CheckConstraint, ForeignKey, Index, Integer, String, Text, event
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import attributes as orm_attributes
-from sqlalchemy.orm import mapped_column, relationship, validates
+from sqlalchemy.orm import mapped_column, query_expression, relationship, validates
 
 from .base import BaseModel
 from .types import GUID, HttpUrlListType
@@ -30,6 +30,10 @@ class Note(BaseModel):
     # Store as list of URLs; on SQLite it's JSON TEXT via HttpUrlListType
     hyperlinks: Mapped[Optional[List[HttpUrl]]] = mapped_column(HttpUrlListType, nullable=True)
 
+    # Filled only by list/search queries (see NoteRepository.search_notes)
+    # so the full content never has to leave the database
+    content_preview: Mapped[Optional[str]] = query_expression()
+
     view_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     last_viewed_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
 
@@ -78,7 +82,8 @@ class Note(BaseModel):
 
     # Database indexes and constraints
     __table_args__ = (
-        # Full-text search indexes (basic btree on SQLite)
+        # Full-text search indexes (basic btree on SQLite); PostgreSQL also
+        # has the search_vec column with a GIN index (see below)
         Index("idx_notes_title_fts", "title"),
         Index("idx_notes_content_fts", "content"),
         # Query optimization indexes
@@ -142,6 +147,29 @@ class Note(BaseModel):
         return links
 
 
+# Generated tsvector behind NoteRepository's full-text search, PostgreSQL
+# only. Migration 3b8f6d2a9c4e adds it to migrated databases; these hooks
+# give tables built by create_all the same column and GIN index. The column
+# stays unmapped so SQLite schemas and ORM loads are unchanged.
+SEARCH_VECTOR_EXPR = "to_tsvector('english', coalesce(title, '') || ' ' || content)"
+
+event.listen(
+    Note.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE notes ADD COLUMN search_vec tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPR}) STORED"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Note.__table__,
+    "after_create",
+    DDL("CREATE INDEX ix_notes_search_vec ON notes USING gin (search_vec)").execute_if(
+        dialect="postgresql"
+    ),
+)
+
+
 # Ensure relationship collections are initialized to avoid implicit lazy loads
 @event.listens_for(Note, "init", propagate=True)
 def _init_note_collections(target, args, kwargs):
@@ -78,10 +78,12 @@ class Share(BaseModel):
         CheckConstraint(
             "share_message IS NULL OR length(share_message) <= 500", name="ck_shares_message_len"
         ),
-        Index("idx_shares_note_id", "note_id"),
-        Index("idx_shares_shared_by", "shared_by_user_id"),
-        Index("idx_shares_shared_with", "shared_with_user_id"),
         Index("idx_shares_status", "status"),
+        # Keyset pagination of share lists (newest first). These also serve
+        # plain shared_by/shared_with lookups, as uq_shares_note_recipient
+        # does for note_id, so no single-column indexes on those.
+        Index("idx_shares_shared_by_created", "shared_by_user_id", "created_at", "id"),
+        Index("idx_shares_shared_with_created", "shared_with_user_id", "created_at", "id"),
     )
 
     def __repr__(self) -> str:
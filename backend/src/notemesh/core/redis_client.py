@@ -3,9 +3,10 @@
 import json
 import logging
 from datetime import datetime, timezone
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, List, Union, cast
 from uuid import UUID
 
+import orjson
 import redis.asyncio as redis
 from pydantic import BaseModel
 
@@ -22,13 +23,21 @@ class RedisClient:
         self.redis: Optional[redis.Redis] = None
 
     async def connect(self) -> None:
-        """Connect to Redis."""
+        """Connect to Redis (no-op when already connected).
+
+        The client is kept even if the initial ping fails: the pool opens
+        connections lazily, so commands start working once Redis is back.
+        """
+        if self.redis:
+            return
+        # Shared pool so concurrent requests don't serialize on one connection
+        pool = redis.ConnectionPool.from_url(
+            self.settings.redis_url,
+            max_connections=self.settings.redis_max_connections,
+            decode_responses=True,
+        )
+        self.redis = redis.Redis(connection_pool=pool)
         try:
-            self.redis = redis.from_url(
-                self.settings.redis_url,
-                max_connections=self.settings.redis_max_connections,
-                decode_responses=True
-            )
             # Test connection
             await self.redis.ping()
             logger.info("Connected to Redis successfully")
@@ -40,6 +49,8 @@ class RedisClient:
         """Disconnect from Redis."""
         if self.redis:
             await self.redis.close()
+            await self.redis.connection_pool.disconnect()
+            self.redis = None
             logger.info("Disconnected from Redis")
 
     async def get(self, key: str) -> Optional[str]:
@@ -52,7 +63,7 @@ class RedisClient:
             logger.error(f"Redis GET error for key {key}: {e}")
             return None
 
-    async def set(self, key: str, value: str, expire: Optional[int] = None) -> bool:
+    async def set(self, key: str, value: Union[str, bytes], expire: Optional[int] = None) -> bool:
         """Set value in Redis with optional expiration."""
         if not self.redis:
             return False
@@ -65,6 +76,31 @@ class RedisClient:
             logger.error(f"Redis SET error for key {key}: {e}")
             return False
 
+    async def get_many(self, keys: List[str]) -> List[Optional[str]]:
+        """Get several values in one MGET round trip (None for missing keys)."""
+        if not self.redis or not keys:
+            return [None] * len(keys)
+        try:
+            # decode_responses=True, so values come back as str
+            return cast(List[Optional[str]], await self.redis.mget(keys))
+        except Exception as e:
+            logger.error(f"Redis MGET error for {len(keys)} keys: {e}")
+            return [None] * len(keys)
+
+    async def set_many(self, mapping: Dict[str, str], expire: Optional[int] = None) -> bool:
+        """Set several values (each with the same expiration) in one pipeline."""
+        if not self.redis or not mapping:
+            return False
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, value, ex=expire)
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis pipeline SET error for {len(mapping)} keys: {e}")
+            return False
+
     async def delete(self, key: str) -> bool:
         """Delete key from Redis."""
         if not self.redis:
@@ -76,6 +112,16 @@ class RedisClient:
             logger.error(f"Redis DELETE error for key {key}: {e}")
             return False
 
+    async def delete_many(self, keys: List[str]) -> int:
+        """Delete several keys in one DEL round trip, returning how many existed."""
+        if not self.redis or not keys:
+            return 0
+        try:
+            return int(await self.redis.delete(*keys))
+        except Exception as e:
+            logger.error(f"Redis DEL error for {len(keys)} keys: {e}")
+            return 0
+
     async def exists(self, key: str) -> bool:
         """Check if key exists in Redis."""
         if not self.redis:
@@ -87,27 +133,91 @@ class RedisClient:
             return False
 
     # Cache methods for common operations
-    async def cache_search_results(self, query: str, user_id: UUID, results: Dict[str, Any], expire: int = 300) -> bool:
-        """Cache search results for 5 minutes by default."""
-        cache_key = f"search:{user_id}:{hash(query)}"
+    async def get_search_version(self, user_id: UUID) -> int:
+        """Get user's search cache version (0 until the first note change)."""
+        version = await self.get(f"user_search_ver:{user_id}")
         try:
-            return await self.set(cache_key, json.dumps(results), expire)
+            return int(version) if version else 0
+        except (TypeError, ValueError):
+            return 0
+
+    async def bump_search_version(self, user_id: UUID) -> int:
+        """Bump user's search cache version so older cached searches are never read again."""
+        if not self.redis:
+            return 0
+        try:
+            return int(await self.redis.incr(f"user_search_ver:{user_id}"))
+        except Exception as e:
+            logger.error(f"Failed to bump search version for user {user_id}: {e}")
+            return 0
+
+    async def bump_search_versions(self, user_ids: List[UUID]) -> bool:
+        """Bump several users' search cache versions in one pipeline."""
+        if not self.redis or not user_ids:
+            return False
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for user_id in user_ids:
+                    pipe.incr(f"user_search_ver:{user_id}")
+                await pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Failed to bump search versions for {len(user_ids)} users: {e}")
+            return False
+
+    async def cache_search_results(
+        self,
+        query: str,
+        user_id: UUID,
+        results: Union[Dict[str, Any], str, bytes],
+        expire: int = 300,
+        version: int = 0,
+    ) -> bool:
+        """Cache search results for 5 minutes by default.
+
+        Already-serialized JSON (str/bytes) is stored as-is.
+        """
+        cache_key = f"search:{user_id}:{version}:{hash(query)}"
+        try:
+            if not isinstance(results, (str, bytes)):
+                # orjson encodes straight to bytes, much faster than stdlib json
+                results = orjson.dumps(results)
+            return await self.set(cache_key, results, expire)
         except Exception as e:
             logger.error(f"Failed to cache search results: {e}")
             return False
 
-    async def get_cached_search(self, query: str, user_id: UUID) -> Optional[Dict[str, Any]]:
+    async def get_cached_search(
+        self, query: str, user_id: UUID, version: int = 0
+    ) -> Optional[Dict[str, Any]]:
         """Get cached search results."""
-        cache_key = f"search:{user_id}:{hash(query)}"
+        cache_key = f"search:{user_id}:{version}:{hash(query)}"
         try:
             cached = await self.get(cache_key)
             if cached:
-                return json.loads(cached)
+                return orjson.loads(cached)
             return None
         except Exception as e:
             logger.error(f"Failed to get cached search: {e}")
             return None
 
+    async def get_tag_ids(self, names: List[str]) -> Dict[str, Optional[UUID]]:
+        """Get cached tag ids for ``names`` in one MGET (None where not cached)."""
+        cached = await self.get_many([f"tag:name:{name}" for name in names])
+        tag_ids: Dict[str, Optional[UUID]] = {}
+        for name, value in zip(names, cached):
+            try:
+                tag_ids[name] = UUID(str(value)) if value else None
+            except ValueError:
+                tag_ids[name] = None
+        return tag_ids
+
+    async def cache_tag_ids(self, tag_ids: Dict[str, UUID], expire: int = 86400) -> bool:
+        """Cache tag name -> id mappings in one pipeline."""
+        return await self.set_many(
+            {f"tag:name:{name}": str(tag_id) for name, tag_id in tag_ids.items()}, expire
+        )
+
     async def cache_user_session(self, session_id: str, user_data: Dict[str, Any], expire: int = 3600) -> bool:
         """Cache user session for 1 hour by default."""
         session_key = f"session:{session_id}"
@@ -1,14 +1,128 @@
 """Note repository for database operations."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import and_, desc, func, or_, select
+from sqlalchemy import (
+    and_,
+    bindparam,
+    desc,
+    func,
+    lambda_stmt,
+    literal_column,
+    or_,
+    select,
+    text,
+    union_all,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import defer, raiseload, selectinload, with_expression
+from sqlalchemy.orm.interfaces import ORMOption
+from sqlalchemy.sql.elements import ColumnElement
 
+from ...config import get_settings
 from ..models.note import Note
-from ..models.tag import Tag
+from ..models.share import Share, ShareStatus
+from ..models.tag import NoteTag, Tag
+from ..models.types import GUID
+from ..models.user import User
+
+# Plain-text query for tag names: rows come straight from the driver,
+# skipping ORM column/entity post-processing on a single-column fetch.
+_USER_TAG_NAMES_SQL = text(
+    "SELECT DISTINCT tags.name FROM tags "
+    "JOIN note_tags ON note_tags.tag_id = tags.id "
+    "JOIN notes ON notes.id = note_tags.note_id "
+    "WHERE notes.owner_id = :owner_id "
+    "ORDER BY tags.name"
+).bindparams(bindparam("owner_id", type_=GUID()))
+
+
+# Search results only need a preview; load a short prefix of the content
+# instead of the full text. 210 chars is enough to know whether the
+# 200-char preview needs an ellipsis.
+CONTENT_PREVIEW_LENGTH = 210
+_preview_options: tuple[ORMOption, ...] = (
+    defer(Note.content),
+    with_expression(Note.content_preview, func.substr(Note.content, 1, CONTENT_PREVIEW_LENGTH)),
+)
+
+
+def _search_result_options() -> tuple[ORMOption, ...]:
+    """Preview loader options, callable from inside lambda statements."""
+    return _preview_options
+
+
+# Queries shorter than this rarely form a useful lexeme, so they keep the
+# substring match instead of going through the full-text index
+MIN_FULL_TEXT_QUERY_LENGTH = 3
+
+# Generated tsvector column, PostgreSQL only (created by the ix_notes_search_vec
+# migration or Note's create_all hooks); not mapped so SQLite schemas stay unchanged
+_search_vec: ColumnElement[Any] = literal_column("notes.search_vec")
+
+
+def full_text_condition(term: str) -> ColumnElement[bool]:
+    """Indexed ``search_vec @@ plainto_tsquery`` match (PostgreSQL only)."""
+    return _search_vec.bool_op("@@")(func.plainto_tsquery("english", term))
+
+
+def substring_condition(pattern: str) -> ColumnElement[bool]:
+    """ILIKE ``pattern`` against note title or content."""
+    return or_(Note.title.ilike(pattern), Note.content.ilike(pattern))
+
+
+def uses_full_text(query: str, dialect_name: str) -> bool:
+    """Whether ``query`` should go through the full-text index."""
+    return dialect_name == "postgresql" and len(query.strip()) >= MIN_FULL_TEXT_QUERY_LENGTH
+
+
+def text_search_condition(query: str, dialect_name: str) -> ColumnElement[bool]:
+    """Match ``query`` against note title/content.
+
+    On PostgreSQL this is an indexed ``search_vec @@ plainto_tsquery`` lookup;
+    elsewhere, and for very short queries, a substring ILIKE.
+    """
+    if uses_full_text(query, dialect_name):
+        return full_text_condition(query.strip())
+    return substring_condition(f"%{query}%")
+
+
+def accessible_note_condition(user_id: UUID) -> ColumnElement[bool]:
+    """Notes ``user_id`` owns plus notes actively shared with them.
+
+    Each branch is a plain index lookup, and IN makes duplicates harmless,
+    so no join against shares and no DISTINCT are needed.
+    """
+    accessible_ids = union_all(
+        select(Note.id).where(Note.owner_id == user_id),
+        select(Share.note_id).where(
+            Share.shared_with_user_id == user_id,
+            Share.status == ShareStatus.ACTIVE,
+        ),
+    ).subquery()
+    return Note.id.in_(select(accessible_ids.c.id))
+
+
+def tag_filter_condition(tag_names: List[str]) -> ColumnElement[bool]:
+    """EXISTS clause matching notes tagged with any of ``tag_names``."""
+    return (
+        select(1)
+        .select_from(NoteTag)
+        .join(Tag, Tag.id == NoteTag.tag_id)
+        .where(NoteTag.note_id == Note.id, Tag.name.in_(tag_names))
+        .exists()
+    )
+
+
+def tag_id_filter_condition(tag_ids: List[UUID]) -> ColumnElement[bool]:
+    """EXISTS clause matching notes tagged with any of ``tag_ids`` (no tags join)."""
+    return (
+        select(1)
+        .select_from(NoteTag)
+        .where(NoteTag.note_id == Note.id, NoteTag.tag_id.in_(tag_ids))
+        .exists()
+    )
 
 
 class NoteRepository:
@@ -31,6 +145,19 @@ class NoteRepository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_many_by_ids(self, note_ids: List[UUID]) -> List[Note]:
+        """Get notes (tags, content preview) by IDs in one query, keeping the given order."""
+        if not note_ids:
+            return []
+        stmt = (
+            select(Note)
+            .options(selectinload(Note.tags), *_preview_options)
+            .where(Note.id.in_(note_ids))
+        )
+        result = await self.session.execute(stmt)
+        notes_by_id = {note.id: note for note in result.scalars().all()}
+        return [notes_by_id[note_id] for note_id in note_ids if note_id in notes_by_id]
+
     async def get_by_id_and_user(self, note_id: UUID, user_id: UUID) -> Optional[Note]:
         """Get note by ID if owned by user."""
         stmt = (
@@ -41,6 +168,21 @@ class NoteRepository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_note_with_owner_and_access(
+        self, note_id: UUID, user_id: UUID
+    ) -> Optional[Tuple[Note, User, Optional[Share]]]:
+        """Get note, its owner and the user's share row (None if not shared) in one query."""
+        stmt = (
+            select(Note, User, Share)
+            .join(User, Note.owner_id == User.id)
+            .outerjoin(Share, and_(Share.note_id == Note.id, Share.shared_with_user_id == user_id))
+            .options(selectinload(Note.tags))
+            .where(Note.id == note_id)
+        )
+        result = await self.session.execute(stmt)
+        row = result.first()
+        return tuple(row) if row else None
+
     async def update_note(self, note_id: UUID, user_id: UUID, update_data: dict) -> Optional[Note]:
         """Update note if owned by user."""
         note = await self.get_by_id_and_user(note_id, user_id)
@@ -127,27 +269,37 @@ class NoteRepository:
         """List user notes with pagination and optional tag filter."""
         offset = (page - 1) * per_page
 
-        stmt = select(Note).options(selectinload(Note.tags)).where(Note.owner_id == user_id)
-
-        if tag_filter and len(tag_filter) > 0:
-            # Join with tags and filter
-            stmt = stmt.join(Note.tags).where(Tag.name.in_(tag_filter))
+        conditions = [Note.owner_id == user_id]
+        if tag_filter:
+            # Correlated EXISTS: a note matching several tags is still one
+            # row, so neither the page nor the count needs DISTINCT
+            conditions.append(tag_filter_condition(tag_filter))
 
         # Get total count
-        count_stmt = select(func.count(Note.id.distinct())).where(Note.owner_id == user_id)
-        if tag_filter and len(tag_filter) > 0:
-            count_stmt = count_stmt.join(Note.tags).where(Tag.name.in_(tag_filter))
-
+        count_stmt = select(func.count()).select_from(Note).where(*conditions)
         total_result = await self.session.execute(count_stmt)
         total_count = total_result.scalar()
 
         # Get paginated results
-        stmt = stmt.order_by(desc(Note.updated_at)).offset(offset).limit(per_page).distinct()
+        stmt = (
+            select(Note)
+            .options(selectinload(Note.tags))
+            .where(*conditions)
+            .order_by(desc(Note.updated_at))
+            .offset(offset)
+            .limit(per_page)
+        )
         result = await self.session.execute(stmt)
         notes = result.scalars().all()
 
         return list(notes), total_count
 
+    async def count_user_notes(self, user_id: UUID) -> int:
+        """Count notes owned by user without loading any rows."""
+        stmt = select(func.count()).select_from(Note).where(Note.owner_id == user_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
+
     async def get_user_tags(self, user_id: UUID) -> List[str]:
         """Get all unique tags for user's notes."""
         stmt = (
@@ -159,66 +311,76 @@ class NoteRepository:
         result = await self.session.execute(stmt)
         return [tag for tag in result.scalars()]
 
+    async def get_user_tag_names(self, user_id: UUID) -> List[str]:
+        """Get sorted unique tag names for user's notes via a raw SQL fetch."""
+        result = await self.session.execute(_USER_TAG_NAMES_SQL, {"owner_id": user_id})
+        return [row[0] for row in result]
+
+    async def get_tag_ids_by_names(self, names: List[str]) -> Dict[str, UUID]:
+        """Map existing tag names to their ids (unknown names are left out)."""
+        result = await self.session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names)))
+        return {name: tag_id for name, tag_id in result}
+
     async def search_notes(
-        self, user_id: UUID, query: str, tag_filter: Optional[List[str]] = None
-    ) -> List[Note]:
-        """Search notes by content or title (includes owned and shared notes)."""
-        from ..models.share import Share, ShareStatus
+        self,
+        user_id: UUID,
+        query: str,
+        tag_filter: Optional[List[str]] = None,
+        tag_id_filter: Optional[List[UUID]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Tuple[List[Note], int]:
+        """Search notes by content or title (includes owned and shared notes).
+
+        Tags can be filtered by name (``tag_filter``) or, cheaper, by already
+        resolved ids (``tag_id_filter``); an empty id list matches nothing.
+        Returns one page (``limit``/``offset``) and the total match count.
+        """
+        # Built as lambda statements: after the first call per shape, SQLAlchemy
+        # skips rebuilding the Select and computing its cache key, and only
+        # pulls the new parameter values out of the closures. Each optional
+        # clause is its own add_criteria step so the cache keys stay stable.
+        criteria = [lambda s: s.where(accessible_note_condition(user_id))]
 
         # Full-text search condition (only if query is provided)
-        has_query = query and query.strip() and query.strip() != "*"
-        if has_query:
-            search_condition = or_(Note.title.ilike(f"%{query}%"), Note.content.ilike(f"%{query}%"))
-        else:
-            # No text search, only access control and tag filter
-            search_condition = None
-
-        # Handle tag filter using subquery to avoid JOIN conflicts
-        if tag_filter and len(tag_filter) > 0:
-            # First, find note IDs that have the required tags
-            tag_subquery = (
-                select(Note.id)
-                .join(Note.tags)
-                .where(Tag.name.in_(tag_filter))
-                .subquery()
+        if query and query.strip() and query.strip() != "*":
+            if uses_full_text(query, self.session.get_bind().dialect.name):
+                term = query.strip()
+                criteria.append(lambda s: s.where(full_text_condition(term)))
+            else:
+                pattern = f"%{query}%"
+                criteria.append(lambda s: s.where(substring_condition(pattern)))
+
+        # Tag filter as a correlated EXISTS, so it never multiplies rows
+        if tag_id_filter is not None:
+            criteria.append(lambda s: s.where(tag_id_filter_condition(tag_id_filter)))
+        elif tag_filter:
+            criteria.append(lambda s: s.where(tag_filter_condition(tag_filter)))
+
+        # The total rides along as a window column, so one round-trip
+        # returns both the page and the full match count
+        stmt = lambda_stmt(
+            lambda: select(Note, func.count().over().label("total")).options(
+                selectinload(Note.tags), *_search_result_options()
             )
-
-            # Main query with access control and tag filter
-            stmt = select(Note).options(selectinload(Note.tags))
-            stmt = stmt.outerjoin(Share, Note.id == Share.note_id)
-
-            # Build access condition: owned by user OR shared with user (active shares only)
-            access_condition = or_(
-                Note.owner_id == user_id,  # Notes owned by user
-                and_(  # Notes shared with user
-                    Share.shared_with_user_id == user_id,
-                    Share.status == ShareStatus.ACTIVE
-                )
-            )
-            stmt = stmt.where(access_condition)
-            if search_condition is not None:
-                stmt = stmt.where(search_condition)
-
-            # Apply tag filter using subquery
-            stmt = stmt.where(Note.id.in_(select(tag_subquery.c.id)))
-
-        else:
-            # No tag filter - simpler query
-            stmt = select(Note).options(selectinload(Note.tags))
-            stmt = stmt.outerjoin(Share, Note.id == Share.note_id)
-
-            # Build access condition: owned by user OR shared with user (active shares only)
-            access_condition = or_(
-                Note.owner_id == user_id,  # Notes owned by user
-                and_(  # Notes shared with user
-                    Share.shared_with_user_id == user_id,
-                    Share.status == ShareStatus.ACTIVE
-                )
-            )
-            stmt = stmt.where(access_condition)
-            if search_condition is not None:
-                stmt = stmt.where(search_condition)
-
-        stmt = stmt.order_by(desc(Note.updated_at)).distinct()
-        result = await self.session.execute(stmt)
-        return list(result.scalars())
+        )
+        for criterion in criteria:
+            stmt += criterion
+        stmt += lambda s: s.order_by(desc(Note.updated_at), Note.id).offset(offset)
+        if limit is not None:
+            stmt += lambda s: s.limit(limit)
+        if get_settings().database_strict_loading:
+            # Results only carry tags; touching any other relationship is a bug
+            stmt += lambda s: s.options(raiseload("*"))
+
+        rows = (await self.session.execute(stmt)).all()
+        if rows:
+            return [row.Note for row in rows], rows[0].total
+        if not offset:
+            return [], 0
+
+        # Paged past the end: no row carried the total, so count separately
+        count_stmt = lambda_stmt(lambda: select(func.count()).select_from(Note))
+        for criterion in criteria:
+            count_stmt += criterion
+        return [], (await self.session.execute(count_stmt)).scalar_one()
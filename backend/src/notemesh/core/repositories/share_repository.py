@@ -1,14 +1,60 @@
 """Share repository for database operations."""
 
-from typing import List, Optional
+import base64
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from sqlalchemy import and_, desc, func, select
+from sqlalchemy import Select, and_, case, delete, desc, func, literal, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import defer, lazyload, selectinload, with_expression
+from sqlalchemy.sql.elements import ColumnElement
 
 from ..models.note import Note
-from ..models.share import Share
+from ..models.share import Share, ShareStatus
+from .note_repository import CONTENT_PREVIEW_LENGTH
+
+# Everything ShareResponse/NoteListItem touches, loaded up front so a page
+# of shares costs a fixed number of queries regardless of its size. Notes
+# come back with a content prefix only, and lazyload("*") stops the models'
+# default selectin relationships (user.notes, note.shares, ...) from pulling
+# in everything else those rows point at.
+_LIST_SHARE_LOADERS = (
+    selectinload(Share.note).options(
+        defer(Note.content),
+        with_expression(Note.content_preview, func.substr(Note.content, 1, CONTENT_PREVIEW_LENGTH)),
+        selectinload(Note.tags).lazyload("*"),
+        selectinload(Note.owner).lazyload("*"),
+        lazyload("*"),
+    ),
+    selectinload(Share.shared_with_user).lazyload("*"),
+    selectinload(Share.shared_by_user).lazyload("*"),
+)
+
+# Dialect-specific INSERT constructs that support ON CONFLICT DO UPDATE
+_UPSERT_INSERTS: Dict[str, Any] = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+
+def _involves_user(user_id: UUID) -> ColumnElement[bool]:
+    """Shares the user either gave or received."""
+    return or_(Share.shared_by_user_id == user_id, Share.shared_with_user_id == user_id)
+
+
+def encode_share_cursor(share: Share) -> str:
+    """Encode a share's (created_at, id) sort key as an opaque cursor."""
+    raw = f"{share.created_at.isoformat()}|{share.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_share_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor from encode_share_cursor; raises ValueError if malformed."""
+    try:
+        created_at, share_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(share_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
 
 
 class ShareRepository:
@@ -53,35 +99,50 @@ class ShareRepository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def delete_share(self, share_id: UUID, user_id: UUID) -> bool:
-        """Delete share if owned by user."""
-        share = await self.get_user_share(share_id, user_id)
-        if not share:
-            return False
+    async def delete_share(self, share_id: UUID, user_id: UUID) -> Optional[UUID]:
+        """Delete share if owned by user, returning its recipient's id (None if not found).
 
-        await self.session.delete(share)
-        await self.session.commit()
-        return True
+        A single DELETE ... RETURNING; the row is never loaded first.
+        """
+        stmt = (
+            delete(Share)
+            .where(and_(Share.id == share_id, Share.shared_by_user_id == user_id))
+            .returning(Share.shared_with_user_id)
+        )
+        result = await self.session.execute(stmt)
+        recipient_id = result.scalar_one_or_none()
+        if recipient_id is None:
+            return None
 
-    async def list_shares_given(
-        self, user_id: UUID, page: int = 1, per_page: int = 20
-    ) -> tuple[List[Share], int]:
-        """List shares created by user."""
-        offset = (page - 1) * per_page
+        await self.session.commit()
+        return recipient_id
 
-        # Count query
+    async def count_shares_given(self, user_id: UUID) -> int:
+        """Count shares created by user."""
         count_stmt = select(func.count(Share.id)).where(Share.shared_by_user_id == user_id)
         total_result = await self.session.execute(count_stmt)
-        total_count = total_result.scalar()
+        return total_result.scalar_one()
+
+    async def list_shares_given(
+        self,
+        user_id: UUID,
+        page: int = 1,
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        with_count: bool = False,
+    ) -> tuple[List[Share], Optional[int]]:
+        """List shares created by user (keyset pagination when a cursor is given).
+
+        The total is None when ``with_count`` is False (skips the COUNT query).
+        """
+        total_count = await self.count_shares_given(user_id) if with_count else None
 
         # Data query
-        stmt = (
-            select(Share)
-            .options(selectinload(Share.note), selectinload(Share.shared_with_user))
-            .where(Share.shared_by_user_id == user_id)
-            .order_by(desc(Share.created_at))
-            .offset(offset)
-            .limit(per_page)
+        stmt = self._paginate(
+            select(Share).options(*_LIST_SHARE_LOADERS).where(Share.shared_by_user_id == user_id),
+            page,
+            per_page,
+            cursor,
         )
 
         result = await self.session.execute(stmt)
@@ -89,25 +150,32 @@ class ShareRepository:
 
         return shares, total_count
 
-    async def list_shares_received(
-        self, user_id: UUID, page: int = 1, per_page: int = 20
-    ) -> tuple[List[Share], int]:
-        """List shares received by user."""
-        offset = (page - 1) * per_page
-
-        # Count query
+    async def count_shares_received(self, user_id: UUID) -> int:
+        """Count shares received by user."""
         count_stmt = select(func.count(Share.id)).where(Share.shared_with_user_id == user_id)
         total_result = await self.session.execute(count_stmt)
-        total_count = total_result.scalar()
+        return total_result.scalar_one()
+
+    async def list_shares_received(
+        self,
+        user_id: UUID,
+        page: int = 1,
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        with_count: bool = False,
+    ) -> tuple[List[Share], Optional[int]]:
+        """List shares received by user (keyset pagination when a cursor is given).
+
+        The total is None when ``with_count`` is False (skips the COUNT query).
+        """
+        total_count = await self.count_shares_received(user_id) if with_count else None
 
         # Data query
-        stmt = (
-            select(Share)
-            .options(selectinload(Share.note), selectinload(Share.shared_by_user))
-            .where(Share.shared_with_user_id == user_id)
-            .order_by(desc(Share.created_at))
-            .offset(offset)
-            .limit(per_page)
+        stmt = self._paginate(
+            select(Share).options(*_LIST_SHARE_LOADERS).where(Share.shared_with_user_id == user_id),
+            page,
+            per_page,
+            cursor,
         )
 
         result = await self.session.execute(stmt)
@@ -115,6 +183,56 @@ class ShareRepository:
 
         return shares, total_count
 
+    async def count_shares_all(self, user_id: UUID) -> int:
+        """Count shares created or received by user."""
+        count_stmt = select(func.count(Share.id)).where(_involves_user(user_id))
+        total_result = await self.session.execute(count_stmt)
+        return total_result.scalar_one()
+
+    async def list_shares_all(
+        self,
+        user_id: UUID,
+        page: int = 1,
+        per_page: int = 20,
+        cursor: Optional[str] = None,
+        with_count: bool = False,
+    ) -> tuple[List[Tuple[Share, str]], Optional[int]]:
+        """List shares created and received by user as ``(share, direction)`` pairs.
+
+        Both directions come from one query, with "given"/"received" computed
+        in SQL, so a view showing both doesn't need two listings.
+        """
+        total_count = await self.count_shares_all(user_id) if with_count else None
+
+        direction = case((Share.shared_by_user_id == user_id, "given"), else_="received").label(
+            "direction"
+        )
+        stmt = self._paginate(
+            select(Share, direction).options(*_LIST_SHARE_LOADERS).where(_involves_user(user_id)),
+            page,
+            per_page,
+            cursor,
+        )
+
+        result = await self.session.execute(stmt)
+        rows = [(row.Share, row.direction) for row in result]
+
+        return rows, total_count
+
+    @staticmethod
+    def _paginate(
+        stmt: Select[Any], page: int, per_page: int, cursor: Optional[str]
+    ) -> Select[Any]:
+        """Order newest first and page by cursor (seek) or, without one, by offset."""
+        stmt = stmt.order_by(desc(Share.created_at), desc(Share.id)).limit(per_page)
+        if cursor:
+            created_at, share_id = decode_share_cursor(cursor)
+            key = tuple_(
+                literal(created_at, Share.created_at.type), literal(share_id, Share.id.type)
+            )
+            return stmt.where(tuple_(Share.created_at, Share.id) < key)
+        return stmt.offset((page - 1) * per_page)
+
     async def check_note_access(self, note_id: UUID, user_id: UUID) -> dict:
         """Check user's access permissions to a note."""
         # Check if user owns the note
@@ -175,6 +293,69 @@ class ShareRepository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def upsert_shares(self, shares_data: List[dict]) -> Dict[UUID, Share]:
+        """Create or update shares of one note in a single INSERT ... ON CONFLICT.
+
+        Existing (note, recipient) shares get the new permission and message and
+        are reactivated. Dialects without ON CONFLICT fall back to loading the
+        existing shares and updating them in place. Returns the saved shares
+        keyed by recipient ID, with relationships loaded by one follow-up query.
+        """
+        if not shares_data:
+            return {}
+
+        note_id = shares_data[0]["note_id"]
+        recipient_ids = [share_data["shared_with_user_id"] for share_data in shares_data]
+
+        insert = _UPSERT_INSERTS.get(self.session.get_bind().dialect.name)
+        if insert is None:
+            await self._save_shares_without_upsert(note_id, recipient_ids, shares_data)
+        else:
+            insert_stmt = insert(Share).values(shares_data)
+            upsert_stmt = insert_stmt.on_conflict_do_update(
+                index_elements=[Share.note_id, Share.shared_with_user_id],
+                set_={
+                    "permission": insert_stmt.excluded.permission,
+                    "share_message": insert_stmt.excluded.share_message,
+                    "status": ShareStatus.ACTIVE.value,  # Reactivate if was revoked
+                    "updated_at": datetime.now(timezone.utc),
+                },
+            )
+            await self.session.execute(upsert_stmt)
+        await self.session.commit()
+
+        stmt = (
+            select(Share)
+            .options(
+                selectinload(Share.note),
+                selectinload(Share.shared_by_user),
+                selectinload(Share.shared_with_user),
+            )
+            .where(and_(Share.note_id == note_id, Share.shared_with_user_id.in_(recipient_ids)))
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        return {share.shared_with_user_id: share for share in result.scalars()}
+
+    async def _save_shares_without_upsert(
+        self, note_id: UUID, recipient_ids: List[UUID], shares_data: List[dict]
+    ) -> None:
+        """Select-then-insert/update equivalent of the upsert (left uncommitted)."""
+        stmt = select(Share).where(
+            and_(Share.note_id == note_id, Share.shared_with_user_id.in_(recipient_ids))
+        )
+        result = await self.session.execute(stmt)
+        existing = {share.shared_with_user_id: share for share in result.scalars()}
+
+        for share_data in shares_data:
+            share = existing.get(share_data["shared_with_user_id"])
+            if share is None:
+                self.session.add(Share(**share_data))
+                continue
+            share.permission = share_data.get("permission", share.permission)
+            share.share_message = share_data.get("share_message")
+            share.status = ShareStatus.ACTIVE  # Reactivate if was revoked
+
     async def update_share(self, share_id: UUID, update_data: dict) -> Share:
         """Update existing share."""
         share = await self.get_by_id(share_id)
@@ -214,6 +395,37 @@ class ShareRepository:
         result = await self.session.execute(stmt)
         return list(result.scalars())
 
-    async def check_existing_share(self, note_id: UUID, shared_with_user_id: UUID) -> Optional[Share]:
+    async def count_active_shares_by_note(
+        self, user_id: UUID, note_ids: List[UUID]
+    ) -> Dict[UUID, int]:
+        """Count the user's active, unexpired shares of each note in one grouped query.
+
+        Notes without such shares are left out of the result.
+        """
+        if not note_ids:
+            return {}
+
+        stmt = (
+            select(Share.note_id, func.count(Share.id))
+            .where(
+                Share.shared_by_user_id == user_id,
+                Share.note_id.in_(note_ids),
+                Share.status == ShareStatus.ACTIVE,
+                or_(Share.expires_at.is_(None), Share.expires_at > datetime.now(timezone.utc)),
+            )
+            .group_by(Share.note_id)
+        )
+        result = await self.session.execute(stmt)
+        return {note_id: count for note_id, count in result.all()}
+
+    async def get_note_recipient_ids(self, note_id: UUID) -> List[UUID]:
+        """Ids of every user a note is shared with."""
+        stmt = select(Share.shared_with_user_id).where(Share.note_id == note_id)
+        result = await self.session.execute(stmt)
+        return list(result.scalars())
+
+    async def check_existing_share(
+        self, note_id: UUID, shared_with_user_id: UUID
+    ) -> Optional[Share]:
         """Alias for get_existing_share."""
         return await self.get_existing_share(note_id, shared_with_user_id)
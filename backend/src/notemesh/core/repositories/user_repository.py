@@ -1,6 +1,6 @@
 """User repository for database operations."""
 
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from sqlalchemy import select
@@ -35,6 +35,14 @@ class UserRepository:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_by_usernames(self, usernames: List[str]) -> List[User]:
+        """Get users by usernames in one query (unknown usernames are skipped)."""
+        if not usernames:
+            return []
+        stmt = select(User).where(User.username.in_(usernames))
+        result = await self.session.execute(stmt)
+        return list(result.scalars())
+
     async def update_user(self, user_id: UUID, update_data: dict) -> Optional[User]:
         """Update user data."""
         user = await self.get_by_id(user_id)
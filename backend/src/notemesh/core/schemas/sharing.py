@@ -85,6 +85,11 @@ class ShareResponse(BaseModel):
     is_active: bool = Field(description="Whether the share is currently active")
     access_count: int = Field(default=0, description="Number of times shared note was accessed")
 
+    # Only set when listing both directions at once (type=all)
+    direction: Optional[str] = Field(
+        default=None, description="Whether the requesting user gave or received the share"
+    )
+
     model_config = ConfigDict(
         from_attributes=True,
         json_schema_extra={
@@ -171,12 +176,19 @@ class ShareListRequest(BaseModel):
 
     # Type of shares to list
     type: Optional[str] = Field(
-        default="given", description="Type of shares to list (given or received)"
+        default="given", description="Type of shares to list (given, received or all)"
     )
 
     # Pagination
     page: Optional[int] = Field(default=1, ge=1, description="Page number")
     per_page: Optional[int] = Field(default=20, ge=1, le=100, description="Items per page")
+    cursor: Optional[str] = Field(
+        default=None,
+        description="Opaque cursor from a previous response's next_cursor (overrides page)",
+    )
+    include_total: bool = Field(
+        default=False, description="Also return total_count/total_pages (extra count lookup)"
+    )
 
     model_config = ConfigDict(
         json_schema_extra={"example": {"type": "received", "page": 1, "per_page": 20}}
@@ -187,11 +199,18 @@ class ShareListResponse(BaseModel):
     """Paginated share list response."""
 
     shares: List[ShareResponse] = Field(description="List of shares")
-    total_count: int = Field(description="Total number of shares")
+    total_count: Optional[int] = Field(
+        default=None, description="Total number of shares (only when include_total)"
+    )
     page: int = Field(description="Current page number")
     per_page: int = Field(description="Items per page")
-    total_pages: int = Field(description="Total number of pages")
+    total_pages: Optional[int] = Field(
+        default=None, description="Total number of pages (only when include_total)"
+    )
     type: str = Field(description="Type of shares listed")
+    next_cursor: Optional[str] = Field(
+        default=None, description="Cursor for the next page (None when this page is the last)"
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -7,6 +7,7 @@ from typing import Any, Dict
 import redis.asyncio as redis
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.pool import QueuePool
 
 from ...config import get_settings
 from ..schemas.common import HealthCheckResponse
@@ -87,10 +88,17 @@ class HealthService(IHealthService):
     async def get_system_metrics(self) -> Dict[str, Any]:
         """Get system metrics."""
         # Basic system metrics
-        return {
+        metrics: Dict[str, Any] = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "uptime_seconds": None,  # Could be implemented
             "memory_usage_mb": None,  # Could be implemented
             "cpu_usage_percent": None,  # Could be implemented
-            "active_connections": None,  # Could be implemented
         }
+
+        # Pool usage of the engine this session is bound to; only queue pools
+        # (Postgres) track checkouts, StaticPool/NullPool (SQLite) do not
+        pool = getattr(getattr(self.session, "bind", None), "pool", None)
+        if isinstance(pool, QueuePool):
+            metrics["active_connections"] = pool.checkedout()
+            metrics["db_pool"] = pool.status()  # watch for saturation (overflow in use)
+        return metrics
@@ -75,6 +75,8 @@ class NoteService(INoteService):
         except Exception as e:
             logger.warning(f"Failed to index note in Redis: {e}")
 
+        await self._invalidate_search_cache(user_id)
+
         return await self._note_to_response(
             note, user_id, override_tags=list(all_tags) if all_tags else []
         )
@@ -179,6 +181,8 @@ class NoteService(INoteService):
         except Exception as e:
             logger.warning(f"Failed to re-index updated note in Redis: {e}")
 
+        await self._invalidate_search_cache(user_id, await self._get_share_recipient_ids(note_id))
+
         return await self._note_to_response(updated_note, user_id)
 
     async def delete_note(self, note_id: UUID, user_id: UUID) -> bool:
@@ -192,7 +196,12 @@ class NoteService(INoteService):
         except Exception as e:
             logger.warning(f"Failed to remove note from Redis search index: {e}")
 
-        return await self.note_repo.delete_note(note_id, user_id)
+        # Shares cascade with the note, so find its recipients beforehand
+        recipient_ids = await self._get_share_recipient_ids(note_id)
+        deleted = await self.note_repo.delete_note(note_id, user_id)
+        if deleted:
+            await self._invalidate_search_cache(user_id, recipient_ids)
+        return deleted
 
     async def list_user_notes(
         self,
@@ -211,7 +220,12 @@ class NoteService(INoteService):
             user_id, page, per_page, tag_filter
         )
 
-        note_responses = [await self._note_to_list_item(note, user_id) for note in notes]
+        # One grouped query counts the shares of every note on the page
+        share_counts = await self._get_share_counts([note.id for note in notes], user_id)
+        note_responses = [
+            await self._note_to_list_item(note, user_id, share_counts=share_counts)
+            for note in notes
+        ]
 
         return NoteListResponse.create(
             items=note_responses, total=total_count, page=page, per_page=per_page
@@ -347,7 +361,9 @@ class NoteService(INoteService):
             sharing_info=sharing_info,
         )
 
-    async def _note_to_list_item(self, note, current_user_id=None, override_tags=None) -> NoteListItem:
+    async def _note_to_list_item(
+        self, note, current_user_id=None, override_tags=None, share_counts=None
+    ) -> NoteListItem:
         """Convert note model to list item response."""
         # Use override_tags if provided, otherwise try to load from relationship
         if override_tags is not None:
@@ -377,13 +393,10 @@ class NoteService(INoteService):
         share_count = 0
         if current_user_id and current_user_id == note.owner_id:
             # Only get sharing info if current user owns this note
-            try:
-                sharing_info = await self._get_note_sharing_info(note.id, current_user_id)
-                is_shared_by_user = sharing_info.get("is_shared_by_user", False)
-                share_count = sharing_info.get("share_count", 0)
-            except Exception:
-                # Fallback if sharing lookup fails
-                pass
+            if share_counts is None:
+                share_counts = await self._get_share_counts([note.id], current_user_id)
+            share_count = share_counts.get(note.id, 0)
+            is_shared_by_user = share_count > 0
 
         return NoteListItem(
             id=note.id,
@@ -411,36 +424,51 @@ class NoteService(INoteService):
         urls = re.findall(url_pattern, text, re.IGNORECASE)
         return list(set(urls))
 
+    async def _invalidate_search_cache(
+        self, user_id: UUID, recipient_ids: Iterable[UUID] = ()
+    ) -> None:
+        """Make cached search results stale after a note change.
+
+        Share recipients see the note in their own searches, so their
+        versions are bumped along with the owner's.
+        """
+        try:
+            from ..redis_client import get_redis_client
+            redis_client = get_redis_client()
+            await redis_client.bump_search_versions([user_id, *recipient_ids])
+        except Exception as e:
+            logger.warning(f"Failed to invalidate search cache in Redis: {e}")
+
+    async def _get_share_recipient_ids(self, note_id: UUID) -> List[UUID]:
+        """Users the note is shared with, for search cache invalidation."""
+        try:
+            return await self.share_repo.get_note_recipient_ids(note_id)
+        except Exception as e:
+            logger.warning(f"Failed to look up share recipients of note {note_id}: {e}")
+            return []
+
     async def _get_user_info(self, user_id: UUID) -> Optional[User]:
         """Get user information by ID."""
         return await self.user_repo.get_by_id(user_id)
 
-    async def _get_note_sharing_info(self, note_id: UUID, user_id: UUID) -> dict:
-        """Get sharing information for a note owned by the user."""
+    async def _get_share_counts(self, note_ids: List[UUID], user_id: UUID) -> Dict[UUID, int]:
+        """Count the user's active shares of each note, in one query for all of them."""
         try:
-            # Count active shares for this note created by the user
-            shares_given, _ = await self.share_repo.list_shares_given(user_id, page=1, per_page=1000)
-            note_shares = [share for share in shares_given if share.note_id == note_id and getattr(share, 'is_active', True)]
-
-            return {
-                "is_shared_by_user": len(note_shares) > 0,
-                "share_count": len(note_shares),
-                "shared_with": [getattr(share, 'shared_with_username', 'Unknown') for share in note_shares]
-            }
+            return await self.share_repo.count_active_shares_by_note(user_id, note_ids)
         except Exception:
-            # Fallback in case of any error
-            return {
-                "is_shared_by_user": False,
-                "share_count": 0,
-                "shared_with": []
-            }
+            # Fallback in case of any error: report the notes as unshared
+            return {}
 
     async def _get_detailed_sharing_info(self, note_id: UUID, user_id: UUID) -> dict:
         """Get detailed sharing information for note detail view."""
         try:
             # Get all active shares for this note created by the user
-            shares_given, _ = await self.share_repo.list_shares_given(user_id, page=1, per_page=1000)
-            note_shares = [share for share in shares_given if share.note_id == note_id and getattr(share, 'is_active', True)]
+            shares = await self.share_repo.get_note_shares(note_id)
+            note_shares = [
+                share
+                for share in shares
+                if share.shared_by_user_id == user_id and getattr(share, 'is_active', True)
+            ]
 
             # Build detailed sharing information
             shared_with_details = []
@@ -1,19 +1,30 @@
 """Search service implementation."""
 
-import json
 import logging
+import time
 from typing import Any, Dict, List
 from uuid import UUID
 
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..repositories.note_repository import NoteRepository
-from ..schemas.notes import NoteSearchRequest, NoteSearchResponse
+from ..repositories.share_repository import ShareRepository
+from ..repositories.user_repository import UserRepository
+from ..schemas.notes import NoteListItem, NoteSearchRequest, NoteSearchResponse
 from ..redis_client import get_redis_client
 from .interfaces import ISearchService
 
 logger = logging.getLogger(__name__)
 
+# Tag name -> id mappings never change once a tag exists
+TAG_ID_CACHE_TTL = 86400
+
+
+def _elapsed_ms(start_ns: int) -> float:
+    """Milliseconds elapsed since a ``time.perf_counter_ns()`` reading."""
+    return (time.perf_counter_ns() - start_ns) / 1e6
+
 
 class SearchService(ISearchService):
     """Search service implementation."""
@@ -21,19 +32,26 @@ class SearchService(ISearchService):
     def __init__(self, session: AsyncSession):
         self.session = session
         self.note_repo = NoteRepository(session)
+        # Owner/sharing lookups need a real session; built once per service
+        self.user_repo = UserRepository(session) if session is not None else None
+        self.share_repo = ShareRepository(session) if session is not None else None
         self.redis_client = get_redis_client()
 
     async def search_notes(self, user_id: UUID, request: NoteSearchRequest) -> NoteSearchResponse:
         """Search notes with filters - with Redis caching."""
-        import time
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         # Allow search with only tag filter (no query text)
-        has_query = request.query.strip() and request.query.strip() != "*"
-        has_tags = request.tags and len(request.tags) > 0
+        query_text = (request.query or "").strip()
+        has_query = query_text and query_text != "*"
+        # Drop repeated tag names up front (keeping first-seen order) so the
+        # cache key, Redis lookups and SQL filter each see every tag once
+        tags = list(dict.fromkeys(request.tags or []))
+        has_tags = len(tags) > 0
 
         if not has_query and not has_tags:
-            # If no query and no tags, return empty results
+            # If no query and no tags, return empty results before any
+            # Redis or database round-trip
             return NoteSearchResponse(
                 items=[],
                 total=0,
@@ -43,28 +61,32 @@ class SearchService(ISearchService):
                 has_next=False,
                 has_prev=False,
                 query=request.query,
-                filters_applied={"tag_filter": request.tags or []},
+                filters_applied={"tag_filter": tags},
                 search_time_ms=0.0,
             )
 
         # Create cache key from search parameters
         cache_key_data = {
-            "query": request.query.strip(),
-            "tags": sorted(request.tags) if request.tags else [],
+            "query": query_text,
+            "tags": sorted(tags),
             "page": request.page or 1,
             "per_page": request.per_page or 20,
         }
-        cache_key = f"search:{user_id}:{hash(str(cache_key_data))}"
+
+        # Per-user version is bumped on every note write, so entries cached
+        # before a change are simply never read again (TTL cleans them up)
+        cache_version = 0
 
         # Try to get cached results first
         try:
+            cache_version = await self.redis_client.get_search_version(user_id)
             cached_result = await self.redis_client.get_cached_search(
-                str(cache_key_data), user_id
+                str(cache_key_data), user_id, version=cache_version
             )
             if cached_result:
                 logger.info(f"Cache HIT for search query: {request.query}")
                 # Convert back to NoteSearchResponse
-                search_time_ms = (time.time() - start_time) * 1000
+                search_time_ms = _elapsed_ms(start_ns)
                 cached_result["search_time_ms"] = search_time_ms
                 cached_result["cached"] = True
                 return NoteSearchResponse(**cached_result)
@@ -77,51 +99,58 @@ class SearchService(ISearchService):
         redis_results = []
         try:
             redis_results = await self.redis_client.search_notes(
-                query=request.query.strip(),
+                query=query_text,
                 user_id=user_id,
-                tags=request.tags or []
+                tags=tags
             )
             logger.info(f"Redis full-text search returned {len(redis_results)} results")
         except Exception as e:
             logger.warning(f"Redis search failed, falling back to database: {e}")
 
-        # If Redis search found results, use them; otherwise fallback to database
+        page = request.page or 1
+        per_page = request.per_page or 20
+        offset = (page - 1) * per_page
+
+        # If Redis search found results, use them; otherwise fallback to database.
+        # Either way only the current page is loaded, so only it pays for
+        # owner/sharing lookups and NoteListItem construction
         if redis_results:
             logger.info(f"Using Redis search results for query: {request.query}")
-            # Convert Redis results to notes
-            notes = []
+            # Fetch the note objects for this page of Redis hits in one
+            # query, keeping Redis score order
+            note_ids = []
             for result in redis_results:
-                # We need to fetch the actual note objects from database
-                # using the note IDs from Redis results
                 try:
-                    note_id = UUID(result["note_id"])
-                    note = await self.note_repo.get_by_id(note_id)
-                    if note:
-                        notes.append(note)
+                    note_ids.append(UUID(result["note_id"]))
                 except Exception as e:
-                    logger.warning(f"Failed to fetch note {result.get('note_id')}: {e}")
+                    logger.warning(f"Skipping invalid note id {result.get('note_id')}: {e}")
+            total = len(note_ids)
+            page_notes = await self.note_repo.get_many_by_ids(note_ids[offset:offset + per_page])
         else:
             logger.info(f"Using database search for query: {request.query}")
-            # Fallback to database search
-            notes = await self.note_repo.search_notes(
-                user_id=user_id, query=request.query.strip(), tag_filter=request.tags
+            # Fallback to database search, paginated in SQL
+            tag_id_filter = await self._resolve_tag_ids(tags) if tags else None
+            page_notes, total = await self.note_repo.search_notes(
+                user_id=user_id,
+                query=query_text,
+                tag_id_filter=tag_id_filter,
+                limit=per_page,
+                offset=offset,
             )
 
         # Convert to list item format for search results
-        from ..schemas.notes import NoteListItem
-
         note_list_items = []
+        user_repo = self.user_repo
+        share_repo = self.share_repo
+
+        # Active share counts for the whole page come from one grouped query
+        share_counts: Dict[UUID, int] = {}
+        if share_repo:
+            share_counts = await self._get_share_counts(
+                share_repo, [note.id for note in page_notes], user_id
+            )
 
-        # Get repositories if session is available
-        user_repo = None
-        share_repo = None
-        if self.session is not None:
-            from ..repositories.user_repository import UserRepository
-            from ..repositories.share_repository import ShareRepository
-            user_repo = UserRepository(self.session)
-            share_repo = ShareRepository(self.session)
-
-        for note in notes:
+        for note in page_notes:
             # Get owner information if user repository is available
             owner_username = None
             owner_display_name = None
@@ -134,20 +163,17 @@ class SearchService(ISearchService):
                     # Fallback if user lookup fails
                     pass
 
-            # Create content preview
-            content_preview = note.content[:200] + "..." if len(note.content) > 200 else note.content
+            # Create content preview from the SQL-side prefix when present
+            preview_source = getattr(note, "content_preview", None)
+            if not isinstance(preview_source, str):
+                preview_source = note.content
+            content_preview = (
+                preview_source[:200] + "..." if len(preview_source) > 200 else preview_source
+            )
 
-            # Get sharing information if share repository is available
-            is_shared_by_user = False
-            share_count = 0
-            if share_repo:
-                try:
-                    sharing_info = await self._get_note_sharing_info(share_repo, note.id, user_id)
-                    is_shared_by_user = sharing_info.get("is_shared_by_user", False)
-                    share_count = sharing_info.get("share_count", 0)
-                except Exception:
-                    # Fallback if sharing lookup fails
-                    pass
+            # Sharing information, from the page-wide counts
+            share_count = share_counts.get(note.id, 0)
+            is_shared_by_user = share_count > 0
 
             # Determine ownership: is this note owned by the current user?
             is_owned = note.owner_id == user_id
@@ -158,7 +184,10 @@ class SearchService(ISearchService):
                 id=note.id,
                 title=note.title,
                 content_preview=content_preview,
-                tags=[tag.name if hasattr(tag, 'name') else str(tag) for tag in getattr(note, 'tags', [])],
+                tags=[
+                    tag.name if hasattr(tag, 'name') else str(tag)
+                    for tag in getattr(note, 'tags', [])
+                ],
                 owner_id=note.owner_id,
                 owner_username=owner_username,
                 owner_display_name=owner_display_name,
@@ -172,36 +201,30 @@ class SearchService(ISearchService):
             )
             note_list_items.append(note_list_item)
 
-        # Apply pagination
-        page = request.page or 1
-        per_page = request.per_page or 20
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-
-        paginated_notes = note_list_items[start_idx:end_idx]
-
         # Calculate search time
-        search_time_ms = (time.time() - start_time) * 1000
+        search_time_ms = _elapsed_ms(start_ns)
 
         # Build response
         response = NoteSearchResponse(
-            items=paginated_notes,
-            total=len(note_list_items),
+            items=note_list_items,
+            total=total,
             page=page,
             per_page=per_page,
-            pages=(len(note_list_items) + per_page - 1) // per_page,
-            has_next=end_idx < len(note_list_items),
+            pages=(total + per_page - 1) // per_page,
+            has_next=offset + per_page < total,
             has_prev=page > 1,
             query=request.query,
-            filters_applied={"tag_filter": request.tags or []},
+            filters_applied={"tag_filter": tags},
             search_time_ms=search_time_ms,
         )
 
         # Cache the results for 5 minutes (300 seconds)
         try:
-            response_dict = response.model_dump()
+            # Serialize once, straight to JSON (no intermediate dict); the
+            # client stores the string as-is
             await self.redis_client.cache_search_results(
-                str(cache_key_data), user_id, response_dict, expire=300
+                str(cache_key_data), user_id, response.model_dump_json(), expire=300,
+                version=cache_version,
             )
             logger.info(f"Cached search results for query: {request.query}")
         except Exception as e:
@@ -222,25 +245,41 @@ class SearchService(ISearchService):
         # In a real application, this would remove from search index
         return True
 
-    async def _get_note_sharing_info(self, share_repo, note_id: UUID, user_id: UUID) -> dict:
-        """Get sharing information for a note owned by the user."""
+    async def _resolve_tag_ids(self, names: List[str]) -> List[UUID]:
+        """Resolve tag names to ids, using the Redis name -> id cache first.
+
+        Tags are never deleted or renamed, so cached ids stay valid; names
+        that don't exist yet are not cached.
+        """
+        resolved: Dict[str, UUID] = {}
+        try:
+            cached = await self.redis_client.get_tag_ids(names)
+            resolved.update({name: tag_id for name, tag_id in cached.items() if tag_id})
+        except Exception as e:
+            logger.warning(f"Tag id cache lookup failed: {e}")
+
+        missing = [name for name in names if name not in resolved]
+        if missing:
+            # One IN query for every cache miss
+            found = await self.note_repo.get_tag_ids_by_names(missing)
+            resolved.update(found)
+            if found:
+                try:
+                    await self.redis_client.cache_tag_ids(found, expire=TAG_ID_CACHE_TTL)
+                except Exception as e:
+                    logger.warning(f"Failed to cache tag ids: {e}")
+
+        return [resolved[name] for name in names if name in resolved]
+
+    async def _get_share_counts(
+        self, share_repo, note_ids: List[UUID], user_id: UUID
+    ) -> Dict[UUID, int]:
+        """Count the user's active shares of each note, in one query for all of them."""
         try:
-            # Count active shares for this note created by the user
-            shares_given, _ = await share_repo.list_shares_given(user_id, page=1, per_page=1000)
-            note_shares = [share for share in shares_given if share.note_id == note_id and getattr(share, 'is_active', True)]
-
-            return {
-                "is_shared_by_user": len(note_shares) > 0,
-                "share_count": len(note_shares),
-                "shared_with": [getattr(share, 'shared_with_username', 'Unknown') for share in note_shares]
-            }
+            return await share_repo.count_active_shares_by_note(user_id, note_ids)
         except Exception:
-            # Fallback in case of any error
-            return {
-                "is_shared_by_user": False,
-                "share_count": 0,
-                "shared_with": []
-            }
+            # Fallback in case of any error: report the notes as unshared
+            return {}
 
     async def suggest_tags(self, user_id: UUID, query: str, limit: int = 10) -> List[str]:
         """Suggest tags based on query - with Redis caching."""
@@ -255,15 +294,14 @@ class SearchService(ISearchService):
             cached_result = await self.redis_client.get(cache_key)
             if cached_result:
                 logger.info(f"Cache HIT for tag suggestions: {query}")
-                import json
-                return json.loads(cached_result)
+                return orjson.loads(cached_result)
         except Exception as e:
             logger.warning(f"Tag suggestions cache lookup failed: {e}")
 
         logger.info(f"Cache MISS for tag suggestions: {query}")
 
         # Get all user tags from database
-        all_tags = await self.note_repo.get_user_tags(user_id)
+        all_tags = await self.note_repo.get_user_tag_names(user_id)
 
         # Filter tags that contain the query (case insensitive)
         query_lower = query.lower()
@@ -284,8 +322,7 @@ class SearchService(ISearchService):
 
         # Cache the results for 5 minutes (300 seconds)
         try:
-            import json
-            await self.redis_client.set(cache_key, json.dumps(result), expire=300)
+            await self.redis_client.set(cache_key, orjson.dumps(result), expire=300)
             logger.info(f"Cached tag suggestions for query: {query}")
         except Exception as e:
             logger.warning(f"Failed to cache tag suggestions: {e}")
@@ -302,18 +339,17 @@ class SearchService(ISearchService):
             cached_result = await self.redis_client.get(cache_key)
             if cached_result:
                 logger.info(f"Cache HIT for search stats: {user_id}")
-                import json
-                return json.loads(cached_result)
+                return orjson.loads(cached_result)
         except Exception as e:
             logger.warning(f"Search stats cache lookup failed: {e}")
 
         logger.info(f"Cache MISS for search stats: {user_id}")
 
         # Get basic stats about user's notes from database
-        all_tags = await self.note_repo.get_user_tags(user_id)
+        all_tags = await self.note_repo.get_user_tag_names(user_id)
 
-        # Count notes (using a simple approach)
-        notes, total_count = await self.note_repo.list_user_notes(user_id, page=1, per_page=1)
+        # Count notes with a plain COUNT(*) instead of loading a page of notes
+        total_count = await self.note_repo.count_user_notes(user_id)
 
         result = {
             "total_notes": total_count,
@@ -324,8 +360,7 @@ class SearchService(ISearchService):
 
         # Cache the results for 10 minutes (600 seconds) since stats change less frequently
         try:
-            import json
-            await self.redis_client.set(cache_key, json.dumps(result), expire=600)
+            await self.redis_client.set(cache_key, orjson.dumps(result), expire=600)
             logger.info(f"Cached search stats for user: {user_id}")
         except Exception as e:
             logger.warning(f"Failed to cache search stats: {e}")
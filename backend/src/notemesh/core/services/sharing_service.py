@@ -1,14 +1,16 @@
 """Sharing service implementation."""
 
-from typing import Dict, List
+import logging
+from typing import Dict, List, Optional, Tuple
 from uuid import UUID
-from datetime import datetime, timezone
 
+import orjson
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..models.share import Share
 from ..repositories.note_repository import NoteRepository
-from ..repositories.share_repository import ShareRepository
+from ..repositories.share_repository import ShareRepository, encode_share_cursor
 from ..repositories.user_repository import UserRepository
 from ..schemas.sharing import (
     SharedNoteResponse,
@@ -19,8 +21,11 @@ from ..schemas.sharing import (
     ShareStatsResponse,
 )
 from ..schemas.notes import NoteListItem
+from ..redis_client import get_redis_client
 from .interfaces import ISharingService
 
+logger = logging.getLogger(__name__)
+
 
 class SharingService(ISharingService):
     """Sharing service implementation."""
@@ -30,6 +35,7 @@ class SharingService(ISharingService):
         self.share_repo = ShareRepository(session)
         self.user_repo = UserRepository(session)
         self.note_repo = NoteRepository(session)
+        self.redis_client = get_redis_client()
 
     async def share_note(self, user_id: UUID, request: ShareRequest) -> List[ShareResponse]:
         """Share note with other users."""
@@ -40,10 +46,12 @@ class SharingService(ISharingService):
                 status_code=status.HTTP_404_NOT_FOUND, detail="Note not found or not owned by user"
             )
 
-        # Verify all target users exist
-        share_responses = []
+        # Resolve all target users with one query, validating in request order
+        users = await self.user_repo.get_by_usernames(request.shared_with_usernames)
+        users_by_name = {user.username: user for user in users}
+        target_ids = []
         for username in request.shared_with_usernames:
-            target_user = await self.user_repo.get_by_username(username)
+            target_user = users_by_name.get(username)
             if not target_user:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND, detail=f"User '{username}' not found"
@@ -55,68 +63,63 @@ class SharingService(ISharingService):
                     detail="Cannot share note with yourself",
                 )
 
-            # Check if share already exists
-            existing_share = await self.share_repo.get_existing_share(
-                request.note_id, target_user.id
-            )
-            if existing_share:
-                # Update existing share instead of creating duplicate
-                share = await self.share_repo.update_share(
-                    existing_share.id,
-                    {
-                        "permission": request.permission_level,
-                        "share_message": request.message,
-                        "status": "active",  # Reactivate if was revoked
-                    },
-                )
-            else:
-                # Create new share
-                share_data = {
+            if target_user.id not in target_ids:
+                target_ids.append(target_user.id)
+
+        # One upsert creates new shares and updates existing ones in place
+        saved_shares = await self.share_repo.upsert_shares(
+            [
+                {
                     "note_id": request.note_id,
                     "shared_by_user_id": user_id,
-                    "shared_with_user_id": target_user.id,
+                    "shared_with_user_id": target_id,
                     "permission": request.permission_level,
                     "share_message": request.message,
                     "expires_at": request.expires_at,
                 }
+                for target_id in target_ids
+            ]
+        )
 
-                share = await self.share_repo.create_share(share_data)
-
-            share_responses.append(self._share_to_response(share))
+        await self._invalidate_share_caches(user_id, target_ids)
 
-        return share_responses
+        return [
+            self._share_to_response(saved_shares[target_id])
+            for target_id in target_ids
+            if target_id in saved_shares
+        ]
 
     async def revoke_share(self, user_id: UUID, share_id: UUID) -> bool:
         """Revoke note share."""
-        return await self.share_repo.delete_share(share_id, user_id)
+        # The delete hands back the recipient, whose cached counts/stats are dropped too
+        recipient_id = await self.share_repo.delete_share(share_id, user_id)
+        if not recipient_id:
+            return False
+
+        await self._invalidate_share_caches(user_id, [recipient_id])
+        return True
 
     async def get_shared_note(self, note_id: UUID, user_id: UUID) -> SharedNoteResponse:
         """Get shared note for recipient."""
-        # Check if user has access to this note
-        try:
-            access_info = await self.share_repo.check_note_access(note_id, user_id)
-        except Exception:
-            # If there's an error checking access, assume no access
-            access_info = {"can_read": False}
-
-        if not access_info["can_read"]:
+        # Note, owner and the user's share row come back together in one
+        # round trip; the repos share one AsyncSession, so splitting this
+        # into concurrent tasks would not run in parallel anyway
+        row = await self.note_repo.get_note_with_owner_and_access(note_id, user_id)
+        note, owner, share = row if row else (None, None, None)
+
+        is_owner = note is not None and note.owner_id == user_id
+        if note is None or not (is_owner or share is not None):
             # Return 404 instead of 403 to prevent information leakage about note existence
             # This is consistent with NoteService.get_note() behavior
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
             )
 
-        # Get the note
-        note = await self.note_repo.get_by_id(note_id)
-        if not note:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Note not found")
-
-        # Get the owner info
-        owner = await self.user_repo.get_by_id(note.owner_id)
+        can_write = is_owner or (share is not None and share.permission == "write")
 
         # Build response, filling required fields with available info/defaults
 
-        permission_level = "write" if access_info.get("can_write") else "read"
+        permission_level = "write" if can_write else "read"
 
         return SharedNoteResponse(
             id=note.id,
@@ -134,14 +137,14 @@ class SharingService(ISharingService):
             shared_by_id=note.owner_id,  # Fallback to owner as sharer
             shared_by_username=owner.username if owner else "Unknown",
             permission_level=permission_level,
-            shared_at=getattr(note, "created_at", datetime.now(timezone.utc)),
+            shared_at=note.created_at,
             expires_at=None,
             share_message=None,
-            created_at=getattr(note, "created_at", datetime.now(timezone.utc)),
-            updated_at=getattr(note, "updated_at", datetime.now(timezone.utc)),
+            created_at=note.created_at,
+            updated_at=note.updated_at,
             last_accessed=None,
-            can_write=access_info.get("can_write", False),
-            can_share=access_info.get("can_share", False),
+            can_write=can_write,
+            can_share=is_owner,
         )
 
     async def list_shares(self, user_id: UUID, request: ShareListRequest) -> ShareListResponse:
@@ -154,30 +157,114 @@ class SharingService(ISharingService):
         if per_page < 1 or per_page > 100:
             per_page = 20
 
-        if request.type == "given":
-            shares, total_count = await self.share_repo.list_shares_given(user_id, page, per_page)
-        elif request.type == "received":
-            shares, total_count = await self.share_repo.list_shares_received(
-                user_id, page, per_page
-            )
-        else:
-            # Default to given shares
-            shares, total_count = await self.share_repo.list_shares_given(user_id, page, per_page)
+        share_type = request.type if request.type in ("received", "all") else "given"
+        rows: List[Tuple[Share, Optional[str]]]
+        try:
+            if share_type == "received":
+                received, _ = await self.share_repo.list_shares_received(
+                    user_id, page, per_page, cursor=request.cursor, with_count=False
+                )
+                rows = [(share, None) for share in received]
+            elif share_type == "all":
+                # Both directions arrive from one query as (share, direction) rows
+                both, _ = await self.share_repo.list_shares_all(
+                    user_id, page, per_page, cursor=request.cursor, with_count=False
+                )
+                rows = list(both)
+            else:
+                # Default to given shares
+                given, _ = await self.share_repo.list_shares_given(
+                    user_id, page, per_page, cursor=request.cursor, with_count=False
+                )
+                rows = [(share, None) for share in given]
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        # Totals are opt-in and served from a short-lived cache
+        total_count = None
+        total_pages = None
+        if request.include_total:
+            total_count = await self._get_share_count(user_id, share_type)
+            total_pages = (total_count + per_page - 1) // per_page
 
-        share_responses = [self._share_to_response(share) for share in shares]
+        share_responses = [self._share_to_response(share, direction) for share, direction in rows]
+        # A full page may have a successor; seek from its last row
+        next_cursor = encode_share_cursor(rows[-1][0]) if len(rows) == per_page else None
 
         return ShareListResponse(
             shares=share_responses,
             total_count=total_count,
             page=page,
             per_page=per_page,
-            total_pages=(total_count + per_page - 1) // per_page,
+            total_pages=total_pages,
             type=request.type or "given",
+            next_cursor=next_cursor,
         )
 
+    async def _get_share_count(self, user_id: UUID, share_type: str) -> int:
+        """Get the number of given/received shares, cached in Redis for a minute."""
+        cache_key = f"shares_count:{user_id}:{share_type}"
+        try:
+            cached = await self.redis_client.get(cache_key)
+            if cached is not None:
+                return int(cached)
+        except Exception as e:
+            logger.warning(f"Share count cache lookup failed: {e}")
+
+        if share_type == "received":
+            count = await self.share_repo.count_shares_received(user_id)
+        elif share_type == "all":
+            count = await self.share_repo.count_shares_all(user_id)
+        else:
+            count = await self.share_repo.count_shares_given(user_id)
+
+        try:
+            await self.redis_client.set(cache_key, str(count), expire=60)
+        except Exception as e:
+            logger.warning(f"Failed to cache share count: {e}")
+        return count
+
+    async def _invalidate_share_caches(self, user_id: UUID, recipient_ids: List[UUID]) -> None:
+        """Drop cached share counts, stats and recipient searches touched by a share change.
+
+        Gaining or losing access changes what a recipient's searches return,
+        so their search cache versions are bumped as well.
+        """
+        keys = [
+            f"shares_count:{user_id}:given",
+            f"shares_count:{user_id}:all",
+            f"share_stats:{user_id}",
+        ]
+        for recipient_id in recipient_ids:
+            keys += [
+                f"shares_count:{recipient_id}:received",
+                f"shares_count:{recipient_id}:all",
+                f"share_stats:{recipient_id}",
+            ]
+        try:
+            await self.redis_client.delete_many(keys)
+            if recipient_ids:
+                await self.redis_client.bump_search_versions(recipient_ids)
+        except Exception as e:
+            logger.warning(f"Failed to invalidate share caches in Redis: {e}")
+
     async def get_share_stats(self, user_id: UUID) -> ShareStatsResponse:
-        """Get sharing statistics."""
-        stats = await self.share_repo.get_share_stats(user_id)
+        """Get sharing statistics (cached in Redis for two minutes)."""
+        cache_key = f"share_stats:{user_id}"
+        stats = None
+        try:
+            cached = await self.redis_client.get(cache_key)
+            if cached:
+                stats = orjson.loads(cached)
+        except Exception as e:
+            logger.warning(f"Share stats cache lookup failed: {e}")
+
+        if stats is None:
+            stats = await self.share_repo.get_share_stats(user_id)
+            try:
+                await self.redis_client.set(cache_key, orjson.dumps(stats), expire=120)
+            except Exception as e:
+                logger.warning(f"Failed to cache share stats: {e}")
 
         return ShareStatsResponse(
             shares_given=stats["shares_given"],
@@ -189,69 +276,57 @@ class SharingService(ISharingService):
         """Check user note permissions."""
         return await self.share_repo.check_note_access(note_id, user_id)
 
-    def _share_to_response(self, share) -> ShareResponse:
-        """Convert share model to response."""
+    def _share_to_response(self, share, direction: Optional[str] = None) -> ShareResponse:
+        """Convert share model to response.
 
-        shared_with_user_id = getattr(share, "shared_with_user_id", None)
-        if not shared_with_user_id and getattr(share, "shared_with_user", None):
-            shared_with_user_id = getattr(share.shared_with_user, "id", None)
+        Relationships are eager-loaded by the repository, so attributes are read
+        directly without triggering lazy loads.
+        """
+        note = share.note
+        recipient = share.shared_with_user
 
-        # Create complete note data for dashboard display
+        # Complete note data for dashboard display (recipient perspective)
         note_data = None
-        if getattr(share, "note", None):
-            note = share.note
-            # Only create NoteListItem if note has required fields (id, title, owner_id)
-            if hasattr(note, 'id') and hasattr(note, 'title') and hasattr(note, 'owner_id'):
-                # Get owner info for note
-                owner_username = None
-                owner_display_name = None
-                if hasattr(note, 'owner') and note.owner:
-                    owner_username = note.owner.username
-                    owner_display_name = getattr(note.owner, 'full_name', None)
-                elif hasattr(share, 'shared_by_user') and share.shared_by_user:
-                    # Fallback to sharer info if note.owner not available
-                    owner_username = share.shared_by_user.username
-                    owner_display_name = getattr(share.shared_by_user, 'full_name', None)
-
-                note_data = NoteListItem(
-                    id=note.id,
-                    title=note.title,
-                    content_preview=getattr(note, 'content', '')[:200] + ("..." if len(getattr(note, 'content', '')) > 200 else ""),
-                    tags=[tag.name if hasattr(tag, 'name') else str(tag) for tag in getattr(note, 'tags', [])],
-                    owner_id=note.owner_id,
-                    owner_username=owner_username,
-                    owner_display_name=owner_display_name,
-                    is_shared=True,
-                    is_owned=False,  # This is a shared note from recipient perspective
-                    can_edit=getattr(share, "permission", "read") == "write",
-                    created_at=getattr(note, 'created_at', datetime.now(timezone.utc)),
-                    updated_at=getattr(note, 'updated_at', datetime.now(timezone.utc))
-                )
+        if note is not None:
+            # Fallback to sharer info if note.owner not available
+            owner = note.owner or share.shared_by_user
+            # List queries load only a content prefix (see ShareRepository)
+            content = getattr(note, "content_preview", None)
+            if not isinstance(content, str):
+                content = note.content
+            note_data = NoteListItem(
+                id=note.id,
+                title=note.title,
+                content_preview=content[:200] + ("..." if len(content) > 200 else ""),
+                tags=[tag.name for tag in note.tags],
+                owner_id=note.owner_id,
+                owner_username=owner.username if owner else None,
+                owner_display_name=owner.full_name if owner else None,
+                is_shared=True,
+                is_owned=False,
+                can_edit=share.permission == "write",
+                is_shared_by_user=False,
+                share_count=0,
+                created_at=note.created_at,
+                updated_at=note.updated_at,
+            )
 
         return ShareResponse(
             id=share.id,
             note_id=share.note_id,
-            note_title=share.note.title if getattr(share, "note", None) else "Unknown",
-            shared_with_user_id=shared_with_user_id,
-            shared_with_username=(
-                share.shared_with_user.username
-                if getattr(share, "shared_with_user", None)
-                else "Unknown"
-            ),
-            shared_with_display_name=(
-                share.shared_with_user.full_name
-                if getattr(share, "shared_with_user", None)
-                and hasattr(share.shared_with_user, "full_name")
-                else "Unknown"
-            ),
-            permission_level=getattr(share, "permission", "read"),
-            message=getattr(share, "share_message", None),
-            note=note_data,  # Include complete note data
-            shared_at=getattr(share, "created_at", datetime.now(timezone.utc)),
-            expires_at=getattr(share, "expires_at", None),
-            last_accessed=getattr(share, "last_accessed", None),
-            is_active=getattr(share, "is_active", True),
-            access_count=getattr(share, "access_count", 0),
+            note_title=note.title if note is not None else "Unknown",
+            shared_with_user_id=share.shared_with_user_id,
+            shared_with_username=recipient.username,
+            shared_with_display_name=recipient.full_name or recipient.username,
+            permission_level=share.permission,
+            message=share.share_message,
+            note=note_data,
+            shared_at=share.created_at,
+            expires_at=share.expires_at,
+            last_accessed=share.last_accessed_at,
+            is_active=share.is_active,
+            access_count=share.access_count,
+            direction=direction,
         )
 
     # Additional methods for test compatibility
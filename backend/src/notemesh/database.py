@@ -1,29 +1,85 @@
 # Database connection setup
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from typing import Any, AsyncIterator, Optional
 
-from .config import get_settings
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from .config import Settings, get_settings
 from .core.models.base import BaseModel
 
-# Get settings
-settings = get_settings()
+# Created on first use (normally by the app lifespan), not at import time
+_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+
+
+def _engine_options(settings: Settings) -> dict[str, Any]:
+    """Engine options for the configured database URL."""
+    options: dict[str, Any] = {
+        "echo": settings.database_echo,
+        # Compiled statements are reused across requests; keep every repository
+        # statement variant resident instead of the default 500-entry LRU
+        "query_cache_size": settings.database_query_cache_size,
+    }
+    # Pool sizing only applies to server databases (SQLite test URLs use their own pools)
+    if settings.database_url.startswith("postgresql"):
+        options.update(
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_timeout=settings.database_pool_timeout,
+            pool_recycle=settings.database_pool_recycle,
+            pool_pre_ping=True,
+            # Keep more server-side prepared statements per connection (asyncpg default: 100)
+            connect_args={"prepared_statement_cache_size": 500},
+        )
+    return options
+
+
+def init_engine(settings: Optional[Settings] = None) -> AsyncEngine:
+    """Create the engine and session factory (no-op if already created)."""
+    global _engine, _session_factory
+    # No await between check and assignment, so this can't race on the event loop
+    if _engine is None:
+        settings = settings or get_settings()
+        _engine = create_async_engine(settings.database_url, **_engine_options(settings))
+        _session_factory = async_sessionmaker(_engine, class_=AsyncSession, expire_on_commit=False)
+    return _engine
+
+
+def get_engine() -> AsyncEngine:
+    """Get database engine, creating it on first use."""
+    return init_engine()
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Get the session factory, creating the engine on first use."""
+    init_engine()
+    assert _session_factory is not None
+    return _session_factory
 
-# Create async engine using settings
-engine = create_async_engine(settings.database_url, echo=settings.database_echo)
 
-# Session factory
-AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+async def dispose_engine() -> None:
+    """Close pooled connections and drop the engine."""
+    global _engine, _session_factory
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _session_factory = None
 
 
-async def get_db_session():
+async def get_db_session() -> AsyncIterator[AsyncSession]:
     """Get database session."""
-    async with AsyncSessionLocal() as session:
+    async with get_session_factory()() as session:
         try:
             yield session
         finally:
             await session.close()
 
 
-async def create_tables():
+async def create_tables() -> None:
     """Create all tables."""
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(BaseModel.metadata.create_all)
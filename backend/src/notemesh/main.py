@@ -1,18 +1,18 @@
 # Main application entry point
 import logging
+import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from .api import auth_router, health_router, notes_router, search_router, sharing_router
 from .config import get_settings
 from .core.logging import LoggingMiddleware, get_logger, setup_logging
 from .core.redis_client import get_redis_client
-from .database import create_tables
+from .database import create_tables, dispose_engine, init_engine
 
-# Setup logging first
-setup_logging()
 logger = get_logger("main")
 
 settings = get_settings()
@@ -21,7 +21,9 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
-    # Startup
+    # Startup: logging and the DB engine are set up here, not at import time
+    setup_logging()
+    init_engine(settings)
     logger.info(
         "Starting NoteMesh application",
         extra={"version": "0.1.0", "environment": settings.environment, "debug": settings.debug},
@@ -36,8 +38,6 @@ async def lifespan(app: FastAPI):
         logger.warning(f"Redis connection failed: {e}. Continuing without Redis...")
 
     # Allow tests to skip touching the real DB (e.g., when using SQLite in-memory)
-    import os
-
     if os.getenv("NOTEMESH_SKIP_LIFESPAN_DB") == "1":
         logger.info("Skipping DB table creation due to NOTEMESH_SKIP_LIFESPAN_DB=1")
     else:
@@ -58,24 +58,28 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Redis disconnect failed: {e}")
 
+    await dispose_engine()
+
 
 app = FastAPI(
     title="NoteMesh",
     description="Note sharing and management API",
     version="0.1.0",
     lifespan=lifespan,
+    # orjson renders the (already encoded) response bodies much faster than json
+    default_response_class=ORJSONResponse,
 )
 
-# Add logging middleware
-app.add_middleware(LoggingMiddleware)
+# Add logging middleware; liveness probes are passed straight through
+app.add_middleware(LoggingMiddleware, skip_paths=("/", "/health", "/api/health/"))
 
-# CORS middleware
+# CORS middleware; explicit lists instead of "*" so preflights are a set lookup
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=settings.cors_allow_credentials,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=settings.cors_allow_methods,
+    allow_headers=settings.cors_allow_headers,
 )
 
 # Include routers
@@ -1,33 +1,59 @@
 """JWT token utilities."""
 
 import secrets
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Optional, cast
 from uuid import UUID
 
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jws, jwt
+from jose.backends.base import Key
 
 from ..config import get_settings
 from ..core.redis_client import get_redis_client
 
 
+class _JWTConfig(NamedTuple):
+    """Signing parameters derived from settings."""
+
+    key: Key
+    algorithms: tuple[str, ...]
+    access_ttl: float
+
+
+@lru_cache(maxsize=8)
+def _build_jwt_config(secret_key: str, algorithm: str, expire_minutes: int) -> _JWTConfig:
+    """Parse the signing key once per distinct settings triple."""
+    return _JWTConfig(
+        key=jwk.construct(secret_key, algorithm),
+        algorithms=(algorithm,),
+        access_ttl=timedelta(minutes=expire_minutes).total_seconds(),
+    )
+
+
+def _jwt_config() -> _JWTConfig:
+    """Current signing parameters; the key is only re-parsed if settings change."""
+    settings = get_settings()
+    return _build_jwt_config(
+        settings.secret_key, settings.algorithm, settings.access_token_expire_minutes
+    )
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token with JTI for Redis blacklisting."""
-    settings = get_settings()
+    config = _jwt_config()
     to_encode = data.copy()
 
-    if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
-    else:
-        expire = datetime.now(timezone.utc) + timedelta(
-            minutes=settings.access_token_expire_minutes
-        )
+    ttl = expires_delta.total_seconds() if expires_delta else config.access_ttl
+    expire = int(time.time() + ttl)
 
     # Add JWT ID for blacklisting capability
     jti = str(uuid.uuid4())
     to_encode.update({"exp": expire, "type": "access", "jti": jti})
-    return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    # Sign with the pre-parsed key; jwt.encode would rebuild it on every call
+    return cast(str, jws.sign(to_encode, config.key, algorithm=config.algorithms[0]))
 
 
 def create_refresh_token() -> str:
@@ -35,11 +61,27 @@ def create_refresh_token() -> str:
     return secrets.token_urlsafe(32)
 
 
+@lru_cache(maxsize=4096)
+def _verify_token(token: str, config: _JWTConfig) -> Dict[str, Any]:
+    """Verify token signature and claims; successful results are memoized per token and config.
+
+    The signing config is part of the cache key, so rotating the secret or
+    algorithm stops old verifications from being reused. Failures raise
+    JWTError and are never cached. Callers must re-check ``exp``.
+    """
+    return cast(Dict[str, Any], jwt.decode(token, config.key, algorithms=config.algorithms))
+
+
 async def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
     """Decode and validate access token, checking Redis blacklist."""
     try:
-        settings = get_settings()
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        # Repeat requests with the same bearer token skip signature verification
+        payload = dict(_verify_token(token, _jwt_config()))
+
+        # A cached verification may outlive the token itself
+        exp = payload.get("exp")
+        if exp is not None and exp <= time.time():
+            return None
 
         # Verify token type
         if payload.get("type") != "access":
@@ -50,7 +92,7 @@ async def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
         if jti:
             redis_client = get_redis_client()
             try:
-                await redis_client.connect()  # Ensure connection
+                # Connected once at startup (see main.lifespan)
                 is_blacklisted = await redis_client.is_token_blacklisted(jti)
                 if is_blacklisted:
                     return None
@@ -82,8 +124,8 @@ async def get_user_id_from_token(token: str) -> Optional[UUID]:
 async def blacklist_token(token: str) -> bool:
     """Add token to Redis blacklist for secure logout."""
     try:
-        settings = get_settings()
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        config = _jwt_config()
+        payload = jwt.decode(token, config.key, algorithms=config.algorithms)
         jti = payload.get("jti")
 
         if not jti:
@@ -98,7 +140,6 @@ async def blacklist_token(token: str) -> bool:
 
             if remaining_seconds > 0:
                 redis_client = get_redis_client()
-                await redis_client.connect()  # Ensure connection
                 return await redis_client.add_to_blacklist(jti, remaining_seconds)
 
         return False
@@ -1,23 +1,63 @@
 """Password hashing utilities."""
 
-from passlib.context import CryptContext
+import base64
+import hashlib
+import hmac
 
-# Password hashing context
-# Use bcrypt_sha256 to avoid bcrypt's 72-byte truncation issue on long passwords
-# This pre-hashes with SHA-256 before applying bcrypt.
-pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
+import bcrypt
+
+# bcrypt only looks at the first 72 bytes of a password, so passwords are
+# pre-hashed with SHA-256 (base64: 44 bytes) before bcrypt sees them.
+BCRYPT_ROUNDS = 12
+
+# Hashes written by passlib's bcrypt_sha256 before the switch to native bcrypt:
+# $bcrypt-sha256$v=2,t=2b,r=12$<salt>$<checksum>
+_LEGACY_PREFIX = "$bcrypt-sha256$"
+
+
+def _prehash(password: str) -> bytes:
+    """SHA-256 pre-hash so long passwords aren't truncated by bcrypt."""
+    return base64.b64encode(hashlib.sha256(password.encode("utf-8")).digest())
 
 
 def hash_password(password: str) -> str:
     """Hash a password."""
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(_prehash(password), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("ascii")
+
+
+def _verify_legacy(plain_password: str, hashed_password: str) -> bool:
+    """Verify a passlib bcrypt_sha256 hash (versions 1 and 2)."""
+    try:
+        params, salt, checksum = hashed_password[len(_LEGACY_PREFIX) :].split("$")
+        if params.startswith("v=2,"):
+            ident, rounds = (part.split("=")[1] for part in params[4:].split(","))
+            key = hmac.new(salt.encode("ascii"), plain_password.encode("utf-8"), hashlib.sha256)
+            secret = base64.b64encode(key.digest())
+        else:
+            ident, rounds = params.split(",")
+            secret = _prehash(plain_password)
+        bcrypt_hash = f"${ident}${int(rounds):02d}${salt}{checksum}".encode("ascii")
+        return bcrypt.checkpw(secret, bcrypt_hash)
+    except ValueError:
+        return False
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    if hashed_password.startswith(_LEGACY_PREFIX):
+        return _verify_legacy(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(_prehash(plain_password), hashed_password.encode("ascii"))
+    except ValueError:
+        return False
 
 
 def needs_update(hashed_password: str) -> bool:
     """Check if password hash needs updating."""
-    return pwd_context.needs_update(hashed_password)
+    if hashed_password.startswith(_LEGACY_PREFIX):
+        return True
+    # Native hashes look like $2b$<rounds>$...
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
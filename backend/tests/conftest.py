@@ -3,21 +3,36 @@
 import asyncio
 import logging
 import os
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
 from uuid import uuid4
 
 import pytest
 from fastapi.testclient import TestClient
-from httpx import AsyncClient
-from sqlalchemy import event, select
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import attributes as orm_attributes
-from sqlalchemy.orm import selectinload, sessionmaker
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.util import identity_key
 from sqlalchemy.pool import StaticPool
 
+try:
+    # Installed with uvicorn[standard], except on Windows
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Tell the app lifespan to skip real DB init, before anything imports the app
+os.environ.setdefault("NOTEMESH_SKIP_LIFESPAN_DB", "1")
+
 from src.notemesh.config import Settings, get_settings
-from src.notemesh.core.models.base import BaseModel
+
+# Importing the package registers every model on BaseModel.metadata up front
+from src.notemesh.core.models import BaseModel, Note, Share, Tag, User
 from src.notemesh.database import get_db_session
 from src.notemesh.main import app
+from src.notemesh.security import password as password_module
 from src.notemesh.security.jwt import create_access_token
 from src.notemesh.security.password import hash_password
 
@@ -27,8 +42,9 @@ logging.getLogger("aiosqlite").setLevel(logging.WARNING)
 
 @pytest.fixture(scope="session")
 def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
+    """Create the event loop for the test session (uvloop when installed)."""
+    policy = uvloop.EventLoopPolicy() if uvloop is not None else asyncio.get_event_loop_policy()
+    loop = policy.new_event_loop()
     yield loop
     loop.close()
 
@@ -37,39 +53,74 @@ def event_loop():
 def test_settings():
     """Override settings for testing using SQLite in-memory DB."""
     db_url = "sqlite+aiosqlite:///:memory:"
-    # Tell app lifespan to skip real DB init
-    os.environ["NOTEMESH_SKIP_LIFESPAN_DB"] = "1"
     return Settings(
         database_url=db_url,
         secret_key="test-secret-key",
         debug=True,
         redis_url=os.getenv("TEST_REDIS_URL", "redis://localhost:6379/15"),
+        database_strict_loading=True,
     )
 
 
+@pytest.fixture(scope="session", autouse=True)
+def strict_loading():
+    """Make list/search queries raise on unplanned lazy loads for the whole run."""
+    settings = get_settings()
+    previous = settings.database_strict_loading
+    settings.database_strict_loading = True
+    yield
+    settings.database_strict_loading = previous
+
+
 @pytest.fixture(scope="session")
 async def test_engine(test_settings):
-    """Create a shared SQLite in-memory engine for the test session."""
+    """Create a shared SQLite in-memory engine for the test session.
+
+    Being session-scoped, the engine's compiled-statement cache also lives
+    for the whole run, so later tests reuse the SQL compiled by earlier
+    ones; don't build engines per test or module.
+    """
+    # Every new SQLite connection to :memory: opens a fresh, empty database,
+    # and the async engine won't pick a single-connection pool by itself.
+    # StaticPool is what keeps the tables created below visible to every test.
     engine = create_async_engine(
         test_settings.database_url,
         echo=False,
-        poolclass=StaticPool,  # keep the same memory DB across connections
+        poolclass=StaticPool,
         connect_args={"check_same_thread": False},
     )
 
-    # Ensure SQLite enforces foreign key constraints (required for CASCADE/SET NULL)
+    in_memory = engine.url.database in (None, "", ":memory:")
+    assert not in_memory or isinstance(
+        engine.pool, StaticPool
+    ), "in-memory test DB needs StaticPool"
+
+    # Ensure SQLite enforces foreign key constraints (required for CASCADE/SET NULL);
+    # durability settings are pointless for a throwaway test database
     @event.listens_for(engine.sync_engine, "connect")
     def _set_sqlite_pragma(dbapi_connection, connection_record):  # noqa: ANN001
         cursor = dbapi_connection.cursor()
         try:
             cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.execute("PRAGMA synchronous=OFF")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA cache_size=-20000")
+            cursor.execute("PRAGMA locking_mode=EXCLUSIVE")
+            if not in_memory:
+                # :memory: databases always journal in memory already
+                cursor.execute("PRAGMA journal_mode=MEMORY")
         finally:
             cursor.close()
+        # pysqlite's own transaction handling breaks SAVEPOINTs; let
+        # SQLAlchemy emit BEGIN itself (see _begin below)
+        dbapi_connection.isolation_level = None
 
-    # Create tables once per session (we'll drop/create per test session fixture)
-    async with engine.begin() as conn:
-        pass
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(conn):  # noqa: ANN001
+        conn.exec_driver_sql("BEGIN")
 
+    # Schema DDL runs once per session; tests are isolated by rollback
+    async with engine.begin() as conn:
         await conn.run_sync(BaseModel.metadata.create_all)
 
     try:
@@ -78,6 +129,10 @@ async def test_engine(test_settings):
         await engine.dispose()
 
 
+# selectinload() options for every relationship, built once per mapped class
+_REL_OPTIONS_CACHE: dict[type, tuple] = {}
+
+
 class EagerAsyncSession(AsyncSession):
     """AsyncSession that eagerly refreshes relationship attributes by default.
 
@@ -85,13 +140,27 @@ class EagerAsyncSession(AsyncSession):
     during refresh() so later attribute access doesn't trigger implicit IO.
     """
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._rows_deleted = False
+        event.listen(self.sync_session, "after_flush", self._track_flushed_deletes)
+        event.listen(self.sync_session, "do_orm_execute", self._track_bulk_deletes)
+
+    def _track_flushed_deletes(self, session, flush_context):  # noqa: ARG002
+        if session.deleted:
+            self._rows_deleted = True
+
+    def _track_bulk_deletes(self, orm_execute_state):
+        if orm_execute_state.is_delete:
+            self._rows_deleted = True
+
     async def get(
         self,
         entity,
         ident,
         *,
         options=None,
-        populate_existing: bool = False,  # noqa: ARG002 - kept for signature compatibility
+        populate_existing: bool = False,
         with_for_update=None,  # noqa: ARG002 - not used here
         identity_token=None,  # noqa: ARG002 - not used here
         execution_options=None,
@@ -103,7 +172,18 @@ class EagerAsyncSession(AsyncSession):
         that instance and trigger unexpected IO paths leading to MissingGreenlet in
         async tests. We bypass that by always issuing a direct SELECT and returning
         the first row (or None).
+
+        A fully loaded identity-map hit is returned without a query, unless the
+        caller passes populate_existing=True or this session has deleted rows
+        (whose DB-level cascades the identity map can't see).
         """
+        if not populate_existing and not options and not self._rows_deleted:
+            cached = self.identity_map.get(identity_key(entity, ident))
+            if cached is not None:
+                state = inspect(cached)
+                if not (state.expired or state.expired_attributes or state.deleted):
+                    return cached
+
         stmt = select(entity).where(getattr(entity, "id") == ident)
         # Always populate existing identity map objects with fresh DB values
         # so that DB-level cascades (e.g., SET NULL) are visible immediately.
@@ -114,149 +194,204 @@ class EagerAsyncSession(AsyncSession):
         return result.scalars().first()
 
     async def refresh(self, instance, attribute_names=None, with_for_update=None):
-        """Refresh the given instance, then proactively refresh relationships.
+        """Refresh column state and ALL relationships in a single SELECT.
 
-        - First refresh scalar/column state (or requested attributes) using the
-          normal AsyncSession.refresh.
-        - If no explicit attribute_names were provided, iterate the mapped
-          relationships and refresh each one explicitly so that subsequent
-          attribute access doesn't attempt an implicit (lazy) load.
+        A full refresh re-selects the row with populate_existing and one
+        selectinload per relationship, so later attribute access doesn't
+        attempt an implicit (lazy) load. Explicit attribute_names, locking
+        refreshes and re-entrant calls (refresh() invoked by a loader) go
+        through the normal AsyncSession.refresh.
         """
-        # Always refresh the base state first
-        await super().refresh(
-            instance,
-            attribute_names=attribute_names,
-            with_for_update=with_for_update,
+        identity = getattr(instance, "id", None)
+        if (
+            attribute_names is not None
+            or with_for_update is not None
+            or identity is None
+            or instance not in self
+            or getattr(self, "_in_preload_refresh", False)
+        ):
+            await super().refresh(
+                instance,
+                attribute_names=attribute_names,
+                with_for_update=with_for_update,
+            )
+            return
+
+        cls = instance.__class__
+        loaders = _REL_OPTIONS_CACHE.get(cls)
+        if loaders is None:
+            loaders = tuple(
+                selectinload(getattr(cls, rel.key)) for rel in instance.__mapper__.relationships
+            )
+            _REL_OPTIONS_CACHE[cls] = loaders
+        stmt = (
+            select(cls)
+            .options(*loaders)
+            .where(getattr(cls, "id") == identity)
+            .execution_options(populate_existing=True)
         )
+        try:
+            self._in_preload_refresh = True
+            loaded = (await self.execute(stmt)).scalars().first()
+        finally:
+            self._in_preload_refresh = False
 
-        # If caller didn't request specific attributes, also proactively load
-        # ALL relationship attributes via a dedicated SELECT with selectinload
-        # so that later attribute access doesn't attempt implicit async IO.
-        # Use a simple re-entrancy guard to avoid nested calls when refresh()
-        # itself was invoked by a higher-level loader (e.g. inside get()).
-        if attribute_names is None and not getattr(self, "_in_preload_refresh", False):
-            try:
-                self._in_preload_refresh = True
-                mapper = instance.__mapper__
-                rels = list(mapper.relationships)
-                if not rels:
-                    return
-
-                # Build loader options to eager-load each relationship
-                loaders = [selectinload(getattr(instance.__class__, rel.key)) for rel in rels]
-
-                # Figure out primary key identity; assume single-column PK (BaseModel.id)
-                identity = getattr(instance, "id", None)
-                if identity is None:
-                    return
-
-                # Load a fresh copy with relationships populated using an explicit SELECT
-                stmt = (
-                    select(instance.__class__)
-                    .options(*loaders)
-                    .where(getattr(instance.__class__, "id") == identity)
-                )
-                result = await self.execute(stmt)
-                loaded = result.scalars().first()
-                if not loaded:
-                    return
-
-                # Copy loaded relationship values into the original instance state
-                for rel in rels:
-                    try:
-                        value = getattr(loaded, rel.key)
-                        orm_attributes.set_committed_value(instance, rel.key, value)
-                    except Exception:
-                        # Best effort; continue on any individual relationship failure
-                        continue
-            except Exception:
-                # If any unexpected error occurs, fall back silently
-                return
-            finally:
-                self._in_preload_refresh = False
-
+        if loaded is None:
+            # Row is gone; let the stock refresh raise its usual error
+            await super().refresh(instance)
+        # populate_existing writes into the identity-map instance, which is
+        # `instance` itself, so columns and relationships are already set
 
-@pytest.fixture
-async def test_session(test_engine):
-    """Create a clean test database session per test (drop/create all)."""
-    async_session_maker = sessionmaker(
-        test_engine,
-        class_=EagerAsyncSession,
-        # Avoid implicit attribute refreshes after commit which can cause
-        # MissingGreenlet when accessed in sync contexts during async tests.
-        expire_on_commit=False,
-    )
 
-    # Ensure a clean schema for each test to avoid unique collisions
-    async with test_engine.begin() as conn:
-        await conn.run_sync(BaseModel.metadata.drop_all)
-        await conn.run_sync(BaseModel.metadata.create_all)
+@asynccontextmanager
+async def _rolled_back_session(engine):
+    """Session whose changes are rolled back when the context exits.
 
-    async with async_session_maker() as session:
+    The session joins an outer transaction on a dedicated connection; its own
+    commits only release SAVEPOINTs, so nothing written through it outlives it.
+    """
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        session = EagerAsyncSession(
+            bind=conn,
+            join_transaction_mode="create_savepoint",
+            # Flush on commit only, not before every query
+            autoflush=False,
+            # Avoid implicit attribute refreshes after commit which can cause
+            # MissingGreenlet when accessed in sync contexts during async tests.
+            expire_on_commit=False,
+        )
         try:
             yield session
         finally:
-            await session.rollback()
+            await session.close()
+            await trans.rollback()
 
 
 @pytest.fixture
-def override_get_db(test_session):
-    """Override the get_db dependency."""
+async def test_session(test_engine):
+    """Create a test database session whose changes are rolled back after each test."""
+    async with _rolled_back_session(test_engine) as session:
+        yield session
 
-    async def _override_get_db():
-        yield test_session
 
-    return _override_get_db
+@pytest.fixture(scope="class")
+async def class_session(test_engine):
+    """One rolled-back session shared by every test in a class.
 
+    For read-only test classes that can share their seed data; the pool has a
+    single connection, so those tests must not also use ``test_session``.
+    """
+    async with _rolled_back_session(test_engine) as session:
+        yield session
 
-@pytest.fixture
-def test_app(override_get_db, test_settings):
-    """Create test FastAPI app with overridden dependencies."""
-    app.dependency_overrides[get_db_session] = override_get_db
+
+@pytest.fixture(scope="session")
+def test_app(test_settings):
+    """Create test FastAPI app with overridden settings (once per session)."""
     app.dependency_overrides[get_settings] = lambda: test_settings
     yield app
     app.dependency_overrides.clear()
 
 
 @pytest.fixture
-def client(test_app):
-    """Create test client."""
+def override_get_db(test_app, test_session):
+    """Route the get_db dependency to this test's session while it runs."""
+
+    async def _override_get_db():
+        yield test_session
+
+    test_app.dependency_overrides[get_db_session] = _override_get_db
+    yield _override_get_db
+    test_app.dependency_overrides.pop(get_db_session, None)
+
+
+@pytest.fixture(scope="session")
+def _session_client(test_app):
+    """One TestClient for the whole session."""
     return TestClient(test_app)
 
 
-@pytest.fixture
-async def async_client(test_app):
-    """Create async test client."""
-    async with AsyncClient(app=test_app, base_url="http://test") as ac:
+@pytest.fixture(scope="session")
+async def _session_async_client(test_app):
+    """One AsyncClient (and transport) for the whole session."""
+    transport = ASGITransport(app=test_app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
 
 
+@pytest.fixture
+def client(_session_client, override_get_db):
+    """Shared test client, bound to this test's database session."""
+    # Cookies set by one test must not leak into the next
+    _session_client.cookies.clear()
+    return _session_client
+
+
+@pytest.fixture
+def async_client(_session_async_client, override_get_db):
+    """Shared async test client, bound to this test's database session."""
+    _session_async_client.cookies.clear()
+    return _session_async_client
+
+
+TEST_USER_PASSWORD = "TestPassword123!"
+
+# Constant part of test_user_data; only the username changes per test
+_USER_TEMPLATE = {"password": TEST_USER_PASSWORD, "full_name": "Test User"}
+
+
+# Lowest bcrypt cost that still differs from the "weak" rounds=4 hashes
+# the password tests use to exercise needs_update()
+TEST_BCRYPT_ROUNDS = 5
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _cheap_bcrypt():
+    """Hash at a low bcrypt cost for the whole run.
+
+    At the production cost of 12, the register/login/password tests spend most
+    of the suite's time inside bcrypt; hashing and verifying stay real, just cheaper.
+    """
+    patcher = pytest.MonkeyPatch()
+    patcher.setattr(password_module, "BCRYPT_ROUNDS", TEST_BCRYPT_ROUNDS)
+    yield
+    patcher.undo()
+
+
+@pytest.fixture(scope="session")
+def _precomputed_password_hash(_cheap_bcrypt):
+    """bcrypt is deliberately slow; hash the shared test password only once."""
+    return hash_password(TEST_USER_PASSWORD)
+
+
 @pytest.fixture
 def test_user_data():
     """Sample user data for testing."""
-    return {
-        "username": f"testuser_{uuid4().hex[:8]}",
-        "password": "TestPassword123!",
-        "full_name": "Test User",
-    }
+    return {**_USER_TEMPLATE, "username": f"testuser_{uuid4().hex[:8]}"}
+
+
+@pytest.fixture(scope="session")
+def _test_user_id():
+    """Stable id for test_user; each test's row is rolled back, so it never clashes."""
+    return uuid4()
 
 
 @pytest.fixture
-async def test_user(test_session, test_user_data):
+async def test_user(test_session, test_user_data, _precomputed_password_hash, _test_user_id):
     """Create a test user in the database."""
-    from src.notemesh.core.models.user import User
-
     user = User(
+        id=_test_user_id,
         username=test_user_data["username"],
-        password_hash=hash_password(test_user_data["password"]),
+        password_hash=_precomputed_password_hash,
         full_name=test_user_data["full_name"],
         is_active=True,
         is_verified=True,
     )
 
     test_session.add(user)
+    # expire_on_commit=False keeps every assigned column loaded; no refresh needed
     await test_session.commit()
-    await test_session.refresh(user)
 
     # Add the plain password to the user object for testing
     user.plain_password = test_user_data["password"]
@@ -264,50 +399,99 @@ async def test_user(test_session, test_user_data):
     return user
 
 
-@pytest.fixture
-def auth_headers(test_user):
-    """Create authentication headers with a valid JWT token."""
-    token_data = {"sub": str(test_user.id)}
+@pytest.fixture(scope="session")
+def auth_headers(_test_user_id):
+    """Authentication headers with a valid JWT for test_user, signed once per session."""
+    token_data = {"sub": str(_test_user_id)}
     access_token = create_access_token(token_data)
-    return {"Authorization": f"Bearer {access_token}"}
+    # Read-only so one test can't leak header changes into the next
+    return MappingProxyType({"Authorization": f"Bearer {access_token}"})
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_note_data():
-    """Sample note data for testing."""
-    return {
-        "title": "Test Note",
-        "content": "This is a test note content",
-        "is_pinned": False,
-        "tags": ["test", "example"],
-    }
+    """Sample note data for testing (constant, so built once and read-only)."""
+    return MappingProxyType(
+        {
+            "title": "Test Note",
+            "content": "This is a test note content",
+            "is_pinned": False,
+            "tags": ("test", "example"),
+        }
+    )
 
 
 @pytest.fixture
 async def test_note(test_session, test_user, test_note_data):
     """Create a test note in the database."""
-    from src.notemesh.core.models.note import Note
-    from src.notemesh.core.models.tag import Tag
-
+    # Build the whole graph up front so it is flushed in one pass
     note = Note(
         title=test_note_data["title"],
         content=test_note_data["content"],
-        is_pinned=test_note_data["is_pinned"],
         owner_id=test_user.id,
+        tags=[Tag(name=tag_name) for tag_name in test_note_data["tags"]],
     )
 
-    # Add tags
-    for tag_name in test_note_data["tags"]:
-        tag = Tag(name=tag_name)
-        note.tags.append(tag)
-
     test_session.add(note)
     await test_session.commit()
-    await test_session.refresh(note)
 
     return note
 
 
+@pytest.fixture
+async def share_recipients(test_session, _precomputed_password_hash):
+    """Five users to share test_user's notes with, added in one flush."""
+    users = [
+        User(
+            username=f"recipient{i}_{uuid4().hex[:8]}",
+            password_hash=_precomputed_password_hash,
+            full_name=f"Recipient {i}",
+        )
+        for i in range(5)
+    ]
+
+    test_session.add_all(users)
+    await test_session.commit()
+
+    return users
+
+
+@pytest.fixture
+async def note_shares(test_session, test_note, share_recipients):
+    """test_note shared by its owner with every share_recipients user, oldest first.
+
+    The last two shares have the same created_at, so keyset pagination has
+    to fall back to the id tiebreak.
+    """
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    shares = [
+        Share(
+            note_id=test_note.id,
+            shared_by_user_id=test_note.owner_id,
+            shared_with_user_id=user.id,
+            created_at=base + timedelta(minutes=min(i, 3)),
+        )
+        for i, user in enumerate(share_recipients)
+    ]
+
+    test_session.add_all(shares)
+    await test_session.commit()
+
+    return shares
+
+
+@pytest.fixture(params=["given", "received", "all"])
+def share_listing(request, test_note, note_shares):
+    """``(type, viewer id, shares the viewer should see)`` for each listing type.
+
+    The note's owner lists the given and all views; the first recipient
+    lists its received shares.
+    """
+    if request.param == "received":
+        return request.param, note_shares[0].shared_with_user_id, note_shares[:1]
+    return request.param, test_note.owner_id, note_shares
+
+
 @pytest.fixture
 def mock_redis(monkeypatch):
     """Mock Redis for testing."""
@@ -322,12 +506,17 @@ def mock_redis(monkeypatch):
         async def set(self, key, value, ex=None):
             self.storage[key] = value
 
-        async def delete(self, key):
-            if key in self.storage:
-                del self.storage[key]
+        async def mget(self, keys):
+            # RedisClient.get_many passes the keys as one list
+            storage = self.storage
+            return [storage.get(key) for key in keys]
+
+        async def delete(self, *keys):
+            # redis-py returns the number of keys removed
+            return sum(self.storage.pop(key, None) is not None for key in keys)
 
         async def exists(self, key):
-            return key in self.storage
+            return 1 if key in self.storage else 0
 
     mock_redis_instance = MockRedis()
 
@@ -1,6 +1,10 @@
-"""Quick debug for tag search - simple approach."""
+"""Quick debug for tag search - simple approach.
+
+Set DEBUG_SQL=1 to also print the SQL generated at each stage.
+"""
 
 import asyncio
+import os
 from uuid import uuid4
 from unittest.mock import AsyncMock, Mock
 
@@ -29,7 +33,7 @@ async def debug_tag_search():
 
     # Mock SQL result
     mock_result = Mock()
-    mock_result.scalars.return_value = [mock_note]
+    mock_result.all.return_value = [Mock(Note=mock_note, total=1)]
 
     # Mock session execute
     mock_session.execute = AsyncMock(return_value=mock_result)
@@ -40,7 +44,7 @@ async def debug_tag_search():
 
     # Test 1: No tag filter
     print("\n1. Testing without tag filter...")
-    results1 = await repo.search_notes(user_id, "meeting", tag_filter=None)
+    results1, _ = await repo.search_notes(user_id, "meeting", tag_filter=None)
     print(f"Results: {len(results1)}")
     print(f"Session execute called: {mock_session.execute.called}")
 
@@ -49,7 +53,7 @@ async def debug_tag_search():
 
     # Test 2: With tag filter
     print("\n2. Testing with tag filter ['work']...")
-    results2 = await repo.search_notes(user_id, "meeting", tag_filter=["work"])
+    results2, _ = await repo.search_notes(user_id, "meeting", tag_filter=["work"])
     print(f"Results: {len(results2)}")
     print(f"Session execute called: {mock_session.execute.called}")
 
@@ -58,33 +62,50 @@ async def debug_tag_search():
 
     # Test 3: With empty tag filter
     print("\n3. Testing with empty tag filter []...")
-    results3 = await repo.search_notes(user_id, "meeting", tag_filter=[])
+    results3, _ = await repo.search_notes(user_id, "meeting", tag_filter=[])
     print(f"Results: {len(results3)}")
     print(f"Session execute called: {mock_session.execute.called}")
 
-    # Check if SQL statements are being built correctly
-    # Let's check what SQL would be generated
+    # SQL rendering walks the whole expression tree with literal binds;
+    # only pay for it when asked to
+    if os.getenv("DEBUG_SQL"):
+        print_sql_analysis(user_id)
+
+
+def _render(stmt, dialect=None, literal_binds=True):
+    """Compile ``stmt`` for display, inlining bound values by default."""
+    return str(stmt.compile(dialect=dialect, compile_kwargs={"literal_binds": literal_binds}))
+
+
+def print_sql_analysis(user_id):
+    """Print the SQL behind each stage of the tag search query."""
     from sqlalchemy import select, or_, and_
     from sqlalchemy.orm import selectinload
     from notemesh.core.models.note import Note
     from notemesh.core.models.tag import Tag
+    from notemesh.core.repositories.note_repository import substring_condition
 
     print("\n=== SQL STATEMENT ANALYSIS ===")
 
     # Base statement
     stmt = select(Note).options(selectinload(Note.tags)).where(Note.owner_id == user_id)
-    search_condition = or_(Note.title.ilike("%meeting%"), Note.content.ilike("%meeting%"))
+    # Same builder the repository uses, so the printed SQL matches production
+    search_condition = substring_condition("%meeting%")
     stmt = stmt.where(search_condition)
 
+    # Tags come from the selectinload follow-up query; a joinedload here
+    # would multiply the note rows per tag
+    assert "JOIN tags" not in str(stmt), "Note.tags must be selectin-loaded, not joined"
+
     print("1. Base SQL (no tag filter):")
-    print(str(stmt.compile(compile_kwargs={"literal_binds": True})))
+    print(_render(stmt))
 
     # With tag filter
     stmt_with_tags = stmt.join(Note.tags).where(Tag.name.in_(["work"]))
     stmt_with_tags = stmt_with_tags.distinct()
 
     print("\n2. SQL with tag filter:")
-    print(str(stmt_with_tags.compile(compile_kwargs={"literal_binds": True})))
+    print(_render(stmt_with_tags))
 
     # Test NEW implementation with shared notes
     print("\n=== NEW IMPLEMENTATION WITH SHARED NOTES ===")
@@ -105,14 +126,14 @@ async def debug_tag_search():
     stmt_new = stmt_new.where(search_condition)
 
     print("\n3. NEW SQL (includes shared notes, no tag filter):")
-    print(str(stmt_new.compile(compile_kwargs={"literal_binds": True})))
+    print(_render(stmt_new))
 
     # With tag filter
     stmt_new_with_tags = stmt_new.join(Note.tags).where(Tag.name.in_(["work"]))
     stmt_new_with_tags = stmt_new_with_tags.distinct()
 
     print("\n4. NEW SQL (includes shared notes + tag filter):")
-    print(str(stmt_new_with_tags.compile(compile_kwargs={"literal_binds": True})))
+    print(_render(stmt_new_with_tags))
 
     # Test CURRENT implementation in repository
     print("\n=== TESTING CURRENT REPOSITORY IMPLEMENTATION ===")
@@ -138,14 +159,24 @@ async def debug_tag_search():
     current_stmt = current_stmt.where(search_condition)
 
     print("\n5. CURRENT SQL (no tag filter):")
-    print(str(current_stmt.compile(compile_kwargs={"literal_binds": True})))
+    print(_render(current_stmt))
+
+    # Step 4: Add tag filter as a correlated EXISTS (no extra JOIN rows)
+    from notemesh.core.repositories.note_repository import tag_filter_condition
+
+    current_stmt_with_tags = current_stmt.where(tag_filter_condition(["work"])).distinct()
+
+    print("\n6. CURRENT SQL (with tag filter):")
+    print(_render(current_stmt_with_tags))
+
+    # Step 5: On PostgreSQL the text match goes through the GIN-indexed tsvector
+    from sqlalchemy.dialects import postgresql
+    from notemesh.core.repositories.note_repository import text_search_condition
 
-    # Step 4: Add tag filter (this might be problematic)
-    current_stmt_with_tags = current_stmt.join(Note.tags).where(Tag.name.in_(["work"]))
-    current_stmt_with_tags = current_stmt_with_tags.distinct()
+    pg_stmt = select(Note).where(text_search_condition("meeting", "postgresql"))
 
-    print("\n6. CURRENT SQL (with tag filter - potential issue):")
-    print(str(current_stmt_with_tags.compile(compile_kwargs={"literal_binds": True})))
+    print("\n7. CURRENT SQL on PostgreSQL (full-text search):")
+    print(_render(pg_stmt, postgresql.dialect(), literal_binds=False))
 
 
 if __name__ == "__main__":
@@ -2,56 +2,83 @@
 
 import pytest
 import uuid
-from fastapi.testclient import TestClient
 
 
-class TestNoteSharingWorkflow:
-    """Test complete note sharing workflow from creation to access."""
+SHARE_TEST_USERNAMES = ("sharetest1", "sharetest2")
 
-    def test_complete_sharing_workflow(self, client):
-        """Test complete sharing workflow that reproduces the frontend bug."""
 
-        # Step 1: Register two users (with unique names for each test run)
-        import time
-        unique_suffix = str(int(time.time() * 1000))[-6:]  # Last 6 digits of timestamp
+@pytest.fixture(scope="module")
+def _share_test_accounts():
+    """Ids and signed access tokens for the workflow users, minted once per module."""
+    from src.notemesh.security.jwt import create_access_token
 
-        user1_data = {
-            "username": f"sharetest1_{unique_suffix}",
-            "password": "testpass123",
-            "full_name": "Share Test User 1",
-            "confirm_password": "testpass123"
+    accounts = {}
+    for username in SHARE_TEST_USERNAMES:
+        user_id = uuid.uuid4()
+        accounts[username] = {
+            "id": user_id,
+            "token": create_access_token({"sub": str(user_id)}),
         }
+    return accounts
+
+
+@pytest.fixture
+async def pre_registered_users(test_session, _precomputed_password_hash, _share_test_accounts):
+    """Insert the workflow users in one executemany; rows are rolled back per test."""
+    from sqlalchemy import insert
+
+    from src.notemesh.core.models.user import User
 
-        user2_data = {
-            "username": f"sharetest2_{unique_suffix}",
+    await test_session.execute(
+        insert(User),
+        [
+            {
+                "id": account["id"],
+                "username": username,
+                "password_hash": _precomputed_password_hash,
+                "full_name": f"Share Test User {username[-1]}",
+            }
+            for username, account in _share_test_accounts.items()
+        ],
+    )
+    await test_session.commit()
+    return _share_test_accounts
+
+
+class TestNoteSharingWorkflow:
+    """Test complete note sharing workflow from creation to access."""
+
+    def test_register_then_login_smoke(self, client):
+        """Smoke test: a user registered over HTTP can log in and use the token."""
+        user_data = {
+            "username": "sharetest_smoke",
             "password": "testpass123",
-            "full_name": "Share Test User 2",
+            "full_name": "Share Test Smoke",
             "confirm_password": "testpass123"
         }
 
-        # Register users
-        response1 = client.post("/api/auth/register", json=user1_data)
-        assert response1.status_code == 201
-        user1_id = response1.json()["id"]
-
-        response2 = client.post("/api/auth/register", json=user2_data)
-        assert response2.status_code == 201
-        user2_id = response2.json()["id"]
+        register_response = client.post("/api/auth/register", json=user_data)
+        assert register_response.status_code == 201
+        user_id = register_response.json()["id"]
 
-        # Step 2: Login both users
-        login1_response = client.post("/api/auth/login", json={
-            "username": f"sharetest1_{unique_suffix}",
+        login_response = client.post("/api/auth/login", json={
+            "username": "sharetest_smoke",
             "password": "testpass123"
         })
-        assert login1_response.status_code == 200
-        token1 = login1_response.json()["access_token"]
+        assert login_response.status_code == 200
+        token = login_response.json()["access_token"]
 
-        login2_response = client.post("/api/auth/login", json={
-            "username": f"sharetest2_{unique_suffix}",
-            "password": "testpass123"
-        })
-        assert login2_response.status_code == 200
-        token2 = login2_response.json()["access_token"]
+        me_response = client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+        assert me_response.status_code == 200
+        assert me_response.json()["id"] == user_id
+
+    def test_complete_sharing_workflow(self, client, pre_registered_users):
+        """Test complete sharing workflow that reproduces the frontend bug."""
+
+        # Steps 1-2: Both users exist and are logged in already; the real
+        # /register and /login flow is covered by test_register_then_login_smoke
+        token1 = pre_registered_users["sharetest1"]["token"]
+        token2 = pre_registered_users["sharetest2"]["token"]
 
         # Step 3: User1 creates a note
         note_data = {
@@ -73,7 +100,7 @@ class TestNoteSharingWorkflow:
         # Step 4: User1 shares the note with User2
         share_data = {
             "note_id": note_id,
-            "shared_with_usernames": [f"sharetest2_{unique_suffix}"],
+            "shared_with_usernames": ["sharetest2"],
             "permission_level": "read"
         }
 
@@ -155,13 +182,41 @@ class TestNoteSharingWorkflow:
             headers={"Authorization": f"Bearer {token1}"}
         )
         assert shares_given_response.status_code == 200
+        # Totals cost a COUNT query, so they are only returned when asked for
+        assert shares_given_response.json()["total_count"] is None
         shares_given = shares_given_response.json()["shares"]
         assert len(shares_given) == 1
         given_share = shares_given[0]
         assert given_share["note_id"] == note_id
         assert given_share["id"] == share_id
 
-    def test_frontend_data_transformation_logic(self, client):
+        # Step 11: User2 shares a note back; User1 sees both directions at once
+        reply_response = client.post(
+            "/api/notes/",
+            json={"title": "Reply Note", "content": "Thanks for sharing", "is_public": False},
+            headers={"Authorization": f"Bearer {token2}"}
+        )
+        assert reply_response.status_code == 201
+        reply_note_id = reply_response.json()["id"]
+
+        reply_share_response = client.post(
+            "/api/sharing/",
+            json={"note_id": reply_note_id, "shared_with_usernames": ["sharetest1"]},
+            headers={"Authorization": f"Bearer {token2}"}
+        )
+        assert reply_share_response.status_code == 201
+
+        all_shares_response = client.get(
+            "/api/sharing/?type=all&include_total=true",
+            headers={"Authorization": f"Bearer {token1}"}
+        )
+        assert all_shares_response.status_code == 200
+        all_shares = all_shares_response.json()
+        assert all_shares["total_count"] == 2
+        directions = {share["note_id"]: share["direction"] for share in all_shares["shares"]}
+        assert directions == {note_id: "given", reply_note_id: "received"}
+
+    def test_frontend_data_transformation_logic(self):
         """Test the exact data transformation that frontend does."""
         # This test simulates the frontend logic that was causing the bug
 
@@ -203,4 +258,4 @@ class TestNoteSharingWorkflow:
         assert len(fixed_notes) == 1
         transformed_note = fixed_notes[0]
         assert transformed_note["id"] == "note-id-67890"  # Should be note ID, not share ID
-        assert transformed_note["id"] != "share-id-12345"  # Should NOT be share ID
\ No newline at end of file
+        assert transformed_note["id"] != "share-id-12345"  # Should NOT be share ID
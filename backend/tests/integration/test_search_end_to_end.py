@@ -1,21 +1,50 @@
 """End-to-end integration tests for search functionality."""
 
+from dataclasses import dataclass
+
 import pytest
-from uuid import uuid4
+from uuid import UUID, uuid4
 from unittest.mock import AsyncMock, Mock
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from src.notemesh.core.services.search_service import SearchService
 from src.notemesh.core.schemas.notes import NoteSearchRequest
 from src.notemesh.core.repositories.note_repository import NoteRepository
 
 
+@dataclass(slots=True)
+class FakeTag:
+    """Tag stand-in; the search service only reads ``name``."""
+
+    name: str
+
+
+@dataclass(slots=True)
+class FakeNote:
+    """Read-only note stand-in with the attributes search results use."""
+
+    id: UUID
+    title: str
+    content: str
+    owner_id: UUID
+    created_at: str
+    updated_at: str
+    tags: list
+
+
 class TestSearchEndToEnd:
     """End-to-end tests for search functionality including shared notes and tag filtering."""
 
     @pytest.fixture
     def mock_session(self):
-        """Mock database session."""
-        return Mock()
+        """Mock async database session; the spec rejects sync-only session calls."""
+        session = AsyncMock(spec=AsyncSession)
+        # Results themselves are synchronous; an empty one means no owners or shares
+        session.execute.return_value = Mock(
+            **{"scalar_one_or_none.return_value": None, "scalar.return_value": 0, "scalars.return_value": []}
+        )
+        return session
 
     @pytest.fixture
     def search_service(self, mock_session):
@@ -38,35 +67,32 @@ class TestSearchEndToEnd:
     @pytest.mark.asyncio
     async def test_search_includes_shared_notes_with_tags(self, search_service, user_id, other_user_id):
         """Integration test: search includes shared notes and filters by tags correctly."""
-        # Mock owned note with work tag
-        owned_note = Mock()
-        owned_note.id = uuid4()
-        owned_note.title = "My Work Project"
-        owned_note.content = "My project documentation"
-        owned_note.owner_id = user_id
-        owned_note.created_at = "2024-01-01T10:00:00Z"
-        owned_note.updated_at = "2024-01-01T10:00:00Z"
-
-        owned_tag = Mock()
-        owned_tag.name = "work"
-        owned_note.tags = [owned_tag]
-
-        # Mock shared note with work tag
-        shared_note = Mock()
-        shared_note.id = uuid4()
-        shared_note.title = "Shared Work Document"
-        shared_note.content = "Document shared with me"
-        shared_note.owner_id = other_user_id
-        shared_note.created_at = "2024-01-02T10:00:00Z"
-        shared_note.updated_at = "2024-01-02T10:00:00Z"
-
-        shared_tag = Mock()
-        shared_tag.name = "work"
-        shared_note.tags = [shared_tag]
+        owned_note = FakeNote(
+            id=uuid4(),
+            title="My Work Project",
+            content="My project documentation",
+            owner_id=user_id,
+            created_at="2024-01-01T10:00:00Z",
+            updated_at="2024-01-01T10:00:00Z",
+            tags=[FakeTag(name="work")],
+        )
+        shared_note = FakeNote(
+            id=uuid4(),
+            title="Shared Work Document",
+            content="Document shared with me",
+            owner_id=other_user_id,
+            created_at="2024-01-02T10:00:00Z",
+            updated_at="2024-01-02T10:00:00Z",
+            tags=[FakeTag(name="work")],
+        )
 
         # Mock note repository to return both notes
         search_service.note_repo = AsyncMock()
-        search_service.note_repo.search_notes.return_value = [owned_note, shared_note]
+        search_service.note_repo.search_notes.return_value = ([owned_note, shared_note], 2)
+        tag_ids = {"work": uuid4(), "personal": uuid4()}
+        search_service.note_repo.get_tag_ids_by_names.side_effect = lambda names: {
+            name: tag_ids[name] for name in names if name in tag_ids
+        }
 
         # Test 1: Search without tag filter - should find both notes
         request_no_tags = NoteSearchRequest(
@@ -86,7 +112,9 @@ class TestSearchEndToEnd:
         search_service.note_repo.search_notes.assert_called_with(
             user_id=user_id,
             query="work",
-            tag_filter=None
+            tag_id_filter=None,
+            limit=20,
+            offset=0
         )
 
         # Test 2: Search with tag filter - should find both notes with work tag
@@ -110,12 +138,14 @@ class TestSearchEndToEnd:
         search_service.note_repo.search_notes.assert_called_with(
             user_id=user_id,
             query="work",
-            tag_filter=["work"]
+            tag_id_filter=[tag_ids["work"]],
+            limit=20,
+            offset=0
         )
 
         # Test 3: Search with non-matching tag - should find no notes
         search_service.note_repo.search_notes.reset_mock()
-        search_service.note_repo.search_notes.return_value = []
+        search_service.note_repo.search_notes.return_value = ([], 0)
 
         request_no_match = NoteSearchRequest(
             query="work",
@@ -132,32 +162,26 @@ class TestSearchEndToEnd:
         search_service.note_repo.search_notes.assert_called_with(
             user_id=user_id,
             query="work",
-            tag_filter=["personal"]
+            tag_id_filter=[tag_ids["personal"]],
+            limit=20,
+            offset=0
         )
 
     @pytest.mark.asyncio
-    async def test_search_repository_access_control(self, mock_session, user_id, other_user_id):
+    @pytest.mark.parametrize(
+        "tag_filter", [None, ["work", "important"], []], ids=["no-filter", "tags", "empty-filter"]
+    )
+    async def test_search_repository_access_control(self, mock_session, user_id, tag_filter):
         """Test that repository correctly implements access control for shared notes."""
         # This tests the actual repository logic we implemented
         repo = NoteRepository(mock_session)
 
         # Mock session execute to simulate SQL execution
         mock_result = Mock()
-        mock_result.scalars.return_value = []
+        mock_result.all.return_value = []
         repo.session.execute = AsyncMock(return_value=mock_result)
 
-        # Test repository search with different parameters
-        await repo.search_notes(user_id, "test query", tag_filter=None)
-        repo.session.execute.assert_called_once()
-
-        # Reset and test with tag filter
-        repo.session.execute.reset_mock()
-        await repo.search_notes(user_id, "test query", tag_filter=["work", "important"])
-        repo.session.execute.assert_called_once()
-
-        # Reset and test with empty tag filter
-        repo.session.execute.reset_mock()
-        await repo.search_notes(user_id, "test query", tag_filter=[])
+        await repo.search_notes(user_id, "test query", tag_filter=tag_filter)
         repo.session.execute.assert_called_once()
 
     @pytest.mark.asyncio
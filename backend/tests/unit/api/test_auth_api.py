@@ -4,14 +4,28 @@ import uuid
 from typing import Any
 
 import pytest
-from fastapi.testclient import TestClient
+from httpx import AsyncClient
 
+from src.notemesh.api.auth import get_current_user_id as _GET_USER_DEP
 from src.notemesh.main import app
 
 
 @pytest.fixture
-def client() -> TestClient:
-    return TestClient(app)
+def client(_session_async_client) -> AsyncClient:
+    """The session-wide AsyncClient; these tests stub the services, not the DB."""
+    _session_async_client.cookies.clear()
+    return _session_async_client
+
+
+@pytest.fixture
+def override_user_id():
+    """Authenticate requests as a fixed user id, bypassing token checks."""
+    user_id = uuid.uuid4()
+    app.dependency_overrides[_GET_USER_DEP] = lambda: str(user_id)
+    try:
+        yield user_id
+    finally:
+        app.dependency_overrides.pop(_GET_USER_DEP, None)
 
 
 def _json_ok(resp) -> dict[str, Any]:
@@ -19,7 +33,7 @@ def _json_ok(resp) -> dict[str, Any]:
     return resp.json()
 
 
-def test_register_calls_service(monkeypatch, client):
+async def test_register_calls_service(monkeypatch, client):
     called = {}
 
     async def fake_register_user(self, request):
@@ -43,12 +57,12 @@ def test_register_calls_service(monkeypatch, client):
         "confirm_password": "Password123!",
         "full_name": "Alice A",
     }
-    resp = client.post("/api/auth/register", json=payload)
+    resp = await client.post("/api/auth/register", json=payload)
     data = _json_ok(resp)
     assert data["username"] == "alice"
 
 
-def test_login_calls_service(monkeypatch, client):
+async def test_login_calls_service(monkeypatch, client):
     async def fake_auth(self, request):
         return {
             "access_token": "at",
@@ -69,12 +83,14 @@ def test_login_calls_service(monkeypatch, client):
 
     monkeypatch.setattr(AuthService, "authenticate_user", fake_auth, raising=True)
 
-    resp = client.post("/api/auth/login", json={"username": "bob", "password": "Password123!"})
+    resp = await client.post(
+        "/api/auth/login", json={"username": "bob", "password": "Password123!"}
+    )
     data = _json_ok(resp)
     assert data["token_type"] == "bearer"
 
 
-def test_refresh_calls_service(monkeypatch, client):
+async def test_refresh_calls_service(monkeypatch, client):
     async def fake_refresh(self, request):
         return {
             "access_token": "new-at",
@@ -95,13 +111,13 @@ def test_refresh_calls_service(monkeypatch, client):
 
     monkeypatch.setattr(AuthService, "refresh_token", fake_refresh, raising=True)
 
-    resp = client.post("/api/auth/refresh", json={"refresh_token": "rt"})
+    resp = await client.post("/api/auth/refresh", json={"refresh_token": "rt"})
     data = _json_ok(resp)
     assert data["access_token"] == "new-at"
 
 
-def test_me_calls_service(monkeypatch, client):
-    user_id = uuid.uuid4()
+async def test_me_calls_service(monkeypatch, client, override_user_id):
+    user_id = override_user_id
 
     async def fake_get_current_user(self, uid):
         assert str(uid) == str(user_id)
@@ -114,28 +130,17 @@ def test_me_calls_service(monkeypatch, client):
             "updated_at": "2025-01-01T00:00:00Z",
         }
 
-    # Override dependency to inject a fixed user id
-    # Use FastAPI dependency_overrides to bypass auth and return our fixed user_id
-    from src.notemesh.api.auth import get_current_user_id as real_dep
-    from src.notemesh.main import app
-
-    app.dependency_overrides[real_dep] = lambda: str(user_id)
-
     from src.notemesh.core.services.auth_service import AuthService
 
     monkeypatch.setattr(AuthService, "get_current_user", fake_get_current_user, raising=True)
 
-    resp = client.get("/api/auth/me")
-    from src.notemesh.main import app
-
-    # cleanup override
-    app.dependency_overrides.pop(real_dep, None)
+    resp = await client.get("/api/auth/me")
     data = _json_ok(resp)
     assert data["id"] == str(user_id)
 
 
-def test_update_profile_calls_service(monkeypatch, client):
-    user_id = uuid.uuid4()
+async def test_update_profile_calls_service(monkeypatch, client, override_user_id):
+    user_id = override_user_id
 
     async def fake_update(self, uid, req):
         assert str(uid) == str(user_id)
@@ -148,34 +153,22 @@ def test_update_profile_calls_service(monkeypatch, client):
             "updated_at": "2025-01-01T00:00:00Z",
         }
 
-    from src.notemesh.api.auth import get_current_user_id as real_dep
-    from src.notemesh.main import app
-
-    app.dependency_overrides[real_dep] = lambda: str(user_id)
-
     from src.notemesh.core.services.auth_service import AuthService
 
     monkeypatch.setattr(AuthService, "update_user_profile", fake_update, raising=True)
 
-    resp = client.put("/api/auth/me", json={"username": "alice"})
-    # cleanup override
-    app.dependency_overrides.pop(real_dep, None)
+    resp = await client.put("/api/auth/me", json={"username": "alice"})
     data = _json_ok(resp)
     assert data["username"] == "alice"
 
 
-def test_change_password_calls_service(monkeypatch, client):
-    user_id = uuid.uuid4()
+async def test_change_password_calls_service(monkeypatch, client, override_user_id):
+    user_id = override_user_id
 
     async def fake_change(self, uid, req):
         assert str(uid) == str(user_id)
         return True
 
-    from src.notemesh.api.auth import get_current_user_id as real_dep
-    from src.notemesh.main import app
-
-    app.dependency_overrides[real_dep] = lambda: str(user_id)
-
     from src.notemesh.core.services.auth_service import AuthService
 
     monkeypatch.setattr(AuthService, "change_password", fake_change, raising=True)
@@ -185,31 +178,22 @@ def test_change_password_calls_service(monkeypatch, client):
         "new_password": "NewPass123!",
         "confirm_new_password": "NewPass123!",
     }
-    resp = client.post("/api/auth/change-password", json=payload)
-    # cleanup override
-    app.dependency_overrides.pop(real_dep, None)
+    resp = await client.post("/api/auth/change-password", json=payload)
     data = _json_ok(resp)
     assert data["message"] == "Password changed successfully"
 
 
-def test_logout_calls_service(monkeypatch, client):
-    user_id = uuid.uuid4()
+async def test_logout_calls_service(monkeypatch, client, override_user_id):
+    user_id = override_user_id
 
     async def fake_logout(self, uid, token):
         assert str(uid) == str(user_id)
         return True
 
-    from src.notemesh.api.auth import get_current_user_id as real_dep
-    from src.notemesh.main import app
-
-    app.dependency_overrides[real_dep] = lambda: str(user_id)
-
     from src.notemesh.core.services.auth_service import AuthService
 
     monkeypatch.setattr(AuthService, "logout_user", fake_logout, raising=True)
 
-    resp = client.post("/api/auth/logout")
-    # cleanup override
-    app.dependency_overrides.pop(real_dep, None)
+    resp = await client.post("/api/auth/logout")
     data = _json_ok(resp)
     assert data["message"] == "Logged out successfully"
@@ -2,9 +2,9 @@
 
 import uuid
 
-import pytest
+from sqlalchemy.dialects import postgresql, sqlite
 
-from src.notemesh.core.repositories.note_repository import NoteRepository
+from src.notemesh.core.repositories.note_repository import NoteRepository, text_search_condition
 
 
 class Dummy:
@@ -23,6 +23,9 @@ class FakeScalarResult:
     def scalar(self):
         return self._scalar
 
+    def all(self):
+        return self._scalars_list
+
     def scalars(self):
         class _It:
             def __init__(self, data):
@@ -61,8 +64,10 @@ class FakeSession:
     async def delete(self, obj):
         self.deleted.append(obj)
 
+    def get_bind(self):
+        return Dummy(dialect=Dummy(name="sqlite"))
+
 
-@pytest.mark.asyncio
 async def test_create_get_update_delete_note_flow():
     owner = uuid.uuid4()
     note_id = uuid.uuid4()
@@ -119,7 +124,6 @@ async def test_create_get_update_delete_note_flow():
     assert deleted_false is False
 
 
-@pytest.mark.asyncio
 async def test_list_user_notes_and_tags_and_search():
     owner = uuid.uuid4()
     n1 = Dummy(
@@ -154,8 +158,24 @@ async def test_list_user_notes_and_tags_and_search():
     tags = await repo2.get_user_tags(owner)
     assert tags == ["work", "home"]
 
-    # search_notes returns scalars list
-    session3 = FakeSession(results_iter=[FakeScalarResult(scalars_list=[n1, n2])])
+    # search_notes returns the page plus the windowed total
+    session3 = FakeSession(
+        results_iter=[
+            FakeScalarResult(scalars_list=[Dummy(Note=n1, total=2), Dummy(Note=n2, total=2)])
+        ]
+    )
     repo3 = NoteRepository(session3)
-    res = await repo3.search_notes(owner, query="a", tag_filter=None)
-    assert res == [n1, n2]
+    res, total = await repo3.search_notes(owner, query="a", tag_filter=None)
+    assert res == [n1, n2] and total == 2
+
+
+def test_text_search_condition_uses_full_text_index_on_postgresql():
+    sql = str(text_search_condition("meeting", "postgresql").compile(dialect=postgresql.dialect()))
+    assert "notes.search_vec @@ plainto_tsquery" in sql
+    assert "ILIKE" not in sql
+
+    # Very short terms and other dialects keep the substring match
+    short_sql = str(text_search_condition("ab", "postgresql").compile(dialect=postgresql.dialect()))
+    assert "search_vec" not in short_sql and "ILIKE" in short_sql
+    sqlite_sql = str(text_search_condition("meeting", "sqlite").compile(dialect=sqlite.dialect()))
+    assert "search_vec" not in sqlite_sql and "LIKE" in sqlite_sql
@@ -21,12 +21,11 @@ class TestNoteRepositoryCoverage:
         """Create note repository with mocked session."""
         return NoteRepository(mock_session)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def user_id(self):
-        """Sample user ID."""
+        """Sample user ID (immutable, so shared by the whole class)."""
         return uuid.uuid4()
 
-    @pytest.mark.asyncio
     async def test_create_note(self, note_repository, user_id):
         """Test note creation."""
         note_data = {
@@ -56,7 +55,6 @@ class TestNoteRepositoryCoverage:
         note_repository.session.commit.assert_called_once()
         note_repository.session.refresh.assert_called_once_with(mock_note)
 
-    @pytest.mark.asyncio
     async def test_get_by_id(self, note_repository):
         """Test get note by ID."""
         note_id = uuid.uuid4()
@@ -73,7 +71,6 @@ class TestNoteRepositoryCoverage:
         assert result == mock_note
         note_repository.session.execute.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_get_by_id_and_user(self, note_repository, user_id):
         """Test get note by ID and user."""
         note_id = uuid.uuid4()
@@ -91,7 +88,6 @@ class TestNoteRepositoryCoverage:
         assert result == mock_note
         note_repository.session.execute.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_update_note(self, note_repository, user_id):
         """Test note update."""
         note_id = uuid.uuid4()
@@ -112,7 +108,6 @@ class TestNoteRepositoryCoverage:
         note_repository.session.commit.assert_called_once()
         note_repository.session.refresh.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_update_note_not_found(self, note_repository, user_id):
         """Test update note when note not found."""
         note_id = uuid.uuid4()
@@ -125,7 +120,6 @@ class TestNoteRepositoryCoverage:
 
         assert result is None
 
-    @pytest.mark.asyncio
     async def test_delete_note_not_found(self, note_repository, user_id):
         """Test delete note when note not found."""
         note_id = uuid.uuid4()
@@ -137,7 +131,6 @@ class TestNoteRepositoryCoverage:
 
         assert result is False
 
-    @pytest.mark.asyncio
     async def test_delete_note_success(self, note_repository, user_id):
         """Test successful note deletion."""
         note_id = uuid.uuid4()
@@ -157,7 +150,6 @@ class TestNoteRepositoryCoverage:
         note_repository.session.delete.assert_called_once_with(mock_note)
         note_repository.session.commit.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_get_user_tags(self, note_repository, user_id):
         """Test get user tags."""
         mock_result = Mock()
@@ -169,7 +161,26 @@ class TestNoteRepositoryCoverage:
         assert result == ["work", "personal", "meeting"]
         note_repository.session.execute.assert_called_once()
 
-    @pytest.mark.asyncio
+    async def test_get_user_tag_names(self, note_repository, user_id):
+        """Test get user tag names reads the first column of raw rows."""
+        note_repository.session.execute = AsyncMock(return_value=[("meeting",), ("work",)])
+
+        result = await note_repository.get_user_tag_names(user_id)
+
+        assert result == ["meeting", "work"]
+        note_repository.session.execute.assert_called_once()
+
+    async def test_count_user_notes(self, note_repository, user_id):
+        """Test count user notes uses a single scalar query."""
+        mock_result = Mock()
+        mock_result.scalar_one.return_value = 7
+        note_repository.session.execute = AsyncMock(return_value=mock_result)
+
+        result = await note_repository.count_user_notes(user_id)
+
+        assert result == 7
+        note_repository.session.execute.assert_called_once()
+
     async def test_list_user_notes_with_tag_filter(self, note_repository, user_id):
         """Test list user notes with tag filter."""
         mock_notes = [Mock(), Mock()]
@@ -194,7 +205,6 @@ class TestNoteRepositoryCoverage:
         assert result_total == mock_total
         assert note_repository.session.execute.call_count == 2
 
-    @pytest.mark.asyncio
     async def test_list_user_notes_without_tag_filter(self, note_repository, user_id):
         """Test list user notes without tag filter."""
         mock_notes = [Mock(), Mock()]
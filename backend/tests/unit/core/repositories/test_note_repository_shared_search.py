@@ -21,14 +21,14 @@ class TestNoteRepositorySharedSearch:
         """Create note repository with mocked session."""
         return NoteRepository(mock_session)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def user_id(self):
-        """Sample user ID."""
+        """Sample user ID (immutable, so shared by the whole class)."""
         return uuid.uuid4()
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def other_user_id(self):
-        """Another user ID."""
+        """Another user ID (immutable, so shared by the whole class)."""
         return uuid.uuid4()
 
     @pytest.fixture
@@ -57,18 +57,17 @@ class TestNoteRepositorySharedSearch:
         note.tags = []
         return note
 
-    @pytest.mark.asyncio
     async def test_search_includes_notes_shared_with_user(
         self, note_repository, user_id, mock_owned_note, mock_shared_note
     ):
         """Test that search includes both owned and shared notes."""
         # Setup mock to return both owned and shared notes
         mock_result = Mock()
-        mock_result.scalars.return_value = [mock_owned_note, mock_shared_note]
+        mock_result.all.return_value = [Mock(Note=mock_owned_note, total=2), Mock(Note=mock_shared_note, total=2)]
         note_repository.session.execute = AsyncMock(return_value=mock_result)
 
         # Act
-        results = await note_repository.search_notes(user_id, "note", tag_filter=None)
+        results, total = await note_repository.search_notes(user_id, "note", tag_filter=None)
 
         # Assert
         assert len(results) == 2
@@ -79,7 +78,6 @@ class TestNoteRepositorySharedSearch:
         # Verify the SQL includes OR condition for shared notes
         note_repository.session.execute.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_search_with_tags_includes_shared_notes(
         self, note_repository, user_id, mock_owned_note, mock_shared_note
     ):
@@ -92,17 +90,16 @@ class TestNoteRepositorySharedSearch:
 
         # Setup mock
         mock_result = Mock()
-        mock_result.scalars.return_value = [mock_owned_note, mock_shared_note]
+        mock_result.all.return_value = [Mock(Note=mock_owned_note, total=2), Mock(Note=mock_shared_note, total=2)]
         note_repository.session.execute = AsyncMock(return_value=mock_result)
 
         # Act
-        results = await note_repository.search_notes(user_id, "note", tag_filter=["work"])
+        results, total = await note_repository.search_notes(user_id, "note", tag_filter=["work"])
 
         # Assert
         assert len(results) == 2
         note_repository.session.execute.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_search_only_finds_accessible_notes(
         self, note_repository, user_id, mock_owned_note
     ):
@@ -117,11 +114,11 @@ class TestNoteRepositorySharedSearch:
 
         # Setup mock to return only accessible notes
         mock_result = Mock()
-        mock_result.scalars.return_value = [mock_owned_note]  # Only owned note
+        mock_result.all.return_value = [Mock(Note=mock_owned_note, total=1)]  # Only owned note
         note_repository.session.execute = AsyncMock(return_value=mock_result)
 
         # Act
-        results = await note_repository.search_notes(user_id, "note", tag_filter=None)
+        results, total = await note_repository.search_notes(user_id, "note", tag_filter=None)
 
         # Assert
         assert len(results) == 1
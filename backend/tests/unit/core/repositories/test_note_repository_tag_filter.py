@@ -21,9 +21,9 @@ class TestNoteRepositoryTagFilter:
         """Create note repository with mocked session."""
         return NoteRepository(mock_session)
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def user_id(self):
-        """Sample user ID."""
+        """Sample user ID (immutable, so shared by the whole class)."""
         return uuid.uuid4()
 
     @pytest.fixture
@@ -60,18 +60,17 @@ class TestNoteRepositoryTagFilter:
         note.tags = [tag]
         return note
 
-    @pytest.mark.asyncio
     async def test_search_notes_with_tag_filter_calls_correct_query(
         self, note_repository, user_id, mock_note_with_work_tag
     ):
         """Test that search_notes with tag filter constructs correct query."""
         # Setup mock session and execute
         mock_result = Mock()
-        mock_result.scalars.return_value = [mock_note_with_work_tag]
+        mock_result.all.return_value = [Mock(Note=mock_note_with_work_tag, total=1)]
         note_repository.session.execute = AsyncMock(return_value=mock_result)
 
         # Act
-        result = await note_repository.search_notes(
+        result, total = await note_repository.search_notes(
             user_id=user_id,
             query="meeting",
             tag_filter=["work"]
@@ -82,18 +81,17 @@ class TestNoteRepositoryTagFilter:
         assert result[0].title == "Work Meeting Notes"
         note_repository.session.execute.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_search_notes_with_empty_tag_filter_list(
         self, note_repository, user_id, mock_note_with_work_tag
     ):
         """Test that search_notes with empty tag filter list works correctly."""
         # Setup mock session and execute
         mock_result = Mock()
-        mock_result.scalars.return_value = [mock_note_with_work_tag]
+        mock_result.all.return_value = [Mock(Note=mock_note_with_work_tag, total=1)]
         note_repository.session.execute = AsyncMock(return_value=mock_result)
 
         # Act - empty list should not apply tag filter
-        result = await note_repository.search_notes(
+        result, total = await note_repository.search_notes(
             user_id=user_id,
             query="meeting",
             tag_filter=[]
@@ -103,18 +101,17 @@ class TestNoteRepositoryTagFilter:
         assert len(result) == 1
         note_repository.session.execute.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_search_notes_with_none_tag_filter(
         self, note_repository, user_id, mock_note_with_work_tag
     ):
         """Test that search_notes with None tag filter works correctly."""
         # Setup mock session and execute
         mock_result = Mock()
-        mock_result.scalars.return_value = [mock_note_with_work_tag]
+        mock_result.all.return_value = [Mock(Note=mock_note_with_work_tag, total=1)]
         note_repository.session.execute = AsyncMock(return_value=mock_result)
 
         # Act - None should not apply tag filter
-        result = await note_repository.search_notes(
+        result, total = await note_repository.search_notes(
             user_id=user_id,
             query="meeting",
             tag_filter=None
@@ -124,7 +121,6 @@ class TestNoteRepositoryTagFilter:
         assert len(result) == 1
         note_repository.session.execute.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_list_user_notes_with_tag_filter_consistency(
         self, note_repository, user_id, mock_note_with_work_tag
     ):
@@ -3,8 +3,6 @@
 import uuid
 from datetime import datetime, timedelta, timezone
 
-import pytest
-
 from src.notemesh.core.repositories.refresh_token_repository import RefreshTokenRepository
 
 
@@ -50,7 +48,6 @@ class FakeSession:
         self.deleted.append(obj)
 
 
-@pytest.mark.asyncio
 async def test_create_get_delete_token_and_validity():
     uid = uuid.uuid4()
     now = datetime.now(timezone.utc)
@@ -90,7 +87,6 @@ async def test_create_get_delete_token_and_validity():
     assert del_false is False
 
 
-@pytest.mark.asyncio
 async def test_delete_user_and_expired_tokens_counts():
     session1 = FakeSession(FakeResult(rowcount=3))
     repo1 = RefreshTokenRepository(session1)
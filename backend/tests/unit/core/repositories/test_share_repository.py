@@ -1,9 +1,14 @@
-"""Unit tests for ShareRepository without a real DB."""
+"""Unit tests for ShareRepository, mostly against a fake session."""
 
 import uuid
+from datetime import datetime, timedelta, timezone
 
 import pytest
+from sqlalchemy import inspect
 
+from src.notemesh.core.models.share import Share, ShareStatus
+from src.notemesh.core.repositories import share_repository
+from src.notemesh.core.repositories.note_repository import NoteRepository
 from src.notemesh.core.repositories.share_repository import ShareRepository
 
 
@@ -23,6 +28,9 @@ class FakeScalarResult:
     def scalar(self):
         return self._scalar
 
+    def scalar_one(self):
+        return self._scalar
+
     def scalars(self):
         class _It:
             def __init__(self, data):
@@ -67,7 +75,6 @@ class FakeSession:
         self.deleted.append(obj)
 
 
-@pytest.mark.asyncio
 async def test_create_get_list_and_revoke_share():
     owner = uuid.uuid4()
     note_id = uuid.uuid4()
@@ -96,16 +103,140 @@ async def test_create_get_list_and_revoke_share():
     # list_shares_given -> returns scalars list and count
     s3 = FakeSession(results_iter=[FakeScalarResult(1), FakeScalarResult(scalars_list=[share_obj])])
     repo3 = ShareRepository(s3)
-    lst, total = await repo3.list_shares_given(owner, page=1, per_page=10)
+    lst, total = await repo3.list_shares_given(owner, page=1, per_page=10, with_count=True)
     assert total == 1 and lst == [share_obj]
 
-    # revoke_share true/false
-    s4 = FakeSession(results_iter=[FakeScalarResult(share_obj)])
+    # revoke_share -> recipient id / None
+    s4 = FakeSession(results_iter=[FakeScalarResult(share_obj.shared_with)])
     repo4 = ShareRepository(s4)
     ok = await repo4.delete_share(share_id, owner)
-    assert ok is True and s4.deleted
+    assert ok == share_obj.shared_with and s4.commits == 1
 
     s5 = FakeSession(results_iter=[FakeScalarResult(None)])
     repo5 = ShareRepository(s5)
     nok = await repo5.delete_share(share_id, owner)
-    assert nok is False
+    assert nok is None and s5.commits == 0
+
+
+@pytest.mark.parametrize("with_count", [True, False], ids=["with-count", "no-count"])
+async def test_list_shares_eager_loads_response_relationships(
+    test_session, test_note, share_listing, with_count
+):
+    """Every listing returns the viewer's shares with all relationships responses read."""
+    kind, viewer_id, expected = share_listing
+    expected_ids = {share.id for share in expected}
+    test_session.expunge_all()
+
+    list_shares = getattr(ShareRepository(test_session), f"list_shares_{kind}")
+    rows, total = await list_shares(viewer_id, with_count=with_count)
+
+    shares = [share for share, _ in rows] if kind == "all" else rows
+    if kind == "all":
+        assert {direction for _, direction in rows} == {"given"}
+    assert total == (len(expected) if with_count else None)
+    assert {share.id for share in shares} == expected_ids
+    for share in shares:
+        note_state = inspect(share.note)
+        assert not {"note", "shared_with_user", "shared_by_user"} & inspect(share).unloaded
+        assert not {"tags", "owner"} & note_state.unloaded
+        # Only a content prefix leaves the database
+        assert "content" in note_state.unloaded
+        assert share.note.content_preview == test_note.content
+
+
+async def test_get_note_with_owner_and_access_returns_share_row(
+    test_session, test_note, note_shares
+):
+    """Note, owner and the caller's share row are fetched together."""
+    owner_id = test_note.owner_id
+    shared = note_shares[0]
+    shared.permission = "write"
+    await test_session.commit()
+
+    repo = NoteRepository(test_session)
+
+    fetched, owner, share = await repo.get_note_with_owner_and_access(
+        test_note.id, shared.shared_with_user_id
+    )
+    assert fetched.id == test_note.id and owner.id == owner_id
+    assert share.permission == "write"
+
+    # The owner reads the note through ownership, without a share row
+    _, _, no_share = await repo.get_note_with_owner_and_access(test_note.id, owner_id)
+    assert no_share is None
+
+    assert (
+        await repo.get_note_with_owner_and_access(uuid.uuid4(), shared.shared_with_user_id) is None
+    )
+
+
+async def test_delete_share_returns_recipient_of_deleted_row(test_session, test_note, note_shares):
+    """Deleting hands back the recipient id; only the sharer can delete."""
+    owner_id = test_note.owner_id
+    share = note_shares[0]
+    recipient_id = share.shared_with_user_id
+
+    repo = ShareRepository(test_session)
+
+    assert await repo.delete_share(share.id, recipient_id) is None
+    assert await repo.delete_share(share.id, owner_id) == recipient_id
+    assert await repo.get_by_id(share.id) is None
+    assert await repo.delete_share(share.id, owner_id) is None
+
+
+async def test_count_active_shares_by_note_groups_in_one_query(
+    test_session, test_note, note_shares
+):
+    """Only the sharer's active, unexpired shares are counted, per requested note."""
+    owner_id = test_note.owner_id
+    note_shares[0].status = ShareStatus.REVOKED.value
+    note_shares[1].expires_at = datetime.now(timezone.utc) - timedelta(days=1)
+    await test_session.commit()
+
+    repo = ShareRepository(test_session)
+    unshared_note_id = uuid.uuid4()
+
+    counts = await repo.count_active_shares_by_note(owner_id, [test_note.id, unshared_note_id])
+    assert counts == {test_note.id: len(note_shares) - 2}
+    recipient_id = note_shares[2].shared_with_user_id
+    assert await repo.count_active_shares_by_note(recipient_id, [test_note.id]) == {}
+    assert await repo.count_active_shares_by_note(owner_id, []) == {}
+
+
+@pytest.mark.parametrize("has_on_conflict", [True, False], ids=["upsert", "select-fallback"])
+async def test_upsert_shares_updates_existing_and_creates_new(
+    test_session, test_note, share_recipients, monkeypatch, has_on_conflict
+):
+    """Both the ON CONFLICT path and the fallback for other dialects save the same rows."""
+    if not has_on_conflict:
+        monkeypatch.setattr(share_repository, "_UPSERT_INSERTS", {})
+    owner_id = test_note.owner_id
+    existing_recipient, new_recipient = share_recipients[:2]
+    existing = Share(
+        note_id=test_note.id,
+        shared_by_user_id=owner_id,
+        shared_with_user_id=existing_recipient.id,
+        status=ShareStatus.REVOKED.value,
+    )
+    test_session.add(existing)
+    await test_session.commit()
+
+    saved = await ShareRepository(test_session).upsert_shares(
+        [
+            {
+                "note_id": test_note.id,
+                "shared_by_user_id": owner_id,
+                "shared_with_user_id": recipient.id,
+                "permission": "write",
+                "share_message": "hi",
+            }
+            for recipient in (existing_recipient, new_recipient)
+        ]
+    )
+
+    assert set(saved) == {existing_recipient.id, new_recipient.id}
+    assert saved[existing_recipient.id].id == existing.id  # updated, not duplicated
+    assert all(
+        share.permission == "write" and share.share_message == "hi" for share in saved.values()
+    )
+    assert all(share.status == ShareStatus.ACTIVE.value for share in saved.values())
@@ -136,7 +136,7 @@ class TestShareRepositoryCoverage:
 
         # Mock count query result
         mock_count_result = Mock()
-        mock_count_result.scalar.return_value = mock_total
+        mock_count_result.scalar_one.return_value = mock_total
 
         # Mock shares query result - scalars() should return an iterable
         mock_shares_result = Mock()
@@ -146,7 +146,7 @@ class TestShareRepositoryCoverage:
         share_repository.session.execute = AsyncMock(side_effect=[mock_count_result, mock_shares_result])
 
         result_shares, result_total = await share_repository.list_shares_given(
-            user_id, page=1, per_page=20
+            user_id, page=1, per_page=20, with_count=True
         )
 
         assert result_shares == mock_shares
@@ -161,7 +161,7 @@ class TestShareRepositoryCoverage:
 
         # Mock count query result
         mock_count_result = Mock()
-        mock_count_result.scalar.return_value = mock_total
+        mock_count_result.scalar_one.return_value = mock_total
 
         # Mock shares query result - scalars() should return an iterable
         mock_shares_result = Mock()
@@ -170,7 +170,7 @@ class TestShareRepositoryCoverage:
         share_repository.session.execute = AsyncMock(side_effect=[mock_count_result, mock_shares_result])
 
         result_shares, result_total = await share_repository.list_shares_received(
-            user_id, page=1, per_page=10
+            user_id, page=1, per_page=10, with_count=True
         )
 
         assert result_shares == mock_shares
@@ -193,21 +193,20 @@ class TestShareRepositoryCoverage:
 
     @pytest.mark.asyncio
     async def test_delete_share(self, share_repository, user_id):
-        """Test delete share."""
+        """Test delete share returns the recipient from DELETE ... RETURNING."""
         share_id = uuid.uuid4()
+        recipient_id = uuid.uuid4()
 
-        mock_share = Mock()
-        mock_share.id = share_id
-
-        # Mock the operations - delete_share uses get_user_share
-        share_repository.get_user_share = AsyncMock(return_value=mock_share)
-        share_repository.session.delete = AsyncMock()
+        mock_result = Mock()
+        mock_result.scalar_one_or_none.return_value = recipient_id
+        share_repository.session.execute = AsyncMock(return_value=mock_result)
         share_repository.session.commit = AsyncMock()
 
         result = await share_repository.delete_share(share_id, user_id)
 
-        assert result is True
-        share_repository.session.delete.assert_called_once_with(mock_share)
+        assert result == recipient_id
+        # One statement: the row is not loaded before it is deleted
+        share_repository.session.execute.assert_called_once()
         share_repository.session.commit.assert_called_once()
 
     @pytest.mark.asyncio
@@ -215,12 +214,15 @@ class TestShareRepositoryCoverage:
         """Test delete share when not found."""
         share_id = uuid.uuid4()
 
-        # Mock get_user_share to return None
-        share_repository.get_user_share = AsyncMock(return_value=None)
+        mock_result = Mock()
+        mock_result.scalar_one_or_none.return_value = None
+        share_repository.session.execute = AsyncMock(return_value=mock_result)
+        share_repository.session.commit = AsyncMock()
 
         result = await share_repository.delete_share(share_id, user_id)
 
-        assert result is False
+        assert result is None
+        share_repository.session.commit.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_check_existing_share(self, share_repository, user_id, note_id):
@@ -46,11 +46,11 @@ class TestTagSearchRegression:
 
         # Mock SQL result
         mock_result = Mock()
-        mock_result.scalars.return_value = [mock_note]
+        mock_result.all.return_value = [Mock(Note=mock_note, total=1)]
         note_repository.session.execute = AsyncMock(return_value=mock_result)
 
         # ACT: Search with tag filter (this should work!)
-        results = await note_repository.search_notes(
+        results, total = await note_repository.search_notes(
             user_id=user_id,
             query="meeting",
             tag_filter=["work"]
@@ -77,11 +77,11 @@ class TestTagSearchRegression:
         mock_note.tags = []
 
         mock_result = Mock()
-        mock_result.scalars.return_value = [mock_note]
+        mock_result.all.return_value = [Mock(Note=mock_note, total=1)]
         note_repository.session.execute = AsyncMock(return_value=mock_result)
 
         # ACT: Search without tag filter
-        results = await note_repository.search_notes(
+        results, total = await note_repository.search_notes(
             user_id=user_id,
             query="content",
             tag_filter=None
@@ -99,7 +99,7 @@ class TestTagSearchRegression:
         # when combining shared notes access with tag filtering
 
         mock_result = Mock()
-        mock_result.scalars.return_value = []
+        mock_result.all.return_value = []
         note_repository.session.execute = AsyncMock(return_value=mock_result)
 
         # This should not raise an SQL error
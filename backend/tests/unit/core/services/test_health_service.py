@@ -1,6 +1,8 @@
 import asyncio
+from types import SimpleNamespace
 
 import pytest
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
 
 from src.notemesh.core.services.health_service import HealthService
 
@@ -88,3 +90,26 @@ async def test_get_health_status_redis_down(monkeypatch):
     assert resp.status == "unhealthy"
     assert resp.checks["database"]["connected"] is True
     assert resp.checks["redis"]["connected"] is False
+
+
+@pytest.mark.asyncio
+async def test_get_system_metrics_reports_pool_usage():
+    session = FakeSession(ok=True)
+    session.bind = SimpleNamespace(pool=QueuePool(lambda: None, pool_size=5))
+    svc = HealthService(session)
+
+    metrics = await svc.get_system_metrics()
+    assert metrics["active_connections"] == 0
+    assert "Pool size" in metrics["db_pool"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pool_class", [StaticPool, NullPool])
+async def test_get_system_metrics_omits_pool_usage_without_checkouts(pool_class):
+    session = FakeSession(ok=True)
+    session.bind = SimpleNamespace(pool=pool_class(lambda: None))
+    svc = HealthService(session)
+
+    metrics = await svc.get_system_metrics()
+    assert "active_connections" not in metrics
+    assert "db_pool" not in metrics
@@ -1,11 +1,14 @@
-"""Unit tests for NoteService.get_note shared-access behavior."""
+"""Unit tests for NoteService shared-access behavior."""
 
 import uuid
 from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
 import pytest
 
 from fastapi import HTTPException
 
+import src.notemesh.core.redis_client as redis_client_module
 from src.notemesh.core.services.note_service import NoteService
 
 
@@ -157,3 +160,41 @@ async def test_get_note_no_access_returns_404(monkeypatch):
 
     assert exc.value.status_code == 404
     assert exc.value.detail == "Note not found"
+
+
+@pytest.mark.asyncio
+async def test_delete_note_invalidates_recipient_searches(monkeypatch):
+    session = object()
+    svc = NoteService(session)  # type: ignore[arg-type]
+
+    owner_id = uuid.uuid4()
+    recipient_id = uuid.uuid4()
+    note_id = uuid.uuid4()
+    calls = []
+
+    async def fake_get_note_recipient_ids(self, nid):
+        calls.append("recipients")
+        return [recipient_id]
+
+    async def fake_delete_note(self, nid, uid):
+        calls.append("delete")
+        return True
+
+    monkeypatch.setattr(
+        svc.share_repo,
+        "get_note_recipient_ids",
+        fake_get_note_recipient_ids.__get__(svc.share_repo, type(svc.share_repo)),
+    )
+    monkeypatch.setattr(
+        svc.note_repo,
+        "delete_note",
+        fake_delete_note.__get__(svc.note_repo, type(svc.note_repo)),
+    )
+    redis_client = AsyncMock()
+    monkeypatch.setattr(redis_client_module, "get_redis_client", lambda: redis_client)
+
+    assert await svc.delete_note(note_id, owner_id) is True
+
+    # Recipients are looked up before their shares cascade away with the note
+    assert calls == ["recipients", "delete"]
+    redis_client.bump_search_versions.assert_awaited_once_with([owner_id, recipient_id])
@@ -28,10 +28,15 @@ class FakeNoteRepo:
             )
         ]
 
-    async def search_notes(self, user_id=None, query=None, tag_filter=None):
-        return self.notes
+    async def search_notes(
+        self, user_id=None, query=None, tag_filter=None, tag_id_filter=None, limit=None, offset=0
+    ):
+        return self.notes, len(self.notes)
 
-    async def get_user_tags(self, uid):
+    async def get_tag_ids_by_names(self, names):
+        return {}
+
+    async def get_user_tag_names(self, uid):
         return self.tags
 
 
@@ -7,7 +7,7 @@ from unittest.mock import AsyncMock
 import pytest
 
 from src.notemesh.core.schemas.notes import NoteSearchRequest
-from src.notemesh.core.services.search_service import SearchService
+from src.notemesh.core.services.search_service import SearchService, _elapsed_ms
 
 
 class DummyNote:
@@ -23,13 +23,21 @@ class DummyNote:
 
 
 @pytest.fixture
-def service():
+def service(monkeypatch):
     s = SearchService(None)  # No DB session to avoid user/share repo lookups
-    # Replace repos/clients with mocks
+    # Replace repos/clients with mocks; the Redis client is a shared singleton,
+    # so patch it through monkeypatch to keep other tests unaffected
     s.note_repo = AsyncMock()
-    s.redis_client.get_cached_search = AsyncMock()
-    s.redis_client.search_notes = AsyncMock()
-    s.redis_client.cache_search_results = AsyncMock()
+    s.note_repo.get_tag_ids_by_names.return_value = {}
+    for name in (
+        "get_cached_search",
+        "search_notes",
+        "cache_search_results",
+        "get_tag_ids",
+        "cache_tag_ids",
+    ):
+        monkeypatch.setattr(s.redis_client, name, AsyncMock())
+    s.redis_client.get_tag_ids.return_value = {}
     return s
 
 
@@ -45,6 +53,31 @@ async def test_early_return_no_query_no_tags(service):
     assert resp.filters_applied == {"tag_filter": []}
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("query", [None, "", "   ", "*"])
+async def test_blank_query_without_tags_skips_redis_and_db(service, query):
+    req = NoteSearchRequest(query=query, tags=None, page=1, per_page=20)
+
+    resp = await service.search_notes(uuid.uuid4(), req)
+
+    assert resp.total == 0 and resp.query == query
+    service.redis_client.get_cached_search.assert_not_called()
+    service.redis_client.search_notes.assert_not_called()
+    service.note_repo.search_notes.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_blank_query_with_tags_still_searches_by_tag(service):
+    req = NoteSearchRequest(query=None, tags=["work"], page=1, per_page=20)
+    service.redis_client.get_cached_search.return_value = None
+    service.redis_client.search_notes.return_value = []
+    service.note_repo.search_notes.return_value = ([], 0)
+
+    await service.search_notes(uuid.uuid4(), req)
+
+    assert service.note_repo.search_notes.call_args.kwargs["query"] == ""
+
+
 @pytest.mark.asyncio
 async def test_cache_hit_returns_cached_response(service):
     user_id = uuid.uuid4()
@@ -77,16 +110,23 @@ async def test_redis_results_path_fetches_notes_by_id(service):
     req = NoteSearchRequest(query="redis path", tags=[], page=1, per_page=20)
 
     service.redis_client.get_cached_search.return_value = None
-    service.redis_client.search_notes.return_value = [{"note_id": str(uuid.uuid4())}]
+    note_ids = [uuid.uuid4(), uuid.uuid4()]
+    service.redis_client.search_notes.return_value = [
+        {"note_id": str(note_ids[0])},
+        {"note_id": "not-a-uuid"},
+        {"note_id": str(note_ids[1])},
+    ]
 
     dummy = DummyNote(owner_id=user_id)
-    service.note_repo.get_by_id = AsyncMock(return_value=dummy)
+    service.note_repo.get_many_by_ids = AsyncMock(return_value=[dummy])
 
     resp = await service.search_notes(user_id, req)
 
-    service.note_repo.get_by_id.assert_called_once()
+    # One batched fetch; invalid ids are dropped before hitting the DB
+    service.note_repo.get_many_by_ids.assert_awaited_once_with(note_ids)
     service.note_repo.search_notes.assert_not_called()
-    assert resp.total == 1
+    # The total counts Redis hits, not just the notes loaded for this page
+    assert resp.total == 2
     assert len(resp.items) == 1
 
 
@@ -99,7 +139,7 @@ async def test_db_fallback_when_no_redis_results(service):
     service.redis_client.search_notes.return_value = []
 
     dummy = DummyNote(owner_id=user_id)
-    service.note_repo.search_notes = AsyncMock(return_value=[dummy])
+    service.note_repo.search_notes = AsyncMock(return_value=([dummy], 1))
 
     resp = await service.search_notes(user_id, req)
 
@@ -107,3 +147,69 @@ async def test_db_fallback_when_no_redis_results(service):
     assert resp.total == 1
     assert len(resp.items) == 1
     service.redis_client.cache_search_results.assert_awaited()
+
+
+@pytest.mark.asyncio
+async def test_pagination_converts_only_requested_page(service):
+    user_id = uuid.uuid4()
+    req = NoteSearchRequest(query="paged", tags=[], page=2, per_page=2)
+
+    service.redis_client.get_cached_search.return_value = None
+    service.redis_client.search_notes.return_value = []
+
+    notes = [DummyNote(owner_id=user_id) for _ in range(5)]
+    service.note_repo.search_notes = AsyncMock(return_value=(notes[2:4], 5))
+    service.user_repo = AsyncMock()
+    service.user_repo.get_by_id.return_value = None
+
+    resp = await service.search_notes(user_id, req)
+
+    # The page is cut in SQL; the service only forwards limit/offset
+    assert service.note_repo.search_notes.call_args.kwargs["limit"] == 2
+    assert service.note_repo.search_notes.call_args.kwargs["offset"] == 2
+    assert [item.id for item in resp.items] == [notes[2].id, notes[3].id]
+    assert resp.total == 5
+    assert resp.pages == 3
+    assert resp.has_next is True and resp.has_prev is True
+    # Owner lookups only happen for the notes on the returned page
+    assert service.user_repo.get_by_id.await_count == 2
+
+
+def test_elapsed_ms_uses_perf_counter_ns(monkeypatch):
+    monkeypatch.setattr(
+        "src.notemesh.core.services.search_service.time.perf_counter_ns", lambda: 3_500_000
+    )
+
+    assert _elapsed_ms(1_000_000) == 2.5
+
+
+@pytest.mark.asyncio
+async def test_resolve_tag_ids_uses_cache_before_db(service):
+    work_id, home_id = uuid.uuid4(), uuid.uuid4()
+    service.redis_client.get_tag_ids.return_value = {"work": work_id, "home": None}
+    service.note_repo.get_tag_ids_by_names.return_value = {"home": home_id}
+
+    ids = await service._resolve_tag_ids(["work", "home"])
+
+    assert ids == [work_id, home_id]
+    # One cache lookup for all names; only the miss goes to the database, and gets cached
+    service.redis_client.get_tag_ids.assert_awaited_once_with(["work", "home"])
+    service.note_repo.get_tag_ids_by_names.assert_awaited_once_with(["home"])
+    service.redis_client.cache_tag_ids.assert_awaited_once()
+    assert service.redis_client.cache_tag_ids.call_args.args[0] == {"home": home_id}
+
+
+@pytest.mark.asyncio
+async def test_redis_results_path_fetches_only_requested_page(service):
+    user_id = uuid.uuid4()
+    req = NoteSearchRequest(query="redis paged", tags=[], page=2, per_page=2)
+
+    service.redis_client.get_cached_search.return_value = None
+    note_ids = [uuid.uuid4() for _ in range(5)]
+    service.redis_client.search_notes.return_value = [{"note_id": str(nid)} for nid in note_ids]
+    service.note_repo.get_many_by_ids = AsyncMock(return_value=[])
+
+    resp = await service.search_notes(user_id, req)
+
+    service.note_repo.get_many_by_ids.assert_awaited_once_with(note_ids[2:4])
+    assert resp.total == 5 and resp.pages == 3
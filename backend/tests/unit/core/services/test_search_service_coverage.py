@@ -29,6 +29,16 @@ class TestSearchServiceCoverage:
         """Sample user ID."""
         return uuid.uuid4()
 
+    def test_repositories_built_once_per_service(self, mock_session):
+        """Test user/share repositories are created in __init__ only with a session."""
+        service = SearchService(mock_session)
+        assert service.user_repo.session is mock_session
+        assert service.share_repo.session is mock_session
+
+        no_session = SearchService(None)
+        assert no_session.user_repo is None
+        assert no_session.share_repo is None
+
     @pytest.mark.asyncio
     async def test_index_note(self, search_service):
         """Test index note functionality."""
@@ -74,7 +84,7 @@ class TestSearchServiceCoverage:
     async def test_suggest_tags_with_matches(self, search_service, user_id):
         """Test suggest tags with matching tags."""
         all_tags = ["work", "workshop", "personal", "project"]
-        search_service.note_repo.get_user_tags = AsyncMock(return_value=all_tags)
+        search_service.note_repo.get_user_tag_names = AsyncMock(return_value=all_tags)
 
         result = await search_service.suggest_tags(user_id, "wor", 10)
 
@@ -87,19 +97,43 @@ class TestSearchServiceCoverage:
     async def test_suggest_tags_sorting(self, search_service, user_id):
         """Test suggest tags sorting (exact match first, then starts with, then contains)."""
         all_tags = ["networking", "work", "homework", "workshop"]
-        search_service.note_repo.get_user_tags = AsyncMock(return_value=all_tags)
+        search_service.note_repo.get_user_tag_names = AsyncMock(return_value=all_tags)
 
         result = await search_service.suggest_tags(user_id, "work", 10)
 
         # "work" (exact match) should come first
         assert result[0] == "work"
 
+    @pytest.mark.asyncio
+    async def test_suggest_tags_cache_hit(self, search_service, user_id):
+        """Test cached tag suggestions are decoded without touching the DB."""
+        search_service.redis_client = Mock()
+        search_service.redis_client.get = AsyncMock(return_value='["work", "workshop"]')
+
+        result = await search_service.suggest_tags(user_id, "work", 10)
+
+        assert result == ["work", "workshop"]
+        search_service.note_repo.get_user_tag_names.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_search_stats_cache_hit(self, search_service, user_id):
+        """Test cached search stats are decoded without touching the DB."""
+        search_service.redis_client = Mock()
+        search_service.redis_client.get = AsyncMock(
+            return_value=b'{"total_notes": 3, "total_tags": 1}'
+        )
+
+        result = await search_service.get_search_stats(user_id)
+
+        assert result == {"total_notes": 3, "total_tags": 1}
+        search_service.note_repo.count_user_notes.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_get_search_stats(self, search_service, user_id):
         """Test get search stats."""
         all_tags = ["work", "personal", "meeting"]
-        search_service.note_repo.get_user_tags = AsyncMock(return_value=all_tags)
-        search_service.note_repo.list_user_notes = AsyncMock(return_value=([], 15))
+        search_service.note_repo.get_user_tag_names = AsyncMock(return_value=all_tags)
+        search_service.note_repo.count_user_notes = AsyncMock(return_value=15)
 
         result = await search_service.get_search_stats(user_id)
 
@@ -109,46 +143,29 @@ class TestSearchServiceCoverage:
         assert result["searchable_content"] is True
 
     @pytest.mark.asyncio
-    async def test_get_note_sharing_info_exception(self, search_service, user_id):
-        """Test _get_note_sharing_info with exception."""
-        note_id = uuid.uuid4()
-
+    async def test_get_share_counts_exception(self, search_service, user_id):
+        """Test _get_share_counts with exception."""
         # Create a mock share repo that raises an exception
         mock_share_repo = Mock()
-        mock_share_repo.list_shares_given = AsyncMock(side_effect=Exception("DB Error"))
+        mock_share_repo.count_active_shares_by_note = AsyncMock(side_effect=Exception("DB Error"))
 
-        result = await search_service._get_note_sharing_info(mock_share_repo, note_id, user_id)
+        result = await search_service._get_share_counts(mock_share_repo, [uuid.uuid4()], user_id)
 
-        # Should return fallback values on exception
-        assert result["is_shared_by_user"] is False
-        assert result["share_count"] == 0
-        assert result["shared_with"] == []
+        # Should report every note as unshared on exception
+        assert result == {}
 
     @pytest.mark.asyncio
-    async def test_get_note_sharing_info_success(self, search_service, user_id):
-        """Test _get_note_sharing_info success case."""
-        note_id = uuid.uuid4()
-
-        # Create mock shares
-        mock_share1 = Mock()
-        mock_share1.note_id = note_id
-        mock_share1.is_active = True
-        mock_share1.shared_with_username = "user1"
-
-        mock_share2 = Mock()
-        mock_share2.note_id = note_id
-        mock_share2.is_active = True
-        mock_share2.shared_with_username = "user2"
+    async def test_get_share_counts_success(self, search_service, user_id):
+        """Test _get_share_counts asks for the whole page in one call."""
+        note_ids = [uuid.uuid4(), uuid.uuid4()]
 
         mock_share_repo = Mock()
-        mock_share_repo.list_shares_given = AsyncMock(return_value=([mock_share1, mock_share2], 2))
+        mock_share_repo.count_active_shares_by_note = AsyncMock(return_value={note_ids[0]: 2})
 
-        result = await search_service._get_note_sharing_info(mock_share_repo, note_id, user_id)
+        result = await search_service._get_share_counts(mock_share_repo, note_ids, user_id)
 
-        assert result["is_shared_by_user"] is True
-        assert result["share_count"] == 2
-        assert "user1" in result["shared_with"]
-        assert "user2" in result["shared_with"]
+        assert result == {note_ids[0]: 2}
+        mock_share_repo.count_active_shares_by_note.assert_awaited_once_with(user_id, note_ids)
 
     @pytest.mark.asyncio
     async def test_search_notes_with_session_none(self, user_id):
@@ -165,7 +182,7 @@ class TestSearchServiceCoverage:
         mock_note.updated_at = datetime.now(timezone.utc)
         mock_note.tags = []
 
-        service.note_repo.search_notes = AsyncMock(return_value=[mock_note])
+        service.note_repo.search_notes = AsyncMock(return_value=([mock_note], 1))
 
         request = NoteSearchRequest(query="test", page=1, per_page=20)
         result = await service.search_notes(user_id, request)
@@ -66,7 +66,7 @@ class TestSearchServiceOwnership:
     ):
         """Test that owned notes show correct ownership in search results."""
         # Setup
-        search_service.note_repo.search_notes.return_value = [mock_owned_note]
+        search_service.note_repo.search_notes.return_value = ([mock_owned_note], 1)
 
         request = NoteSearchRequest(
             query="note",
@@ -94,7 +94,7 @@ class TestSearchServiceOwnership:
     ):
         """Test that shared notes show correct ownership in search results."""
         # Setup
-        search_service.note_repo.search_notes.return_value = [mock_shared_note]
+        search_service.note_repo.search_notes.return_value = ([mock_shared_note], 1)
 
         request = NoteSearchRequest(
             query="note",
@@ -122,7 +122,7 @@ class TestSearchServiceOwnership:
     ):
         """Test that search with mixed owned/shared notes shows correct ownership."""
         # Setup
-        search_service.note_repo.search_notes.return_value = [mock_owned_note, mock_shared_note]
+        search_service.note_repo.search_notes.return_value = ([mock_owned_note, mock_shared_note], 2)
 
         request = NoteSearchRequest(
             query="note",
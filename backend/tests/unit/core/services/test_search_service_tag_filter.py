@@ -9,6 +9,13 @@ from src.notemesh.core.services.search_service import SearchService
 from src.notemesh.core.schemas.notes import NoteSearchRequest
 
 
+TAG_IDS = {"work": uuid.uuid4(), "personal": uuid.uuid4(), "important": uuid.uuid4()}
+
+
+def _known_tag_ids(names):
+    return {name: TAG_IDS[name] for name in names if name in TAG_IDS}
+
+
 class TestSearchServiceTagFilter:
     """Test search service tag filtering functionality."""
 
@@ -22,6 +29,7 @@ class TestSearchServiceTagFilter:
         """Create search service with mocked dependencies."""
         service = SearchService(mock_session)
         service.note_repo = AsyncMock()
+        service.note_repo.get_tag_ids_by_names.side_effect = _known_tag_ids
         return service
 
     @pytest.fixture
@@ -92,7 +100,7 @@ class TestSearchServiceTagFilter:
         work_filtered_notes = [mock_note_with_work_tag]  # Only work-tagged note
 
         # Mock repository to return work-tagged note when filtering by "work"
-        search_service.note_repo.search_notes.return_value = work_filtered_notes
+        search_service.note_repo.search_notes.return_value = (work_filtered_notes, len(work_filtered_notes))
 
         request = NoteSearchRequest(
             query="meeting",  # Text that should match
@@ -108,7 +116,9 @@ class TestSearchServiceTagFilter:
         search_service.note_repo.search_notes.assert_called_once_with(
             user_id=user_id,
             query="meeting",
-            tag_filter=["work"]
+            tag_id_filter=[TAG_IDS["work"]],
+            limit=20,
+            offset=0
         )
 
         assert response.total == 1
@@ -123,7 +133,7 @@ class TestSearchServiceTagFilter:
     ):
         """Test search with multiple tag filters."""
         # Arrange
-        search_service.note_repo.search_notes.return_value = [mock_note_with_work_tag]
+        search_service.note_repo.search_notes.return_value = ([mock_note_with_work_tag], 1)
 
         request = NoteSearchRequest(
             query="meeting",
@@ -139,7 +149,9 @@ class TestSearchServiceTagFilter:
         search_service.note_repo.search_notes.assert_called_once_with(
             user_id=user_id,
             query="meeting",
-            tag_filter=["work", "important"]
+            tag_id_filter=[TAG_IDS["work"], TAG_IDS["important"]],
+            limit=20,
+            offset=0
         )
 
     @pytest.mark.asyncio
@@ -149,7 +161,7 @@ class TestSearchServiceTagFilter:
         """Test search without tag filter returns all text-matching notes."""
         # Arrange
         all_matching_notes = [mock_note_with_work_tag, mock_note_with_personal_tag]
-        search_service.note_repo.search_notes.return_value = all_matching_notes
+        search_service.note_repo.search_notes.return_value = (all_matching_notes, len(all_matching_notes))
 
         request = NoteSearchRequest(
             query="note",  # Generic text that matches both
@@ -165,7 +177,9 @@ class TestSearchServiceTagFilter:
         search_service.note_repo.search_notes.assert_called_once_with(
             user_id=user_id,
             query="note",
-            tag_filter=None
+            tag_id_filter=None,
+            limit=20,
+            offset=0
         )
 
         assert response.total == 2
@@ -177,7 +191,7 @@ class TestSearchServiceTagFilter:
     ):
         """Test that empty tag list is treated as no filter."""
         # Arrange
-        search_service.note_repo.search_notes.return_value = [mock_note_with_work_tag]
+        search_service.note_repo.search_notes.return_value = ([mock_note_with_work_tag], 1)
 
         request = NoteSearchRequest(
             query="meeting",
@@ -193,7 +207,9 @@ class TestSearchServiceTagFilter:
         search_service.note_repo.search_notes.assert_called_once_with(
             user_id=user_id,
             query="meeting",
-            tag_filter=[]
+            tag_id_filter=None,
+            limit=20,
+            offset=0
         )
 
     @pytest.mark.asyncio
@@ -202,7 +218,7 @@ class TestSearchServiceTagFilter:
     ):
         """Test search with non-existent tag returns empty results."""
         # Arrange
-        search_service.note_repo.search_notes.return_value = []  # No matching notes
+        search_service.note_repo.search_notes.return_value = ([], 0)  # No matching notes
 
         request = NoteSearchRequest(
             query="meeting",
@@ -214,6 +230,13 @@ class TestSearchServiceTagFilter:
         # Act
         response = await search_service.search_notes(user_id, request)
 
-        # Assert
+        # Assert: unknown names resolve to no ids, which matches nothing
+        search_service.note_repo.search_notes.assert_called_once_with(
+            user_id=user_id,
+            query="meeting",
+            tag_id_filter=[],
+            limit=20,
+            offset=0
+        )
         assert response.total == 0
         assert len(response.items) == 0
\ No newline at end of file
@@ -44,12 +44,8 @@ class TestSharingConsistency:
         This ensures consistent behavior with NoteService.get_note() and prevents
         information leakage about note existence.
         """
-        # Arrange: No access to non-existent note
-        sharing_service.share_repo.check_note_access.return_value = {
-            "can_read": False,
-            "can_write": False,
-            "is_owner": False
-        }
+        # Arrange: Non-existent note
+        sharing_service.note_repo.get_note_with_owner_and_access.return_value = None
 
         # Act & Assert: Should raise 404, not 403
         # The current implementation incorrectly raises 403
@@ -70,12 +66,6 @@ class TestSharingConsistency:
     ):
         """Test that get_shared_note works when user has access."""
         # Arrange: User has read access
-        sharing_service.share_repo.check_note_access.return_value = {
-            "can_read": True,
-            "can_write": False,
-            "is_owner": False
-        }
-
         # Mock note exists
         mock_note = Mock()
         mock_note.id = nonexistent_note_id
@@ -87,13 +77,16 @@ class TestSharingConsistency:
         mock_note.created_at = "2025-09-14T23:00:00Z"
         mock_note.updated_at = "2025-09-14T23:00:00Z"
 
-        sharing_service.note_repo.get_by_id.return_value = mock_note
-
         # Mock owner info
         mock_owner = Mock()
         mock_owner.username = "owner_user"
         mock_owner.full_name = "Owner User"
-        sharing_service.user_repo.get_by_id.return_value = mock_owner
+
+        sharing_service.note_repo.get_note_with_owner_and_access.return_value = (
+            mock_note,
+            mock_owner,
+            Mock(permission="read"),
+        )
 
         # Act
         result = await sharing_service.get_shared_note(nonexistent_note_id, user_id)
@@ -1,9 +1,11 @@
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import pytest
 from fastapi import HTTPException
 
+from src.notemesh.core.models.share import Share, ShareStatus
+from src.notemesh.core.schemas.sharing import ShareListRequest, ShareListResponse, ShareRequest
 from src.notemesh.core.services.sharing_service import SharingService
 
 
@@ -18,14 +20,27 @@ class FakeShareRepo:
         self.deleted = []
         self.access = {}
 
-    async def create_share(self, data):
-        s = Dummy(
+    def _make_share(self, data):
+        now = datetime.now(timezone.utc)
+        owner = Dummy(username="owner", full_name="Owner")
+        return Dummy(
             id=uuid.uuid4(),
             note_id=data["note_id"],
-            note=Dummy(title="T"),
+            note=Dummy(
+                id=data["note_id"],
+                title="T",
+                content="c",
+                tags=[],
+                owner_id=data.get("shared_by_user_id"),
+                owner=owner,
+                created_at=now,
+                updated_at=now,
+            ),
+            shared_by_user=owner,
             shared_with_user=Dummy(
                 id=data.get("shared_with_user_id", uuid.uuid4()), username="u", full_name="U"
             ),
+            shared_with_user_id=data.get("shared_with_user_id"),
             permission=data.get("permission", "read"),
             share_message=data.get("share_message"),
             created_at=datetime.now(timezone.utc),
@@ -34,62 +49,49 @@ class FakeShareRepo:
             is_active=True,
             access_count=0,
         )
-        self.created.append(data)
-        return s
 
     async def delete_share(self, share_id, user_id):
         self.deleted.append((share_id, user_id))
-        return True
+        return uuid.uuid4()
 
     async def check_note_access(self, note_id, user_id):
         return self.access.get(
             (note_id, user_id), {"can_read": True, "can_write": False, "can_share": False}
         )
 
-    async def list_shares_given(self, user_id, page, per_page):
-        return [], 0
+    async def list_shares_given(self, user_id, page, per_page, cursor=None, with_count=False):
+        return [], 0 if with_count else None
+
+    async def list_shares_received(self, user_id, page, per_page, cursor=None, with_count=False):
+        return [], 0 if with_count else None
 
-    async def list_shares_received(self, user_id, page, per_page):
-        return [], 0
+    async def count_shares_given(self, user_id):
+        return 0
 
     async def get_share_stats(self, user_id):
         return {"shares_given": 1, "shares_received": 2, "unique_notes_shared": 1}
 
-    async def get_existing_share(self, note_id, shared_with_user_id):
-        # For testing, return None (no existing share)
-        return None
-
-    async def update_share(self, share_id, update_data):
-        # For testing, return a dummy updated share
-        return Dummy(
-            id=share_id,
-            note_id=uuid.uuid4(),
-            note=Dummy(title="T"),
-            shared_with_user=Dummy(id=uuid.uuid4(), username="u", full_name="U"),
-            permission=update_data.get("permission", "read"),
-            share_message=update_data.get("share_message"),
-            created_at=datetime.now(timezone.utc),
-            expires_at=None,
-            last_accessed_at=None,
-            is_active=True,
-            access_count=0,
-        )
+    async def upsert_shares(self, shares_data):
+        # For testing, every share is new
+        self.created.extend(shares_data)
+        return {d["shared_with_user_id"]: self._make_share(d) for d in shares_data}
 
 
 class FakeUserRepo:
     def __init__(self, users_by_name):
         self.users_by_name = users_by_name
 
-    async def get_by_username(self, username):
-        return self.users_by_name.get(username)
+    async def get_by_usernames(self, usernames):
+        return [self.users_by_name[u] for u in usernames if u in self.users_by_name]
 
     async def get_by_id(self, uid):
         return Dummy(username="owner", full_name="Owner")
 
 
 class FakeNoteRepo:
-    def __init__(self, notes):
+    def __init__(self, notes, shares=None):
         self.notes = notes
+        self.shares = shares or {}
 
     async def get_by_id_and_user(self, nid, uid):
         return self.notes.get((nid, uid))
@@ -97,6 +99,12 @@ class FakeNoteRepo:
     async def get_by_id(self, nid):
         return self.notes.get(nid)
 
+    async def get_note_with_owner_and_access(self, nid, uid):
+        note = self.notes.get(nid)
+        if not note:
+            return None
+        return note, Dummy(username="owner", full_name="Owner"), self.shares.get((nid, uid))
+
 
 @pytest.mark.asyncio
 async def test_share_note_happy_path(monkeypatch):
@@ -161,7 +169,6 @@ async def test_get_shared_note_permissions_and_owner(monkeypatch):
     user_id = uuid.uuid4()
     note_id = uuid.uuid4()
     fake_share = FakeShareRepo()
-    fake_share.access[(note_id, user_id)] = {"can_read": True, "can_write": True, "can_share": True}
     fake_users = FakeUserRepo({})
     now = datetime.now(timezone.utc)
     fake_notes = FakeNoteRepo(
@@ -176,7 +183,8 @@ async def test_get_shared_note_permissions_and_owner(monkeypatch):
                 updated_at=now,
                 hyperlinks=[],
             )
-        }
+        },
+        shares={(note_id, user_id): Dummy(permission="write")},
     )
 
     import src.notemesh.core.services.sharing_service as sh
@@ -187,7 +195,8 @@ async def test_get_shared_note_permissions_and_owner(monkeypatch):
     svc = SharingService(session=None)
 
     res = await svc.get_shared_note(note_id, user_id)
-    assert res.id == note_id and res.can_write is True and res.can_share is True
+    assert res.id == note_id and res.can_write is True and res.can_share is False
+    assert res.owner_username == "owner"
 
 
 @pytest.mark.asyncio
@@ -195,13 +204,11 @@ async def test_get_shared_note_forbidden(monkeypatch):
     user_id = uuid.uuid4()
     note_id = uuid.uuid4()
     fake_share = FakeShareRepo()
-    fake_share.access[(note_id, user_id)] = {
-        "can_read": False,
-        "can_write": False,
-        "can_share": False,
-    }
     fake_users = FakeUserRepo({})
-    fake_notes = FakeNoteRepo({})
+    # Note exists but is neither owned by nor shared with the user
+    fake_notes = FakeNoteRepo(
+        {note_id: Dummy(id=note_id, owner_id=uuid.uuid4(), title="N", content="c", tags=[])}
+    )
 
     import src.notemesh.core.services.sharing_service as sh
 
@@ -230,10 +237,97 @@ async def test_list_and_stats(monkeypatch):
     svc = SharingService(session=None)
 
     # list shares given default
-    req = Dummy(page=1, per_page=10, type="given")
+    req = Dummy(page=1, per_page=10, type="given", cursor=None, include_total=True)
     res = await svc.list_shares(user_id, req)
     assert res.total_count == 0 and res.page == 1 and res.per_page == 10
 
     # stats
     stats = await svc.get_share_stats(user_id)
     assert stats.shares_given == 1 and stats.shares_received == 2
+
+
+@pytest.mark.asyncio
+async def test_share_note_batches_new_and_existing_shares(
+    test_session, test_note, share_recipients
+):
+    """Sharing with several users creates new shares and updates existing ones in one pass."""
+    owner_id = test_note.owner_id
+    alice, bob = share_recipients[:2]
+
+    service = SharingService(test_session)
+    first = await service.share_note(
+        owner_id, ShareRequest(note_id=test_note.id, shared_with_usernames=[alice.username])
+    )
+    assert first[0].permission_level == "read"
+
+    # A revoked share is reactivated by the upsert
+    revoked = await test_session.get(Share, first[0].id)
+    revoked.status = ShareStatus.REVOKED.value
+    await test_session.commit()
+
+    second = await service.share_note(
+        owner_id,
+        ShareRequest(
+            note_id=test_note.id,
+            shared_with_usernames=[bob.username, alice.username],
+            permission_level="write",
+        ),
+    )
+
+    assert [s.shared_with_username for s in second] == [bob.username, alice.username]
+    assert all(s.permission_level == "write" for s in second)
+    assert second[1].id == first[0].id  # existing share updated, not duplicated
+    assert second[1].is_active is True
+
+
+@pytest.mark.parametrize("include_total", [True, False], ids=["with-total", "no-total"])
+async def test_list_shares_keyset_pagination_walks_all_pages(
+    test_session, share_listing, include_total
+):
+    """Following next_cursor visits every listed share exactly once, newest first."""
+    kind, viewer_id, expected = share_listing
+    expected_ids = [
+        share.id for share in sorted(expected, key=lambda s: (s.created_at, s.id), reverse=True)
+    ]
+
+    service = SharingService(test_session)
+    seen, cursor = [], None
+    while True:
+        page = await service.list_shares(
+            viewer_id,
+            ShareListRequest(type=kind, per_page=2, cursor=cursor, include_total=include_total),
+        )
+        assert page.total_count == (len(expected) if include_total else None)
+        seen.extend(s.id for s in page.shares)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == expected_ids
+
+    with pytest.raises(HTTPException) as exc:
+        await service.list_shares(viewer_id, ShareListRequest(type=kind, cursor="not-a-cursor"))
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize("include_total", [True, False], ids=["with-total", "no-total"])
+async def test_list_shares_responses_round_trip_through_schema(
+    test_session, test_note, share_recipients, share_listing, include_total
+):
+    """Listed share responses serialize and validate back against the schema."""
+    kind, viewer_id, expected = share_listing
+    for recipient in share_recipients:
+        recipient.full_name = None
+    test_note.content = "x" * 250
+    await test_session.commit()
+
+    page = await SharingService(test_session).list_shares(
+        viewer_id, ShareListRequest(type=kind, include_total=include_total)
+    )
+
+    validated = ShareListResponse.model_validate(page.model_dump())
+    assert validated.total_count == (len(expected) if include_total else None)
+    assert len(validated.shares) == len(expected)
+    for share in validated.shares:
+        assert share.shared_with_display_name == share.shared_with_username
+        assert share.note.content_preview == "x" * 200 + "..."
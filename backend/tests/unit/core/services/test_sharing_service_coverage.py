@@ -83,15 +83,16 @@ class TestSharingServiceCoverage:
         mock_share.message = None
 
         sharing_service.note_repo.get_by_id_and_user.return_value = mock_note
-        sharing_service.user_repo.get_by_username.return_value = mock_user
-        sharing_service.share_repo.get_existing_share.return_value = None
-        sharing_service.share_repo.create_share.return_value = mock_share
+        sharing_service.user_repo.get_by_usernames.return_value = [mock_user]
+        sharing_service.share_repo.upsert_shares.return_value = {shared_with_user_id: mock_share}
 
         # Avoid Pydantic conversion complexity
         sharing_service._share_to_response = lambda s: {"id": str(getattr(s, 'id', None))}
         result = await sharing_service.create_share(user_id, request)
-        assert result is not None
-        sharing_service.share_repo.create_share.assert_called_once()
+        assert result == {"id": str(mock_share.id)}
+        sharing_service.share_repo.upsert_shares.assert_called_once()
+        (rows,) = sharing_service.share_repo.upsert_shares.call_args.args
+        assert [d["shared_with_user_id"] for d in rows] == [shared_with_user_id]
 
     @pytest.mark.asyncio
     async def test_create_share_note_not_found(self, sharing_service, user_id):
@@ -153,7 +154,7 @@ class TestSharingServiceCoverage:
         mock_note.owner = mock_owner
 
         sharing_service.note_repo.get_by_id_and_user.return_value = mock_note
-        sharing_service.user_repo.get_by_username.return_value = None
+        sharing_service.user_repo.get_by_usernames.return_value = []
 
         from fastapi import HTTPException
         with pytest.raises(HTTPException) as exc:
@@ -191,19 +192,29 @@ class TestSharingServiceCoverage:
         mock_user.username = "testuser"
         mock_user.full_name = "Test User"
 
-        mock_existing_share = Mock()
+        mock_existing_share = Mock(id=uuid.uuid4())
 
         sharing_service.note_repo.get_by_id_and_user.return_value = mock_note
-        sharing_service.user_repo.get_by_username.return_value = mock_user
-        sharing_service.share_repo.get_existing_share.return_value = mock_existing_share
+        sharing_service.user_repo.get_by_usernames.return_value = [mock_user]
+        sharing_service.share_repo.upsert_shares.return_value = {
+            shared_with_user_id: mock_existing_share
+        }
 
-        # When existing share exists, service updates it and returns response
+        # When existing share exists, the upsert updates it and returns response
         sharing_service._share_to_response = lambda s: {"id": str(getattr(s, 'id', None))}
-        sharing_service.share_repo.update_share.return_value = Mock(id=uuid.uuid4())
         result = await sharing_service.create_share(user_id, request)
-        assert result is not None
-        sharing_service.share_repo.update_share.assert_called_once()
-        sharing_service.share_repo.create_share.assert_not_called()
+        assert result == {"id": str(mock_existing_share.id)}
+        (rows,) = sharing_service.share_repo.upsert_shares.call_args.args
+        assert rows == [
+            {
+                "note_id": note_id,
+                "shared_by_user_id": user_id,
+                "shared_with_user_id": shared_with_user_id,
+                "permission": "read",
+                "share_message": None,
+                "expires_at": None,
+            }
+        ]
 
     @pytest.mark.asyncio
     async def test_update_share_status(self, sharing_service, user_id):
@@ -230,7 +241,7 @@ class TestSharingServiceCoverage:
     async def test_delete_share_success(self, sharing_service, user_id):
         """Test successful share deletion."""
         share_id = uuid.uuid4()
-        sharing_service.share_repo.delete_share.return_value = True
+        sharing_service.share_repo.delete_share.return_value = uuid.uuid4()
         result = await sharing_service.delete_share(user_id, share_id)
         assert result is True
         sharing_service.share_repo.delete_share.assert_called_once_with(share_id, user_id)
@@ -239,7 +250,7 @@ class TestSharingServiceCoverage:
     async def test_delete_share_not_found(self, sharing_service, user_id):
         """Test share deletion when share not found."""
         share_id = uuid.uuid4()
-        sharing_service.share_repo.delete_share.return_value = False
+        sharing_service.share_repo.delete_share.return_value = None
         result = await sharing_service.delete_share(user_id, share_id)
         assert result is False
 
@@ -259,7 +270,7 @@ class TestSharingServiceCoverage:
         mock_shares = [Mock(), Mock()]
         total = 2
         # Return a valid ShareResponse to satisfy Pydantic validation
-        sharing_service._share_to_response = lambda s: ShareResponse(
+        sharing_service._share_to_response = lambda s, direction=None: ShareResponse(
             id=uuid.uuid4(),
             note_id=uuid.uuid4(),
             note_title="Note",
@@ -275,13 +286,93 @@ class TestSharingServiceCoverage:
             is_active=True,
             access_count=0,
         )
-        sharing_service.share_repo.list_shares_given.return_value = (mock_shares, total)
+        sharing_service.share_repo.list_shares_given.return_value = (mock_shares, None)
+        sharing_service.share_repo.count_shares_given.return_value = total
         from src.notemesh.core.schemas.sharing import ShareListRequest
-        request = ShareListRequest(page=1, per_page=20, type="given")
+        request = ShareListRequest(page=1, per_page=20, type="given", include_total=True)
         resp = await sharing_service.get_shares_given(user_id, request)
         assert resp.total_count == total
         assert len(resp.shares) == len(mock_shares)
-        sharing_service.share_repo.list_shares_given.assert_called_once_with(user_id, 1, 20)
+        sharing_service.share_repo.list_shares_given.assert_called_once_with(
+            user_id, 1, 20, cursor=None, with_count=False
+        )
+
+    @pytest.mark.asyncio
+    async def test_list_shares_skips_count_by_default(self, sharing_service, user_id):
+        """Test totals are not computed unless requested."""
+        sharing_service.share_repo.list_shares_given.return_value = ([], None)
+        from src.notemesh.core.schemas.sharing import ShareListRequest
+
+        resp = await sharing_service.list_shares(user_id, ShareListRequest(type="given"))
+
+        assert resp.total_count is None and resp.total_pages is None
+        sharing_service.share_repo.count_shares_given.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_share_count_served_from_cache(self, sharing_service, user_id):
+        """Test cached share counts skip the COUNT query."""
+        sharing_service.redis_client = AsyncMock()
+        sharing_service.redis_client.get.return_value = "7"
+
+        count = await sharing_service._get_share_count(user_id, "received")
+
+        assert count == 7
+        sharing_service.redis_client.get.assert_awaited_once_with(f"shares_count:{user_id}:received")
+        sharing_service.share_repo.count_shares_received.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_revoke_share_invalidates_share_caches(self, sharing_service, user_id):
+        """Test revoking a share drops cached counts and stats for both users."""
+        recipient_id = uuid.uuid4()
+        sharing_service.redis_client = AsyncMock()
+        sharing_service.share_repo.delete_share.return_value = recipient_id
+
+        assert await sharing_service.revoke_share(user_id, uuid.uuid4()) is True
+
+        # Every key goes in a single DEL
+        sharing_service.redis_client.delete_many.assert_awaited_once()
+        deleted = set(sharing_service.redis_client.delete_many.await_args.args[0])
+        assert deleted == {
+            f"shares_count:{user_id}:given",
+            f"shares_count:{user_id}:all",
+            f"share_stats:{user_id}",
+            f"shares_count:{recipient_id}:received",
+            f"shares_count:{recipient_id}:all",
+            f"share_stats:{recipient_id}",
+        }
+        # The recipient lost access, so their cached searches are stale too
+        sharing_service.redis_client.bump_search_versions.assert_awaited_once_with([recipient_id])
+
+    @pytest.mark.asyncio
+    async def test_share_stats_served_from_cache(self, sharing_service, user_id):
+        """Test cached share stats skip the aggregate queries."""
+        sharing_service.redis_client = AsyncMock()
+        sharing_service.redis_client.get.return_value = (
+            '{"shares_given": 3, "shares_received": 1, "unique_notes_shared": 2}'
+        )
+
+        stats = await sharing_service.get_share_stats(user_id)
+
+        assert (stats.shares_given, stats.shares_received, stats.unique_notes_shared) == (3, 1, 2)
+        sharing_service.redis_client.get.assert_awaited_once_with(f"share_stats:{user_id}")
+        sharing_service.share_repo.get_share_stats.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_share_stats_cached_on_miss(self, sharing_service, user_id):
+        """Test share stats are computed and cached on a cache miss."""
+        sharing_service.redis_client = AsyncMock()
+        sharing_service.redis_client.get.return_value = None
+        sharing_service.share_repo.get_share_stats.return_value = {
+            "shares_given": 1,
+            "shares_received": 0,
+            "unique_notes_shared": 1,
+        }
+
+        stats = await sharing_service.get_share_stats(user_id)
+
+        assert stats.shares_given == 1
+        sharing_service.redis_client.set.assert_awaited_once()
+        assert sharing_service.redis_client.set.await_args.kwargs["expire"] == 120
 
     @pytest.mark.asyncio
     async def test_get_shares_received(self, sharing_service, user_id):
@@ -289,7 +380,7 @@ class TestSharingServiceCoverage:
         mock_shares = [Mock()]
         total = 1
         # Return a valid ShareResponse to satisfy Pydantic validation
-        sharing_service._share_to_response = lambda s: ShareResponse(
+        sharing_service._share_to_response = lambda s, direction=None: ShareResponse(
             id=uuid.uuid4(),
             note_id=uuid.uuid4(),
             note_title="Note",
@@ -305,13 +396,16 @@ class TestSharingServiceCoverage:
             is_active=True,
             access_count=0,
         )
-        sharing_service.share_repo.list_shares_received.return_value = (mock_shares, total)
+        sharing_service.share_repo.list_shares_received.return_value = (mock_shares, None)
+        sharing_service.share_repo.count_shares_received.return_value = total
         from src.notemesh.core.schemas.sharing import ShareListRequest
-        request = ShareListRequest(page=1, per_page=20, type="received")
+        request = ShareListRequest(page=1, per_page=20, type="received", include_total=True)
         resp = await sharing_service.get_shares_received(user_id, request)
         assert resp.total_count == total
         assert len(resp.shares) == len(mock_shares)
-        sharing_service.share_repo.list_shares_received.assert_called_once_with(user_id, 1, 20)
+        sharing_service.share_repo.list_shares_received.assert_called_once_with(
+            user_id, 1, 20, cursor=None, with_count=False
+        )
 
     @pytest.mark.asyncio
     async def test_get_note_shares(self, sharing_service, user_id, note_id):
@@ -101,6 +101,7 @@ class TestSharingServiceDashboard:
         share.created_at = now  # Use created_at instead of shared_at
         share.shared_at = now
         share.expires_at = None
+        share.last_accessed_at = None
         share.is_active = True
         share.access_count = 0
         share.share_message = None
@@ -244,4 +244,54 @@ class TestRedisBlacklistManagement:
         assert len(redis_client.add_to_blacklist.call_args_list) == 3
         assert results["jwt-1"] is True   # Blacklisted
         assert results["jwt-2"] is False  # Not blacklisted
-        assert results["jwt-3"] is True   # Blacklisted
\ No newline at end of file
+        assert results["jwt-3"] is True   # Blacklisted
+    @pytest.mark.asyncio
+    async def test_logout_enforced_after_redis_recovers_from_failed_startup(self):
+        """Test che il logout venga applicato se Redis torna dopo un avvio fallito."""
+        import redis.asyncio as redis_asyncio
+
+        from src.notemesh.security.jwt import create_access_token
+
+        class FlakyRedis:
+            """Redis down at startup, back up afterwards."""
+
+            def __init__(self):
+                self.down = True
+                self.data = {}
+
+            def _check(self):
+                if self.down:
+                    raise redis_asyncio.ConnectionError("Connection refused")
+
+            async def ping(self):
+                self._check()
+                return True
+
+            async def setex(self, key, expire, value):
+                self._check()
+                self.data[key] = value
+                return True
+
+            async def exists(self, key):
+                self._check()
+                return int(key in self.data)
+
+        flaky = FlakyRedis()
+        client = RedisClient()
+
+        # Given - the startup ping fails (main.lifespan logs it and carries on)
+        with patch("src.notemesh.core.redis_client.redis.ConnectionPool.from_url"), \
+                patch("src.notemesh.core.redis_client.redis.Redis", return_value=flaky):
+            with pytest.raises(redis_asyncio.ConnectionError):
+                await client.connect()
+        assert client.redis is flaky
+
+        # When - Redis comes back and the user logs out
+        flaky.down = False
+        token = create_access_token({"sub": str(uuid.uuid4())})
+        with patch("src.notemesh.security.jwt.get_redis_client", return_value=client):
+            assert await decode_access_token(token) is not None
+            assert await blacklist_token(token) is True
+
+            # Then - the logged-out token is rejected
+            assert await decode_access_token(token) is None
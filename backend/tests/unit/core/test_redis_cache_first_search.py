@@ -147,7 +147,7 @@ class TestRedisCacheFirstSearch:
         search_service.suggest_tags = AsyncMock(return_value=["work", "test"])
         search_service.redis_client.get = AsyncMock(side_effect=Exception("Redis connection error"))
         search_service.note_repo = Mock()
-        search_service.note_repo.get_user_tags = AsyncMock(return_value=["work", "test", "personal"])
+        search_service.note_repo.get_user_tag_names = AsyncMock(return_value=["work", "test", "personal"])
 
         # When
         result = await search_service.suggest_tags(user_id, query, 10)
@@ -196,6 +196,17 @@ class TestRedisComprehensiveValidation:
         await redis_client.disconnect()
         redis_client.disconnect.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_redis_connect_is_idempotent(self):
+        """Verifica che connect() non riapra la connessione se già connesso."""
+        client = RedisClient()
+        client.redis = Mock()
+
+        with patch("src.notemesh.core.redis_client.redis.ConnectionPool.from_url") as from_url:
+            await client.connect()
+
+        from_url.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_redis_monitoring_and_metrics_readiness(self, redis_client):
         """Verifica preparazione per monitoring e metriche Redis."""
@@ -0,0 +1,197 @@
+"""Unit tests for RedisClient search cache serialization."""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from src.notemesh.core.redis_client import RedisClient
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for redis.asyncio.Redis (decode_responses=True)."""
+
+    def __init__(self):
+        self.storage = {}
+        self.ttls = {}
+        self.calls = []
+
+    async def get(self, key):
+        return self.storage.get(key)
+
+    async def set(self, key, value):
+        self.storage[key] = value.decode() if isinstance(value, bytes) else value
+        return True
+
+    async def setex(self, key, expire, value):
+        self.ttls[key] = expire
+        return await self.set(key, value)
+
+    async def mget(self, keys):
+        return [self.storage.get(key) for key in keys]
+
+    async def delete(self, *keys):
+        self.calls.append(("delete", keys))
+        return sum(self.storage.pop(key, None) is not None for key in keys)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def incr(self, key):
+        self.storage[key] = str(int(self.storage.get(key, 0)) + 1)
+        return int(self.storage[key])
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def set(self, key, value, ex=None):
+        self.commands.append((key, value, ex))
+
+    def incr(self, key):
+        self.commands.append((key, None, None))
+
+    async def execute(self):
+        for key, value, ex in self.commands:
+            if value is None:
+                # INCR
+                self.redis.storage[key] = str(int(self.redis.storage.get(key, 0)) + 1)
+                continue
+            self.redis.storage[key] = value
+            self.redis.ttls[key] = ex
+        return [True] * len(self.commands)
+
+
+@pytest.fixture
+def client():
+    c = RedisClient()
+    c.redis = FakeRedis()
+    return c
+
+
+@pytest.mark.asyncio
+async def test_search_cache_round_trip(client):
+    user_id = uuid.uuid4()
+    payload = {
+        "items": [{"id": str(uuid.uuid4()), "title": "T"}],
+        "total": 1,
+        "search_time_ms": 1.5,
+    }
+
+    assert await client.cache_search_results("q", user_id, payload, expire=300)
+
+    assert await client.get_cached_search("q", user_id) == payload
+    assert list(client.redis.ttls.values()) == [300]
+
+
+@pytest.mark.asyncio
+async def test_search_cache_accepts_uuid_and_datetime(client):
+    user_id = uuid.uuid4()
+    note_id = uuid.uuid4()
+    now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    assert await client.cache_search_results("q", user_id, {"id": note_id, "at": now})
+
+    cached = await client.get_cached_search("q", user_id)
+    assert cached == {"id": str(note_id), "at": "2025-01-01T00:00:00+00:00"}
+
+
+@pytest.mark.asyncio
+async def test_search_cache_stores_serialized_json_as_is(client):
+    user_id = uuid.uuid4()
+
+    assert await client.cache_search_results("q", user_id, '{"total":2}')
+
+    assert list(client.redis.storage.values()) == ['{"total":2}']
+    assert await client.get_cached_search("q", user_id) == {"total": 2}
+
+
+@pytest.mark.asyncio
+async def test_search_cache_miss_returns_none(client):
+    assert await client.get_cached_search("missing", uuid.uuid4()) is None
+
+
+@pytest.mark.asyncio
+async def test_search_version_bump_hides_older_cache(client):
+    user_id = uuid.uuid4()
+    version = await client.get_search_version(user_id)
+    assert version == 0
+    await client.cache_search_results("q", user_id, {"total": 1}, version=version)
+
+    assert await client.bump_search_version(user_id) == 1
+    new_version = await client.get_search_version(user_id)
+
+    assert new_version == 1
+    assert await client.get_cached_search("q", user_id, version=new_version) is None
+    assert await client.get_cached_search("q", user_id, version=version) == {"total": 1}
+
+
+@pytest.mark.asyncio
+async def test_search_versions_bumped_in_one_pipeline(client):
+    owner_id, recipient_id = uuid.uuid4(), uuid.uuid4()
+    await client.bump_search_version(owner_id)
+
+    assert await client.bump_search_versions([owner_id, recipient_id]) is True
+
+    assert await client.get_search_version(owner_id) == 2
+    assert await client.get_search_version(recipient_id) == 1
+
+
+@pytest.mark.asyncio
+async def test_delete_many_uses_one_del(client):
+    client.redis.storage.update({"a": "1", "b": "2", "c": "3"})
+
+    assert await client.delete_many(["a", "b", "missing"]) == 2
+
+    assert client.redis.calls == [("delete", ("a", "b", "missing"))]
+    assert client.redis.storage == {"c": "3"}
+    assert await client.delete_many([]) == 0
+
+
+@pytest.mark.asyncio
+async def test_mock_redis_fixture_matches_client_calls(mock_redis):
+    c = RedisClient()
+    c.redis = mock_redis
+    await mock_redis.set("a", "1")
+
+    assert await c.get_many(["a", "missing"]) == ["1", None]
+    assert await c.delete_many(["a", "missing"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_search_version_without_redis():
+    c = RedisClient()
+    user_id = uuid.uuid4()
+
+    assert await c.bump_search_version(user_id) == 0
+    assert await c.get_search_version(user_id) == 0
+
+
+@pytest.mark.asyncio
+async def test_tag_ids_round_trip_in_one_mget(client, monkeypatch):
+    work_id = uuid.uuid4()
+    assert await client.cache_tag_ids({"work": work_id}, expire=60)
+    client.redis.storage["tag:name:broken"] = "not-a-uuid"
+
+    calls = []
+    real_mget = client.redis.mget
+
+    async def counting_mget(keys):
+        calls.append(keys)
+        return await real_mget(keys)
+
+    monkeypatch.setattr(client.redis, "mget", counting_mget)
+
+    tag_ids = await client.get_tag_ids(["work", "home", "broken"])
+
+    assert tag_ids == {"work": work_id, "home": None, "broken": None}
+    assert calls == [["tag:name:work", "tag:name:home", "tag:name:broken"]]
+    assert client.redis.ttls["tag:name:work"] == 60
@@ -0,0 +1,35 @@
+"""Unit tests for the request logging middleware (src/notemesh/core/logging.py)."""
+
+import logging
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.notemesh.core.logging import LoggingMiddleware
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(LoggingMiddleware, skip_paths=("/health",))
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/items")
+    async def items():
+        return []
+
+    return app
+
+
+def test_skip_paths_are_not_logged():
+    client = TestClient(build_app())
+    with patch.object(logging.getLogger("notemesh.http"), "info") as mock_info:
+        assert client.get("/health").status_code == 200
+        assert mock_info.call_count == 0
+
+        assert client.get("/items").status_code == 200
+        messages = [call.args[0] for call in mock_info.call_args_list]
+        assert messages == ["HTTP Request", "HTTP Response"]
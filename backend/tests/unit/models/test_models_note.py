@@ -286,3 +286,22 @@ class TestNoteModel:
 
         assert note.hyperlinks == []
         assert note.hyperlink_count == 0
+
+
+@pytest.mark.parametrize("dialect", ["postgresql", "sqlite"])
+def test_create_all_adds_search_vector_on_postgresql_only(dialect):
+    """create_all builds the same search_vec column and GIN index as the migration."""
+    from sqlalchemy import create_mock_engine
+
+    statements = []
+    engine = create_mock_engine(
+        f"{dialect}://", lambda sql, *args, **kwargs: statements.append(str(sql))
+    )
+    Note.__table__.create(engine)
+
+    ddl = "\n".join(statements)
+    if dialect == "postgresql":
+        assert "ADD COLUMN search_vec tsvector GENERATED ALWAYS AS" in ddl
+        assert "ix_notes_search_vec ON notes USING gin (search_vec)" in ddl
+    else:
+        assert "search_vec" not in ddl
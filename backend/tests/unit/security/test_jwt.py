@@ -72,6 +72,32 @@ async def test_decode_access_token_invalid_signature(monkeypatch):
     assert await decode_access_token(token) is None
 
 
+async def test_decode_access_token_rejects_cached_token_after_key_rotation(monkeypatch):
+    from src.notemesh.security import jwt as jwt_module
+
+    class RotatedSettings(DummySettings):
+        secret_key = "rotated-secret"
+
+    settings = DummySettings()
+    monkeypatch.setattr(jwt_module, "get_settings", lambda: settings)
+
+    # Mock Redis client: sync factory returning object with async methods
+    def mock_get_redis_client():
+        class MockRedis:
+            async def is_token_blacklisted(self, jti):
+                return False
+        return MockRedis()
+
+    monkeypatch.setattr(jwt_module, "get_redis_client", mock_get_redis_client)
+
+    token = create_access_token({"sub": str(uuid.uuid4())})
+    # Verified (and memoized) under the old key
+    assert await decode_access_token(token) is not None
+
+    settings = RotatedSettings()
+    assert await decode_access_token(token) is None
+
+
 async def test_get_user_id_from_token(monkeypatch):
     from src.notemesh.security import jwt as jwt_module
 
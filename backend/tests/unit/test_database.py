@@ -0,0 +1,59 @@
+"""
+Unit tests for lazy database engine setup.
+"""
+
+import pytest
+
+from src.notemesh import database
+from src.notemesh.config import Settings
+
+
+@pytest.fixture
+def reset_engine():
+    """Start and end each test without a module-level engine."""
+    previous = (database._engine, database._session_factory)
+    database._engine, database._session_factory = None, None
+    yield
+    database._engine, database._session_factory = previous
+
+
+@pytest.mark.asyncio
+async def test_engine_created_on_first_use(reset_engine):
+    """Engine is built once, from the given settings, and dropped on dispose."""
+    settings = Settings(database_url="sqlite+aiosqlite:///:memory:")
+
+    engine = database.init_engine(settings)
+
+    assert str(engine.url) == "sqlite+aiosqlite:///:memory:"
+    assert database.get_engine() is engine
+    assert database.init_engine() is engine
+    assert database.get_session_factory().kw["bind"] is engine
+
+    await database.dispose_engine()
+    assert database._engine is None and database._session_factory is None
+
+
+@pytest.mark.asyncio
+async def test_get_db_session_creates_engine_on_first_use(reset_engine, monkeypatch):
+    """The session dependency builds the engine itself when nothing has yet."""
+    monkeypatch.setattr(
+        database, "get_settings", lambda: Settings(database_url="sqlite+aiosqlite:///:memory:")
+    )
+
+    sessions = database.get_db_session()
+    session = await sessions.__anext__()
+
+    assert session.bind is database._engine
+    await sessions.aclose()
+    await database.dispose_engine()
+
+
+def test_postgres_engine_options_size_the_pool():
+    """Pool sizing options are only passed for PostgreSQL URLs."""
+    postgres = database._engine_options(
+        Settings(database_url="postgresql+asyncpg://u:p@localhost/db", database_pool_size=7)
+    )
+    sqlite = database._engine_options(Settings(database_url="sqlite+aiosqlite:///:memory:"))
+
+    assert postgres["pool_size"] == 7 and postgres["pool_pre_ping"] is True
+    assert "pool_size" not in sqlite
@@ -3,14 +3,15 @@ Unit tests for JWT token utilities.
 """
 
 from datetime import datetime, timedelta, timezone
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 from uuid import UUID, uuid4
 
 import pytest
-from jose import jwt
+from jose import jwk, jwt
 
 from src.notemesh.config import Settings
 from src.notemesh.security.jwt import (
+    _build_jwt_config,
     create_access_token,
     create_refresh_token,
     decode_access_token,
@@ -90,6 +91,16 @@ class TestJWTUtils:
             assert decoded["username"] == "testuser"
             assert decoded["roles"] == ["user", "admin"]
 
+    def test_signing_key_parsed_once(self, mock_settings):
+        """Test the signing key is built once and reused across tokens."""
+        with patch("src.notemesh.security.jwt.get_settings", return_value=mock_settings), \
+             patch("src.notemesh.security.jwt.jwk.construct", wraps=jwk.construct) as mock_construct:
+            _build_jwt_config.cache_clear()
+            create_access_token({"sub": str(uuid4())})
+            create_access_token({"sub": str(uuid4())})
+
+            assert mock_construct.call_count == 1
+
     def test_create_refresh_token(self):
         """Test creating refresh token."""
         token1 = create_refresh_token()
@@ -167,6 +178,27 @@ class TestJWTUtils:
 
             assert await decode_access_token(token) is None
 
+    async def test_decode_access_token_reuses_verification(self, mock_settings):
+        """Test repeat decodes of the same token skip signature verification."""
+        with patch("src.notemesh.security.jwt.get_settings", return_value=mock_settings), \
+             patch("src.notemesh.security.jwt.get_redis_client") as mock_redis:
+            mock_redis_instance = mock_redis.return_value
+            mock_redis_instance.connect = AsyncMock()
+            mock_redis_instance.is_token_blacklisted = AsyncMock(return_value=False)
+
+            token = create_access_token({"sub": str(uuid4())})
+
+            with patch("src.notemesh.security.jwt.jwt.decode", wraps=jwt.decode) as mock_decode:
+                first = await decode_access_token(token)
+                second = await decode_access_token(token)
+
+            assert first == second
+            assert mock_decode.call_count == 1
+
+            # The blacklist is still consulted on cache hits
+            mock_redis_instance.is_token_blacklisted.return_value = True
+            assert await decode_access_token(token) is None
+
     async def test_get_user_id_from_token_valid(self, mock_settings):
         """Test extracting user ID from valid token."""
         with patch("src.notemesh.security.jwt.get_settings", return_value=mock_settings), \
@@ -77,8 +77,21 @@ class TestPasswordUtils:
         # Fresh bcrypt hash should not need update
         assert needs_update(hashed) is False
 
-        # Note: Testing with an old/weak hash would require creating
-        # a hash with different settings, which is complex to mock
+        # Hash with fewer rounds than the current setting should be upgraded
+        import bcrypt
+
+        weak = bcrypt.hashpw(b"x", bcrypt.gensalt(rounds=4)).decode()
+        assert needs_update(weak) is True
+
+    def test_legacy_passlib_hash(self):
+        """Test hashes written by passlib's bcrypt_sha256 still verify."""
+        legacy = (
+            "$bcrypt-sha256$v=2,t=2b,r=4$g8H6JcKnjiUGPOkb1E04ie$KpT8QOQxbqonGbuWE0Vbau3zRmKqK3a"
+        )
+
+        assert verify_password("TestPassword123!", legacy) is True
+        assert verify_password("TestPassword123", legacy) is False
+        assert needs_update(legacy) is True
 
     def test_special_characters_password(self):
         """Test passwords with special characters."""
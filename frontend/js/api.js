@@ -383,23 +383,27 @@ class ApiClient {
     }
 
     // Get shares (both given and received)
-    async getShares(type = 'all', page = 1, limit = CONFIG.ITEMS_PER_PAGE) {
+    async getShares(type = 'all', page = 1, limit = CONFIG.ITEMS_PER_PAGE, includeTotal = false) {
         const params = new URLSearchParams({
             type: type,  // 'given' or 'received' or 'all'
             page: page.toString(),
             per_page: limit.toString()
         });
+        // total_count costs the backend an extra COUNT query, so ask only when it is shown
+        if (includeTotal) {
+            params.set('include_total', 'true');
+        }
 
         return await this.makeRequest(`${ENDPOINTS.SHARES}?${params}`);
     }
 
-    // Legacy methods for compatibility
+    // Legacy methods for compatibility (the notes list adds their total_count)
     async getMyShares(page = 1, limit = CONFIG.ITEMS_PER_PAGE) {
-        return await this.getShares('given', page, limit);
+        return await this.getShares('given', page, limit, true);
     }
 
     async getSharedWithMe(page = 1, limit = CONFIG.ITEMS_PER_PAGE) {
-        return await this.getShares('received', page, limit);
+        return await this.getShares('received', page, limit, true);
     }
 
     async revokeShare(shareId) {